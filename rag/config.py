@@ -1,12 +1,22 @@
+import hashlib
+import json
 import os
+from pathlib import Path
 from langchain_community.embeddings import HuggingFaceEmbeddings
 from langchain_google_genai import ChatGoogleGenerativeAI
 from google.genai.types import Tool, GenerateContentConfig, GoogleSearch
 from dotenv import load_dotenv
 from google import genai
 
+from rag.final.embedding_cache import EmbeddingCache, CachedEmbeddings
+from rag.final.response_cache import ResponseCache
+from rag.final.collectors.kipris_cache import KiprisStatsCache
+
 load_dotenv()
 
+# 로컬 캐시(SQLite 등) 저장 디렉토리 (기본 .cache/ 는 .gitignore 대상)
+CACHE_DIR = Path(os.getenv("RAG_CACHE_DIR", ".cache"))
+
 POSTGRES_CONN = (
     f"postgresql://{os.getenv('POSTGRES_USER')}:"
     f"{os.getenv('POSTGRES_PASSWORD')}@"
@@ -14,12 +24,47 @@ POSTGRES_CONN = (
     f"{os.getenv('POSTGRES_DATABASE')}"
 )
 
+# 검색용 Postgres 커넥션 풀 설정
+POSTGRES_POOL_CONFIG = {
+    "min_size": int(os.getenv("POSTGRES_POOL_MIN_SIZE", 1)),
+    "max_size": int(os.getenv("POSTGRES_POOL_MAX_SIZE", 10)),
+    "max_idle": float(os.getenv("POSTGRES_POOL_MAX_IDLE", 300)),   # 유휴 커넥션 정리(초)
+    "timeout": float(os.getenv("POSTGRES_POOL_TIMEOUT", 30)),      # 커넥션 대기 한도(초)
+    "max_lifetime": float(os.getenv("POSTGRES_POOL_MAX_LIFETIME", 3600)),  # 커넥션 최대 수명(초)
+    "check": os.getenv("POSTGRES_POOL_CHECK", "1") == "1",         # 대여 시 연결 상태 확인 (왕복 1회)
+}
+
+# 항목 검색 방식: sql (항목 전체 SQL 1회) | local (회사 chunk 메모리 검색)
+RETRIEVAL_MODE = os.getenv("RETRIEVAL_MODE", "sql")
+
+# pgvector HNSW 검색 설정 (미설정 시 서버 기본값 사용)
+HNSW_EF_SEARCH = int(os.getenv("HNSW_EF_SEARCH")) if os.getenv("HNSW_EF_SEARCH") else None
+HNSW_ITERATIVE_SCAN = os.getenv("HNSW_ITERATIVE_SCAN")  # off | strict_order | relaxed_order
+
+EMBEDDING_MODEL_NAME = "nlpai-lab/kure-v1"
+EMBEDDING_NORMALIZE = True
+
 EMBEDDING_MODEL = HuggingFaceEmbeddings(
-    model_name="nlpai-lab/kure-v1",
+    model_name=EMBEDDING_MODEL_NAME,
     model_kwargs={"device": "cuda"},
-    encode_kwargs={"normalize_embeddings": True}
+    encode_kwargs={"normalize_embeddings": EMBEDDING_NORMALIZE}
 )
 
+# 쿼리 임베딩 디스크 캐시 (EMBEDDING_CACHE=0 으로 비활성화)
+if os.getenv("EMBEDDING_CACHE", "1") == "1":
+    EMBEDDING_CACHE = EmbeddingCache(
+        db_path=CACHE_DIR / "embedding_cache.sqlite3",
+        max_entries=int(os.getenv("EMBEDDING_CACHE_MAX_ENTRIES", 100_000)),
+    )
+    EMBEDDING_MODEL = CachedEmbeddings(
+        embeddings=EMBEDDING_MODEL,
+        cache=EMBEDDING_CACHE,
+        model_name=EMBEDDING_MODEL_NAME,
+        normalize=EMBEDDING_NORMALIZE,
+    )
+else:
+    EMBEDDING_CACHE = None
+
 LLM_A = ChatGoogleGenerativeAI(
     model="gemini-2.0-flash",
     temperature=0,
@@ -53,3 +98,113 @@ LLM_B = ChatGoogleGenerativeAI(
 GEMINI_CLIENT = genai.Client(
     api_key=os.getenv("GEMINI_API_KEY"),
 )
+
+# LLM 응답을 Pydantic 스키마 기반 네이티브 구조화 출력(JSON)으로 받음
+# (Google Search 호출은 response_schema 미지원 → 기존 텍스트 파싱 유지)
+LLM_STRUCTURED_OUTPUT = os.getenv("LLM_STRUCTURED_OUTPUT", "0") == "1"
+
+# LLM 응답 디스크 캐시 (LLM_RESPONSE_CACHE=1 로 활성화, 입력이 같으면 재호출하지 않음)
+if os.getenv("LLM_RESPONSE_CACHE", "0") == "1":
+    LLM_RESPONSE_CACHE = ResponseCache(
+        db_path=CACHE_DIR / "llm_response_cache.sqlite3",
+        max_bytes=int(os.getenv("LLM_RESPONSE_CACHE_MAX_BYTES", 256 * 1024 * 1024)),
+    )
+else:
+    LLM_RESPONSE_CACHE = None
+
+# LLM 재시도: 항목 1개당 전체 제한 시간(초, 0이면 제한 없음) / 시도 기록 보관 개수
+LLM_ITEM_DEADLINE_SECONDS = float(os.getenv("LLM_ITEM_DEADLINE_SECONDS", 600))
+LLM_RETRY_LOG_SIZE = int(os.getenv("LLM_RETRY_LOG_SIZE", 1000))
+
+# Gemini 호출 속도 제한 (모델별 rpm / tpm, 0이면 제한 없음)
+# - memory: 프로세스 단위 / sqlite: CACHE_DIR 파일을 공유하는 모든 프로세스 단위
+RATE_LIMIT_BACKEND = os.getenv("RATE_LIMIT_BACKEND", "memory")
+RATE_LIMITS = json.loads(os.getenv(
+    "RATE_LIMITS_JSON",
+    '{"gemini-2.5-flash": {"rpm": 1000, "tpm": 1000000},'
+    ' "gemini-2.0-flash": {"rpm": 2000, "tpm": 4000000}}',
+))
+RATE_LIMIT_DEFAULT = {
+    "rpm": int(os.getenv("RATE_LIMIT_DEFAULT_RPM", 1000)),
+    "tpm": int(os.getenv("RATE_LIMIT_DEFAULT_TPM", 1000000)),
+}
+RATE_LIMIT_OUTPUT_TOKENS = int(os.getenv("RATE_LIMIT_OUTPUT_TOKENS", 2048))   # 호출 전 예상 출력 토큰
+RATE_LIMIT_FILE_TOKENS = int(os.getenv("RATE_LIMIT_FILE_TOKENS", 8000))       # 첨부 PDF 예상 토큰
+
+def _rate_limit_scope(api_key: str | None) -> str:
+    # 예산은 API 키 단위 (키 원문 대신 해시 사용)
+    return hashlib.sha256((api_key or "").encode()).hexdigest()[:12]
+
+GEMINI_RATE_SCOPE = _rate_limit_scope(os.getenv("GEMINI_API_KEY"))
+LANGCHAIN_RATE_SCOPE = _rate_limit_scope(os.getenv("GOOGLE_API_KEY"))
+
+# Gemini Cached Content (VF 캐시) TTL / 만료 전 연장 기준(초)
+VF_CACHE_TTL_SECONDS = int(os.getenv("VF_CACHE_TTL_SECONDS", 3600))
+VF_CACHE_REFRESH_MARGIN_SECONDS = int(os.getenv("VF_CACHE_REFRESH_MARGIN_SECONDS", 300))
+# orphan 정리 유예(초): 마지막 생성/연장 후 TTL + 유예가 지난 캐시만 삭제
+VF_CACHE_ORPHAN_GRACE_SECONDS = int(os.getenv("VF_CACHE_ORPHAN_GRACE_SECONDS", 600))
+
+# file+vectordb 항목(VF 캐시 공유)을 한 번의 Gemini 호출로 묶어 생성
+VF_COMBINE_ITEMS = os.getenv("VF_COMBINE_ITEMS", "0") == "1"
+
+# 시장 규모 fallback 레벨(0~3) 동시 호출 수
+# 1 = 순차(최소 비용), 4 = 전 레벨 동시(최소 지연, 최대 4배 호출)
+# 추가 비용: 동기 경로(generate)는 이미 실행 중인 레벨 호출을 중단할 수 없어
+#   유효 레벨이 나온 뒤에도 최대 (값 - 1)건의 Gemini(+Google Search) 호출이 끝까지 과금된다.
+#   비동기 경로(agenerate)는 진행 중인 호출도 취소한다 (이미 서버에 도달한 요청은 과금될 수 있음).
+MARKET_FALLBACK_PARALLELISM = int(os.getenv("MARKET_FALLBACK_PARALLELISM", 1))
+
+# KIPRIS 통계를 HTTP 클라이언트(collectors/kipris_http.py)로 먼저 수집 (실패 시 Selenium fallback)
+# 엔드포인트 / 폼 필드는 합성 대역 서버(kipris_stub_server)로만 검증됨
+# → 실제 KIPRIS 요청으로 확인되기 전까지는 기본 비활성화 (opt-in: KIPRIS_HTTP=1)
+KIPRIS_HTTP_ENABLED = os.getenv("KIPRIS_HTTP", "0") == "1"
+
+# 로컬 대역 서버로 테스트할 때는 KIPRIS_BASE_URL만 바꾸면 된다.
+KIPRIS_BASE_URL = os.getenv("KIPRIS_BASE_URL", "https://www.kipris.or.kr")
+KIPRIS_HTTP_TIMEOUT = float(os.getenv("KIPRIS_HTTP_TIMEOUT", 30))
+
+# Selenium 흐름과 1:1 대응하는 요청 경로
+#   main       : open_kipris            → 세션 쿠키 발급
+#   search     : doDetailSearch()       → 상세검색 (IPC)
+#   statistics : excelDownloadByStatis  → 결과 분류통계 엑셀
+KIPRIS_PATHS = {
+    "main": os.getenv("KIPRIS_MAIN_PATH", "/khome/main.do"),
+    "search": os.getenv("KIPRIS_SEARCH_PATH", "/khome/search/searchResult.do"),
+    "statistics": os.getenv(
+        "KIPRIS_STATISTICS_PATH", "/khome/search/statis/excelDownloadByStatis.do"
+    ),
+}
+
+# 검색 / 통계 요청 폼 필드 (값의 {query}는 build_search_query 결과로 치환)
+# 실제 KIPRIS 요청을 녹화해 필드명이 다르면 JSON 환경변수로 덮어쓴다.
+#   예: KIPRIS_SEARCH_FORM='{"searchQuery": "{query}", "collections": "KPAT"}'
+KIPRIS_QUERY_TEMPLATE = os.getenv("KIPRIS_QUERY_TEMPLATE", "IPC=[{keyword}]")
+KIPRIS_SEARCH_FORM = json.loads(os.getenv(
+    "KIPRIS_SEARCH_FORM",
+    '{"queryText": "{query}", "collectionValues": "KPAT"}',
+))
+KIPRIS_STATISTICS_FORM = json.loads(os.getenv(
+    "KIPRIS_STATISTICS_FORM",
+    '{"queryText": "{query}", "collectionValues": "KPAT", "downloadType": "excel"}',
+))
+
+# KIPRIS Selenium 브라우저 풀 (collectors/kipris_client.py)
+# 0이면 호출마다 새 Chrome 실행 → 기존 동작
+KIPRIS_DRIVER_POOL_SIZE = int(os.getenv("KIPRIS_DRIVER_POOL_SIZE", 0))
+# 드라이버 1개당 최대 검색 횟수 (초과 시 종료 후 새로 띄움)
+KIPRIS_DRIVER_MAX_USES = int(os.getenv("KIPRIS_DRIVER_MAX_USES", 20))
+# 엑셀 다운로드 완료 대기 한도(초)
+KIPRIS_DOWNLOAD_TIMEOUT = float(os.getenv("KIPRIS_DOWNLOAD_TIMEOUT", 60))
+
+# KIPRIS 통계 캐시 TTL(초) - 같은 IPC 조합은 수집 생략 (0이면 비활성화)
+KIPRIS_STATS_CACHE_TTL_SECONDS = int(os.getenv("KIPRIS_STATS_CACHE_TTL_SECONDS", 7 * 24 * 3600))
+if KIPRIS_STATS_CACHE_TTL_SECONDS > 0:
+    KIPRIS_STATS_CACHE = KiprisStatsCache(
+        db_path=CACHE_DIR / "kipris_stats_cache.sqlite3",
+        ttl_seconds=KIPRIS_STATS_CACHE_TTL_SECONDS,
+    )
+else:
+    KIPRIS_STATS_CACHE = None
+
+# 보고서 항목 동시 처리 수 (Gemini 쿼터에 맞춰 조정, 1이면 순차 처리)
+ITEM_MAX_CONCURRENCY = int(os.getenv("ITEM_MAX_CONCURRENCY", 1))
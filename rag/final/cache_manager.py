@@ -1,23 +1,259 @@
-from typing import Dict
+from typing import Dict, Optional
+from concurrent.futures import Future
 from google.genai import types
 from pathlib import Path
+from datetime import datetime, timedelta, timezone
+import asyncio
 import hashlib
+import mmap
+import os
+import sqlite3
+import threading
+import time
+import uuid
 
-from rag.config import GEMINI_CLIENT
+from rag.config import (
+    GEMINI_CLIENT,
+    CACHE_DIR,
+    VF_CACHE_TTL_SECONDS,
+    VF_CACHE_REFRESH_MARGIN_SECONDS,
+    VF_CACHE_ORPHAN_GRACE_SECONDS,
+)
 from rag.final.prompts.cache_system_prompt import VF_CACHE_SYSTEM_PROMPT
 
 # -----------------------------
-# 메모리 캐시 저장소
+# 영속 캐시 레지스트리 (SQLite, 호스트 내 전 워커 공유)
 # -----------------------------
 # key: cache_key
-# value: cache_id (cachedContents/xxxx)
-_VF_CACHE_STORE: Dict[str, str] = {}
+# value: cache_id (cachedContents/xxxx), expire_at (epoch sec)
+_REGISTRY_SCHEMA = """
+CREATE TABLE IF NOT EXISTS vf_cache_registry (
+    cache_key  TEXT PRIMARY KEY,
+    cache_id   TEXT NOT NULL,
+    expire_at  REAL NOT NULL,
+    created_at REAL NOT NULL
+);
+CREATE TABLE IF NOT EXISTS vf_cache_meta (
+    key   TEXT PRIMARY KEY,
+    value TEXT NOT NULL
+);
+"""
 
-def _calc_file_hash(file_path: str) -> str:
+# 서버 측 캐시 식별용 display_name 접두어 (orphan 정리 대상 판별)
+# display_name = "rag-vf:{registry_id}:{cache_key 해시}"
+VF_CACHE_DISPLAY_PREFIX = "rag-vf:"
+
+
+class CacheRegistry:
+    """
+    cache_key → (cache_id, 만료 시각) 매핑을 SQLite에 저장한다.
+    여러 프로세스가 같은 파일을 공유하므로 WAL 모드로 연다.
+    """
+
+    def __init__(self, db_path: Path):
+        db_path = Path(db_path)
+        db_path.parent.mkdir(parents=True, exist_ok=True)
+
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(
+            str(db_path),
+            timeout=30,
+            check_same_thread=False,
+        )
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.executescript(_REGISTRY_SCHEMA)
+        self._conn.execute(
+            "INSERT OR IGNORE INTO vf_cache_meta (key, value) VALUES ('registry_id', ?)",
+            (uuid.uuid4().hex[:12],),
+        )
+        self._conn.commit()
+
+        # 같은 레지스트리 파일을 쓰는 워커는 같은 id를 공유한다
+        self.registry_id = self._conn.execute(
+            "SELECT value FROM vf_cache_meta WHERE key = 'registry_id'"
+        ).fetchone()[0]
+
+    def get(self, cache_key: str) -> Optional[tuple[str, float]]:
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT cache_id, expire_at FROM vf_cache_registry WHERE cache_key = ?",
+                (cache_key,),
+            ).fetchone()
+        return (row[0], row[1]) if row else None
+
+    def put(self, cache_key: str, cache_id: str, expire_at: float) -> None:
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO vf_cache_registry "
+                "(cache_key, cache_id, expire_at, created_at) VALUES (?, ?, ?, ?)",
+                (cache_key, cache_id, expire_at, time.time()),
+            )
+            self._conn.commit()
+
+    def key_for(self, cache_id: str) -> Optional[str]:
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT cache_key FROM vf_cache_registry WHERE cache_id = ?",
+                (cache_id,),
+            ).fetchone()
+        return row[0] if row else None
+
+    def delete(self, cache_key: str) -> None:
+        with self._lock:
+            self._conn.execute(
+                "DELETE FROM vf_cache_registry WHERE cache_key = ?",
+                (cache_key,),
+            )
+            self._conn.commit()
+
+    def purge_expired(self, now: Optional[float] = None) -> int:
+        now = now or time.time()
+        with self._lock:
+            cur = self._conn.execute(
+                "DELETE FROM vf_cache_registry WHERE expire_at <= ?",
+                (now,),
+            )
+            self._conn.commit()
+        return cur.rowcount
+
+    def cache_ids(self) -> set[str]:
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT cache_id FROM vf_cache_registry"
+            ).fetchall()
+        return {r[0] for r in rows}
+
+
+_VF_CACHE_STORE = CacheRegistry(CACHE_DIR / "gemini_cache_registry.sqlite3")
+
+# -----------------------------
+# 동시 생성 중복 방지 (single-flight)
+# -----------------------------
+# key: cache_key
+# value: 진행 중인 조회/생성의 Future → (cache_id, created)
+_VF_INFLIGHT: Dict[str, Future] = {}
+_VF_INFLIGHT_LOCK = threading.Lock()
+
+VF_CACHE_STATS: Dict[str, int] = {
+    "created": 0,
+    "waited": 0,
+    "dedup_avoided": 0,
+}
+
+# -----------------------------
+# 업로드 파일 저장소
+# -----------------------------
+# key: file_hash (sha256)
+# value: 업로드된 File 핸들 (files/xxxx)
+_UPLOADED_FILE_STORE: Dict[str, types.File] = {}
+_UPLOAD_LOCKS: Dict[str, threading.Lock] = {}
+_UPLOAD_LOCKS_GUARD = threading.Lock()
+
+# Files API 기본 보관 기간 / 만료 직전 재업로드 여유
+UPLOAD_DEFAULT_TTL = timedelta(hours=48)
+UPLOAD_EXPIRY_MARGIN = timedelta(minutes=10)
+
+# -----------------------------
+# 파일 해시 메모
+# -----------------------------
+# key: (절대경로, size, mtime_ns)
+# value: sha256 hexdigest
+_FILE_HASH_MEMO: Dict[tuple, str] = {}
+_FILE_HASH_LOCK = threading.Lock()
+
+HASH_CHUNK_SIZE = 1024 * 1024  # 1MB
+
+def _hash_file_streaming(file_path: str) -> str:
+    """
+    mmap + 1MB 단위로 해시해 파일 크기와 무관하게 메모리 사용량을 일정하게 유지한다.
+    """
     h = hashlib.sha256()
     with open(file_path, "rb") as f:
-        h.update(f.read())
-        return h.hexdigest()
+        try:
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                view = memoryview(mm)
+                try:
+                    for offset in range(0, len(view), HASH_CHUNK_SIZE):
+                        h.update(view[offset:offset + HASH_CHUNK_SIZE])
+                finally:
+                    view.release()
+        except ValueError:
+            # 빈 파일은 mmap 불가 → 일반 청크 읽기
+            for chunk in iter(lambda: f.read(HASH_CHUNK_SIZE), b""):
+                h.update(chunk)
+    return h.hexdigest()
+
+def _calc_file_hash(file_path: str) -> str:
+    """
+    (경로, 크기, mtime_ns)가 같으면 이전 해시를 재사용한다.
+    → 변경되지 않은 파일은 stat 1회 비용
+    """
+    path = os.path.abspath(file_path)
+    st = os.stat(path)
+    memo_key = (path, st.st_size, st.st_mtime_ns)
+
+    with _FILE_HASH_LOCK:
+        digest = _FILE_HASH_MEMO.get(memo_key)
+    if digest:
+        return digest
+
+    digest = _hash_file_streaming(path)
+
+    with _FILE_HASH_LOCK:
+        _FILE_HASH_MEMO[memo_key] = digest
+    return digest
+
+def file_content_hash(file_path) -> str:
+    """
+    파일 내용 해시 (응답 캐시 키 등 외부 모듈용)
+    """
+    return _calc_file_hash(str(file_path))
+
+def _is_upload_alive(uploaded: types.File) -> bool:
+    """
+    서버 측 만료 시각(expiration_time) 기준으로 업로드 파일이 아직 유효한지 확인한다.
+    """
+    expires_at = uploaded.expiration_time
+    if expires_at is None and uploaded.create_time is not None:
+        expires_at = uploaded.create_time + UPLOAD_DEFAULT_TTL
+    if expires_at is None:
+        return True
+
+    if expires_at.tzinfo is None:
+        expires_at = expires_at.replace(tzinfo=timezone.utc)
+
+    return datetime.now(timezone.utc) + UPLOAD_EXPIRY_MARGIN < expires_at
+
+def _upload_lock(file_hash: str) -> threading.Lock:
+    with _UPLOAD_LOCKS_GUARD:
+        return _UPLOAD_LOCKS.setdefault(file_hash, threading.Lock())
+
+def get_or_upload_file(file_path) -> types.File:
+    """
+    파일 내용(hash) 기준으로 한 번만 업로드하고 File 핸들을 재사용한다.
+    만료(또는 만료 임박)된 경우에만 다시 업로드한다.
+    """
+    file_hash = _calc_file_hash(str(file_path))
+
+    with _upload_lock(file_hash):
+        uploaded = _UPLOADED_FILE_STORE.get(file_hash)
+        if uploaded is not None and _is_upload_alive(uploaded):
+            return uploaded
+
+        if uploaded is not None:
+            print(f"[UPLOAD EXPIRED] {file_path} -> re-upload")
+
+        uploaded = GEMINI_CLIENT.files.upload(file=Path(file_path))
+        _UPLOADED_FILE_STORE[file_hash] = uploaded
+        print(f"[UPLOAD] {file_path} -> {uploaded.name}")
+
+        return uploaded
+
+async def aget_or_upload_file(file_path) -> types.File:
+    """
+    get_or_upload_file의 비동기 버전 (동일 저장소/락 공유)
+    """
+    return await asyncio.to_thread(get_or_upload_file, file_path)
 
 def _build_cache_key(
         company: str,
@@ -26,37 +262,244 @@ def _build_cache_key(
 ) -> str:
     return f"vf:{company}:{file_hash}:{prompt_version}"
 
-def get_or_create_cache_vf(
-        company: str,
+def _to_epoch(expire_time: Optional[datetime], ttl_seconds: int) -> float:
+    if expire_time is None:
+        return time.time() + ttl_seconds
+    if expire_time.tzinfo is None:
+        expire_time = expire_time.replace(tzinfo=timezone.utc)
+    return expire_time.timestamp()
+
+def _owned_display_prefix() -> str:
+    return f"{VF_CACHE_DISPLAY_PREFIX}{_VF_CACHE_STORE.registry_id}:"
+
+def _cache_display_name(cache_key: str) -> str:
+    # display_name 길이 제한(128자) 대응 → cache_key 해시 사용
+    return _owned_display_prefix() + hashlib.sha256(cache_key.encode()).hexdigest()[:32]
+
+def _extend_cache(cache_key: str, cache_id: str) -> Optional[str]:
+    """
+    만료 임박 캐시의 TTL을 연장한다. 실패(서버에서 이미 삭제 등) 시 None.
+    """
+    try:
+        updated = GEMINI_CLIENT.caches.update(
+            name=cache_id,
+            config=types.UpdateCachedContentConfig(ttl=f"{VF_CACHE_TTL_SECONDS}s"),
+        )
+    except Exception as e:
+        print(f"[VF CACHE EXTEND FAILED] {cache_key} -> {cache_id}: {e}")
+        return None
+
+    _VF_CACHE_STORE.put(
+        cache_key,
+        cache_id,
+        _to_epoch(updated.expire_time, VF_CACHE_TTL_SECONDS),
+    )
+    print(f"[VF CACHE EXTEND] {cache_key} -> {cache_id}")
+    return cache_id
+
+def _delete_server_cache(cache_id: str) -> None:
+    try:
+        GEMINI_CLIENT.caches.delete(name=cache_id)
+    except Exception:
+        # 이미 만료/삭제된 캐시
+        pass
+
+def _is_stale_orphan(cache, now: datetime) -> bool:
+    """
+    마지막 생성/연장 이후 TTL + 유예 시간이 지난 캐시만 orphan으로 본다.
+    (방금 생성되어 아직 레지스트리에 기록되지 않은 캐시 보호)
+    """
+    touched_at = cache.update_time or cache.create_time
+    if touched_at is None:
+        return False
+    if touched_at.tzinfo is None:
+        touched_at = touched_at.replace(tzinfo=timezone.utc)
+
+    grace = timedelta(seconds=VF_CACHE_TTL_SECONDS + VF_CACHE_ORPHAN_GRACE_SECONDS)
+    return touched_at + grace <= now
+
+def cleanup_vf_caches() -> Dict[str, int]:
+    """
+    - 레지스트리에서 만료된 항목 삭제
+    - 이 레지스트리가 만든 VF 캐시 중 레지스트리에 없고 유예 시간이 지난(orphan) 캐시 삭제
+      (다른 호스트/레지스트리의 캐시는 display_name의 registry_id로 구분해 건드리지 않음)
+    """
+    purged = _VF_CACHE_STORE.purge_expired()
+
+    owned_prefix = _owned_display_prefix()
+    known_ids = _VF_CACHE_STORE.cache_ids()
+    now = datetime.now(timezone.utc)
+    orphans = 0
+    for cache in GEMINI_CLIENT.caches.list():
+        display_name = cache.display_name or ""
+        if not display_name.startswith(owned_prefix):
+            continue
+        if cache.name in known_ids:
+            continue
+        if not _is_stale_orphan(cache, now):
+            continue
+        _delete_server_cache(cache.name)
+        orphans += 1
+
+    print(f"[VF CACHE CLEANUP] expired={purged}, orphans={orphans}")
+    return {"expired": purged, "orphans": orphans}
+
+def _resolve_cache_vf(
+        cache_key: str,
         business_plan_pdf: str,
-        prompt_version: str = "v1",
-) -> str:
+) -> tuple[str, bool]:
     """
     VF (미래기술 / BM / 마케팅) 공통 캐시를
-    메모리에서 찾거나 없으면 새로 생성한다.
+    레지스트리에서 찾거나 없으면 새로 생성한다.
+    반환: (cache_id, 새로 생성했는지 여부)
+
+    - 만료 임박(VF_CACHE_REFRESH_MARGIN_SECONDS 이내): TTL 연장
+    - 만료됨 / 연장 실패: 레지스트리 정리 후 재생성
     """
-    file_hash = _calc_file_hash(business_plan_pdf)
-    cache_key = _build_cache_key(company, file_hash, prompt_version)
+    entry = _VF_CACHE_STORE.get(cache_key)
+    if entry:
+        cache_id, expire_at = entry
+        remaining = expire_at - time.time()
 
-    cache_id = _VF_CACHE_STORE.get(cache_key)
-    if cache_id:
-        print(f"[VF CACHE HIT] {cache_key} -> {cache_id}")
-        return cache_id
+        if remaining > VF_CACHE_REFRESH_MARGIN_SECONDS:
+            print(f"[VF CACHE HIT] {cache_key} -> {cache_id}")
+            return cache_id, False
+
+        if remaining > 0 and _extend_cache(cache_key, cache_id):
+            return cache_id, False
+
+        print(f"[VF CACHE EXPIRED] {cache_key} -> {cache_id}")
+        _VF_CACHE_STORE.delete(cache_key)
+        _delete_server_cache(cache_id)
 
     print(f"[VF CACHE MISS] {cache_key} (creating new cache)")
 
-    uploaded_pdf = GEMINI_CLIENT.files.upload(
-        file=Path(business_plan_pdf),
-    )
+    uploaded_pdf = get_or_upload_file(business_plan_pdf)
 
     cache = GEMINI_CLIENT.caches.create(
         model="gemini-2.5-flash",
         config=types.CreateCachedContentConfig(
             system_instruction=VF_CACHE_SYSTEM_PROMPT,
             contents=[uploaded_pdf],
+            display_name=_cache_display_name(cache_key),
+            ttl=f"{VF_CACHE_TTL_SECONDS}s",
         ),
     )
 
-    _VF_CACHE_STORE[cache_key] = cache.name
+    _VF_CACHE_STORE.put(
+        cache_key,
+        cache.name,
+        _to_epoch(cache.expire_time, VF_CACHE_TTL_SECONDS),
+    )
+
+    return cache.name, True
+
+def _join_vf_flight(cache_key: str) -> tuple[Future, bool]:
+    """
+    cache_key 단위 single-flight.
+    반환: (공유 Future, 생성 담당(leader) 여부)
+    """
+    with _VF_INFLIGHT_LOCK:
+        future = _VF_INFLIGHT.get(cache_key)
+        if future is not None:
+            return future, False
+
+        future = Future()
+        _VF_INFLIGHT[cache_key] = future
+        return future, True
+
+def _finish_vf_flight(cache_key: str) -> None:
+    with _VF_INFLIGHT_LOCK:
+        _VF_INFLIGHT.pop(cache_key, None)
+
+def _count_follower(created: bool) -> None:
+    with _VF_INFLIGHT_LOCK:
+        VF_CACHE_STATS["waited"] += 1
+        if created:
+            VF_CACHE_STATS["dedup_avoided"] += 1
+
+def get_or_create_cache_vf(
+        company: str,
+        business_plan_pdf: str,
+        prompt_version: str = "v1",
+) -> str:
+    """
+    동일 (company, file_hash, prompt_version)에 대한 동시 요청은
+    한 호출자만 캐시를 조회/생성하고 나머지는 그 결과를 기다린다.
+    """
+    file_hash = _calc_file_hash(business_plan_pdf)
+    cache_key = _build_cache_key(company, file_hash, prompt_version)
+
+    future, leader = _join_vf_flight(cache_key)
+
+    if not leader:
+        cache_id, created = future.result()
+        _count_follower(created)
+        return cache_id
+
+    try:
+        cache_id, created = _resolve_cache_vf(cache_key, business_plan_pdf)
+        if created:
+            with _VF_INFLIGHT_LOCK:
+                VF_CACHE_STATS["created"] += 1
+        future.set_result((cache_id, created))
+        return cache_id
+    except BaseException as e:
+        future.set_exception(e)
+        raise
+    finally:
+        _finish_vf_flight(cache_key)
+
+async def aget_or_create_cache_vf(
+        company: str,
+        business_plan_pdf: str,
+        prompt_version: str = "v1",
+) -> str:
+    """
+    get_or_create_cache_vf의 비동기 버전.
+    스레드 호출자와 같은 single-flight 상태를 공유한다.
+    """
+    file_hash = await asyncio.to_thread(_calc_file_hash, business_plan_pdf)
+    cache_key = _build_cache_key(company, file_hash, prompt_version)
+
+    future, leader = _join_vf_flight(cache_key)
+
+    if not leader:
+        cache_id, created = await asyncio.wrap_future(future)
+        _count_follower(created)
+        return cache_id
+
+    try:
+        cache_id, created = await asyncio.to_thread(
+            _resolve_cache_vf, cache_key, business_plan_pdf
+        )
+        if created:
+            with _VF_INFLIGHT_LOCK:
+                VF_CACHE_STATS["created"] += 1
+        future.set_result((cache_id, created))
+        return cache_id
+    except BaseException as e:
+        future.set_exception(e)
+        raise
+    finally:
+        _finish_vf_flight(cache_key)
+
+def vf_cache_content_key(cache_id: str) -> Optional[str]:
+    """
+    cache_id(서버 캐시 이름) → 캐시 내용을 나타내는 cache_key (회사, PDF 해시, 프롬프트 버전)
+    재생성되어 cache_id가 바뀌어도 내용이 같으면 같은 값을 반환한다.
+    """
+    return _VF_CACHE_STORE.key_for(cache_id)
+
+def get_vf_cache_stats() -> Dict[str, int]:
+    """
+    created: 실제 생성 수 / waited: 진행 중인 요청을 기다린 호출 수
+    dedup_avoided: 기다린 결과가 신규 생성이어서 중복 생성을 피한 수
+    """
+    with _VF_INFLIGHT_LOCK:
+        return dict(VF_CACHE_STATS)
+
 
-    return cache.name
+if __name__ == "__main__":
+    # 만료/orphan 캐시 정리 (cron 등에서 주기 실행)
+    cleanup_vf_caches()
@@ -0,0 +1,174 @@
+import ctypes
+import ctypes.util
+import os
+import select
+import sys
+import time
+import zipfile
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+# ================================
+# 설정
+# ================================
+# Chrome / Edge / Firefox 임시 다운로드 확장자
+PARTIAL_SUFFIXES = (".crdownload", ".part", ".tmp", ".download")
+
+DEFAULT_STABLE_SECONDS = 0.5     # 크기/mtime이 이 시간 동안 변하지 않으면 완료로 판단
+DEFAULT_POLL_INTERVAL = 0.2      # polling fallback 간격
+
+
+class DownloadTimeoutError(TimeoutError):
+    """
+    제한 시간 내에 완료된 다운로드 파일이 나타나지 않음
+    """
+
+
+# ================================
+# 디렉토리 변경 대기 (inotify → polling fallback)
+# ================================
+_IN_CLOSE_WRITE = 0x00000008
+_IN_MOVED_TO = 0x00000080
+_IN_CREATE = 0x00000100
+_IN_MODIFY = 0x00000002
+_IN_DELETE = 0x00000200
+_IN_NONBLOCK = 0o4000
+_IN_CLOEXEC = 0o2000000
+_WATCH_MASK = _IN_CLOSE_WRITE | _IN_MOVED_TO | _IN_CREATE | _IN_MODIFY | _IN_DELETE
+
+
+class _InotifyWatcher:
+    """
+    Linux inotify (ctypes) - 디렉토리에 변화가 생기면 즉시 깨어난다.
+    """
+
+    def __init__(self, directory: Path):
+        libc = ctypes.CDLL(ctypes.util.find_library("c") or "libc.so.6", use_errno=True)
+
+        self._fd = libc.inotify_init1(_IN_NONBLOCK | _IN_CLOEXEC)
+        if self._fd < 0:
+            raise OSError(ctypes.get_errno(), "inotify_init1 실패")
+
+        wd = libc.inotify_add_watch(self._fd, str(directory).encode(), _WATCH_MASK)
+        if wd < 0:
+            os.close(self._fd)
+            raise OSError(ctypes.get_errno(), "inotify_add_watch 실패")
+
+    def wait(self, timeout: float) -> None:
+        readable, _, _ = select.select([self._fd], [], [], max(timeout, 0.0))
+        if readable:
+            # 이벤트 내용은 쓰지 않음 → 버퍼만 비움
+            try:
+                while os.read(self._fd, 64 * 1024):
+                    pass
+            except BlockingIOError:
+                pass
+
+    def close(self) -> None:
+        os.close(self._fd)
+
+
+class _PollingWatcher:
+    def __init__(self, directory: Path, interval: float = DEFAULT_POLL_INTERVAL):
+        self.interval = interval
+
+    def wait(self, timeout: float) -> None:
+        time.sleep(max(min(timeout, self.interval), 0.0))
+
+    def close(self) -> None:
+        pass
+
+
+def _open_watcher(directory: Path, use_inotify: bool):
+    if use_inotify and sys.platform.startswith("linux"):
+        try:
+            return _InotifyWatcher(directory)
+        except (OSError, AttributeError):
+            pass
+    return _PollingWatcher(directory)
+
+
+# ================================
+# 완료 판정
+# ================================
+def _scan(directory: Path, pattern: str) -> Tuple[List[Path], List[Path]]:
+    completed_candidates, partial = [], []
+
+    for path in directory.iterdir():
+        if path.name.endswith(PARTIAL_SUFFIXES):
+            partial.append(path)
+        elif path.match(pattern):
+            completed_candidates.append(path)
+
+    return completed_candidates, partial
+
+
+def wait_for_download(
+    download_dir,
+    timeout: float = 60.0,
+    pattern: str = "*.xlsx",
+    stable_seconds: float = DEFAULT_STABLE_SECONDS,
+    use_inotify: bool = True,
+) -> Path:
+    """
+    download_dir에 완성된 파일(pattern)이 나타날 때까지 기다려 경로를 반환한다.
+
+    완료 조건
+    - 진행 중 파일(.crdownload 등)이 없음
+    - 크기 > 0 이고 stable_seconds 동안 (크기, mtime) 변화 없음
+    - .xlsx 는 zip 구조까지 확인
+
+    timeout 초 안에 조건을 만족하지 못하면 DownloadTimeoutError.
+    """
+    directory = Path(download_dir)
+    directory.mkdir(parents=True, exist_ok=True)
+
+    deadline = time.monotonic() + timeout
+    # path → ((size, mtime_ns), 처음 관측 시각)
+    observed: Dict[Path, Tuple[Tuple[int, int], float]] = {}
+
+    watcher = _open_watcher(directory, use_inotify)
+    try:
+        while True:
+            now = time.monotonic()
+            candidates, partial = _scan(directory, pattern)
+
+            pending: Optional[float] = None
+            if not partial:
+                for path in candidates:
+                    try:
+                        st = path.stat()
+                    except FileNotFoundError:
+                        continue
+
+                    signature = (st.st_size, st.st_mtime_ns)
+                    prev = observed.get(path)
+                    if prev is None or prev[0] != signature:
+                        observed[path] = (signature, now)
+                        prev = observed[path]
+
+                    if st.st_size == 0:
+                        continue
+
+                    stable_for = now - prev[1]
+                    if stable_for >= stable_seconds:
+                        if path.suffix.lower() != ".xlsx" or zipfile.is_zipfile(path):
+                            return path
+                        continue
+
+                    wait_left = stable_seconds - stable_for
+                    pending = wait_left if pending is None else min(pending, wait_left)
+
+            remaining = deadline - now
+            if remaining <= 0:
+                in_progress = ", ".join(p.name for p in partial) or "없음"
+                found = ", ".join(p.name for p in candidates) or "없음"
+                raise DownloadTimeoutError(
+                    f"{timeout:g}초 내에 다운로드가 완료되지 않았습니다 "
+                    f"(dir={directory}, 진행 중: {in_progress}, 후보: {found})"
+                )
+
+            # 안정화 대기 중이면 그 시간만큼, 아니면 이벤트가 올 때까지 기다림
+            watcher.wait(min(remaining, pending if pending is not None else remaining))
+    finally:
+        watcher.close()
@@ -0,0 +1,93 @@
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import Dict, Optional
+
+from rag.final.schemas.ipc_schemas import KiprisYearAggregates
+
+# -----------------------------
+# KIPRIS 통계 캐시 (SQLite)
+# -----------------------------
+# key: 정규화된 IPC 검색 키워드 (build_kipris_ipc_keyword 결과)
+# value: KiprisYearAggregates JSON
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS kipris_stats_cache (
+    keyword    TEXT PRIMARY KEY,
+    payload    TEXT NOT NULL,
+    created_at REAL NOT NULL,
+    expire_at  REAL NOT NULL
+);
+"""
+
+
+class KiprisStatsCache:
+    """
+    같은 IPC 조합의 특허 통계를 ttl_seconds 동안 재사용한다.
+    (브라우저 / HTTP 수집을 건너뜀)
+    """
+
+    def __init__(self, db_path: Path, ttl_seconds: int):
+        db_path = Path(db_path)
+        db_path.parent.mkdir(parents=True, exist_ok=True)
+
+        self.db_path = db_path
+        self.ttl_seconds = ttl_seconds
+        self.hits = 0
+        self.misses = 0
+
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(
+            str(db_path),
+            timeout=30,
+            check_same_thread=False,
+        )
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.executescript(_SCHEMA)
+        self._conn.commit()
+
+    def get(self, keyword: str) -> Optional[KiprisYearAggregates]:
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT payload FROM kipris_stats_cache "
+                "WHERE keyword = ? AND expire_at > ?",
+                (keyword, time.time()),
+            ).fetchone()
+
+            if row is None:
+                self.misses += 1
+                return None
+            self.hits += 1
+
+        return KiprisYearAggregates.model_validate_json(row[0])
+
+    def put(self, keyword: str, aggregates: KiprisYearAggregates) -> None:
+        now = time.time()
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO kipris_stats_cache "
+                "(keyword, payload, created_at, expire_at) VALUES (?, ?, ?, ?)",
+                (keyword, aggregates.model_dump_json(), now, now + self.ttl_seconds),
+            )
+            self._conn.commit()
+
+    def purge_expired(self) -> int:
+        with self._lock:
+            cur = self._conn.execute(
+                "DELETE FROM kipris_stats_cache WHERE expire_at <= ?",
+                (time.time(),),
+            )
+            self._conn.commit()
+        return cur.rowcount
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            (size,) = self._conn.execute(
+                "SELECT COUNT(*) FROM kipris_stats_cache"
+            ).fetchone()
+
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "size": size,
+        }
@@ -2,10 +2,22 @@ import undetected_chromedriver as uc
 from selenium.webdriver.common.by import By
 from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
+from contextlib import contextmanager
 from pathlib import Path
-import time
+import atexit
+import threading
 
-def open_kipris(download_dir):
+from rag.config import (
+    KIPRIS_DRIVER_POOL_SIZE,
+    KIPRIS_DRIVER_MAX_USES,
+    KIPRIS_DOWNLOAD_TIMEOUT,
+)
+from rag.final.collectors.download_watcher import wait_for_download
+
+KIPRIS_MAIN_URL = "https://www.kipris.or.kr/khome/main.do"
+
+
+def open_kipris(download_dir, timeout: int = 20):
     # Chrome 옵션 설정
     options = uc.ChromeOptions()
 
@@ -38,10 +50,12 @@ def open_kipris(download_dir):
     )
 
     # KIPRIS 접속
-    driver.get("https://www.kipris.or.kr/khome/main.do")
+    driver.get(KIPRIS_MAIN_URL)
 
-    # 페이지 로딩 대기
-    time.sleep(3)
+    # 페이지 로딩 대기 (고정 sleep 대신 로딩 완료 시점까지만)
+    WebDriverWait(driver, timeout).until(
+        lambda d: d.execute_script("return document.readyState") == "complete"
+    )
 
     return driver
 
@@ -167,23 +181,191 @@ def click_excel_download(driver, timeout: int = 10):
     try:
         # 1차: 일반 클릭
         excel_btn.click()
-        time.sleep(2)
     except Exception:
         # 2차: JS 클릭
         driver.execute_script("arguments[0].click();", excel_btn)
-        time.sleep(2)
 
-def download_statistics_data_from_kipris(download_dir, keyword):
+def set_download_dir(driver, download_dir) -> None:
+    """
+    실행 중인 드라이버의 다운로드 경로 변경 (풀 드라이버를 검색마다 다른 폴더로 사용)
+    """
+    driver.execute_cdp_cmd(
+        "Page.setDownloadBehavior",
+        {"behavior": "allow", "downloadPath": str(download_dir)},
+    )
+
+# =========================================================
+# 브라우저 풀
+# =========================================================
+class _PooledDriver:
+    def __init__(self, driver):
+        self.driver = driver
+        self.uses = 0
+
+
+class KiprisDriverPool:
+    """
+    오래 유지되는 Chrome 드라이버 풀.
+    - max_size: 동시에 존재할 수 있는 드라이버 수 (초과 요청은 대기)
+    - max_uses: 드라이버 1개당 검색 횟수, 넘으면 종료 후 교체 (메모리 누수 대응)
+    - 재사용 전 health check + 초기화 (추가 창 닫기, 메인 페이지 재진입)
+    - 검색 중 예외가 난 드라이버는 풀로 돌려보내지 않고 종료
+    """
+
+    def __init__(self, max_size: int, max_uses: int = KIPRIS_DRIVER_MAX_USES):
+        self.max_size = max_size
+        self.max_uses = max_uses
+
+        self._slots = threading.BoundedSemaphore(max_size)
+        self._idle: list[_PooledDriver] = []
+        self._lock = threading.Lock()
+        self._closed = False
+
+        self.stats = {"created": 0, "reused": 0, "recycled": 0, "unhealthy": 0}
+
+    def _count(self, key: str) -> None:
+        with self._lock:
+            self.stats[key] += 1
+
+    @staticmethod
+    def _quit(pooled: _PooledDriver) -> None:
+        try:
+            pooled.driver.quit()
+        except Exception:
+            pass
+
+    @staticmethod
+    def _is_healthy(pooled: _PooledDriver) -> bool:
+        try:
+            pooled.driver.execute_script("return document.readyState")
+            return True
+        except Exception:
+            return False
+
+    @staticmethod
+    def _reset(driver) -> None:
+        # 결과/통계 팝업 창 정리 후 메인 페이지로 복귀
+        handles = driver.window_handles
+        for handle in handles[1:]:
+            driver.switch_to.window(handle)
+            driver.close()
+        driver.switch_to.window(handles[0])
+        driver.get(KIPRIS_MAIN_URL)
+
+    def _checkout(self, download_dir) -> _PooledDriver:
+        while True:
+            with self._lock:
+                pooled = self._idle.pop() if self._idle else None
+
+            if pooled is None:
+                self._count("created")
+                return _PooledDriver(open_kipris(str(download_dir)))
+
+            if self._is_healthy(pooled):
+                try:
+                    self._reset(pooled.driver)
+                    self._count("reused")
+                    return pooled
+                except Exception:
+                    pass
+
+            self._count("unhealthy")
+            self._quit(pooled)
+
+    def _checkin(self, pooled: _PooledDriver, ok: bool) -> None:
+        pooled.uses += 1
+
+        with self._lock:
+            keep = ok and not self._closed and pooled.uses < self.max_uses
+            if keep:
+                self._idle.append(pooled)
+
+        if not keep:
+            if ok:
+                self._count("recycled")
+            self._quit(pooled)
+
+    @contextmanager
+    def lease(self, download_dir):
+        """
+        드라이버를 빌려 download_dir로 다운로드하도록 설정한 뒤 돌려준다.
+        """
+        self._slots.acquire()
+        pooled = None
+        ok = False
+        try:
+            pooled = self._checkout(download_dir)
+            set_download_dir(pooled.driver, download_dir)
+            yield pooled.driver
+            ok = True
+        finally:
+            if pooled is not None:
+                self._checkin(pooled, ok)
+            self._slots.release()
+
+    def close(self) -> None:
+        with self._lock:
+            self._closed = True
+            idle, self._idle = self._idle, []
+
+        for pooled in idle:
+            self._quit(pooled)
+
+
+_DRIVER_POOL: KiprisDriverPool | None = None
+_DRIVER_POOL_LOCK = threading.Lock()
+
+
+def get_driver_pool() -> KiprisDriverPool:
+    global _DRIVER_POOL
+
+    with _DRIVER_POOL_LOCK:
+        if _DRIVER_POOL is None:
+            _DRIVER_POOL = KiprisDriverPool(max_size=max(1, KIPRIS_DRIVER_POOL_SIZE))
+            atexit.register(close_driver_pool)
+        return _DRIVER_POOL
+
+
+def close_driver_pool() -> None:
+    global _DRIVER_POOL
+
+    with _DRIVER_POOL_LOCK:
+        pool, _DRIVER_POOL = _DRIVER_POOL, None
+
+    if pool is not None:
+        pool.close()
+
+# =========================================================
+# 통계 다운로드
+# =========================================================
+def _run_statistics_download(driver, download_dir, keyword: str) -> Path:
+    click_detail_search(driver)
+    input_ipc_keyword(driver, keyword)
+    click_detail_search_button(driver)
+    click_result_statistics_button(driver)
+    click_excel_download(driver)
+
+    # 브라우저를 닫거나 풀에 돌려주기 전에 다운로드 완료까지 대기
+    return wait_for_download(download_dir, timeout=KIPRIS_DOWNLOAD_TIMEOUT)
+
+
+def download_statistics_data_from_kipris(download_dir, keyword) -> Path:
+    """
+    KIPRIS 결과 분류통계 엑셀을 download_dir에 받고, 완성된 파일 경로를 반환한다.
+    """
+    if KIPRIS_DRIVER_POOL_SIZE > 0:
+        try:
+            with get_driver_pool().lease(download_dir) as driver:
+                return _run_statistics_download(driver, download_dir, keyword)
+        except Exception as e:
+            raise RuntimeError(
+                f"KIPRIS 통계 다운로드 실패 (IPC={keyword})"
+            ) from e
+
     driver = None
-    time.sleep(3)
     try:
         driver = open_kipris(download_dir)
-        click_detail_search(driver)
-        input_ipc_keyword(driver, keyword)
-        click_detail_search_button(driver)
-        click_result_statistics_button(driver)
-        click_excel_download(driver)
-        driver.quit()
+        return _run_statistics_download(driver, download_dir, keyword)
     except Exception as e:
         raise RuntimeError(
             f"KIPRIS 통계 다운로드 실패 (IPC={keyword})"
@@ -196,5 +378,24 @@ def download_statistics_data_from_kipris(download_dir, keyword):
                 pass
 
 if __name__ == "__main__":
-    KIPRIS_DIR = r"/rag/ipc_statistics"
-    download_statistics_data_from_kipris(KIPRIS_DIR, "G06Q50/16*G06F17/30*G06Q30/02")
\ No newline at end of file
+    # 예: python -m rag.final.collectors.kipris_client "G06Q50/16*G06F17/30*G06Q30/02"
+    #     --download-dir 를 주면 엑셀을 그 폴더에 남기고, 없으면 작업 폴더에서 바로 집계 후 삭제
+    import argparse
+
+    from rag.final.collectors.kipris_parser import build_kipris_year_aggregates, kipris_workspace
+
+    parser = argparse.ArgumentParser(description="KIPRIS 결과 분류통계 엑셀 다운로드")
+    parser.add_argument("keyword", nargs="?", default="G06Q50/16*G06F17/30*G06Q30/02")
+    parser.add_argument("--download-dir", type=Path, default=None)
+    args = parser.parse_args()
+
+    try:
+        if args.download_dir is not None:
+            args.download_dir.mkdir(parents=True, exist_ok=True)
+            print(download_statistics_data_from_kipris(args.download_dir, args.keyword))
+        else:
+            with kipris_workspace() as workspace:
+                excel_path = download_statistics_data_from_kipris(workspace, args.keyword)
+                print(build_kipris_year_aggregates(excel_path).model_dump())
+    finally:
+        close_driver_pool()
@@ -0,0 +1,177 @@
+import tempfile
+import zipfile
+from typing import IO, Optional
+
+import httpx
+
+from rag.config import (
+    KIPRIS_BASE_URL,
+    KIPRIS_HTTP_TIMEOUT,
+    KIPRIS_PATHS,
+    KIPRIS_QUERY_TEMPLATE,
+    KIPRIS_SEARCH_FORM,
+    KIPRIS_STATISTICS_FORM,
+)
+from rag.final.collectors.kipris_parser import build_kipris_year_aggregates
+from rag.final.schemas.ipc_schemas import KiprisYearAggregates
+
+# ================================
+# 설정 (KIPRIS_HTTP* / 경로 / 폼은 rag/config.py)
+# ================================
+KIPRIS_HEADERS = {
+    "User-Agent": (
+        "Mozilla/5.0 (Windows NT 10.0; Win64; x64) "
+        "AppleWebKit/537.36 (KHTML, like Gecko) "
+        "Chrome/121.0.0.0 Safari/537.36"
+    ),
+    "Accept-Language": "ko-KR,ko;q=0.9",
+}
+
+# 엑셀을 메모리에 두다가 이 크기를 넘으면 임시 파일로 넘김
+SPOOL_MAX_BYTES = 16 * 1024 * 1024
+XLSX_MAGIC = b"PK\x03\x04"
+
+
+class KiprisHttpError(RuntimeError):
+    """
+    HTTP 경로 실패 (Selenium fallback 대상)
+    """
+
+
+# ================================
+# 요청 폼
+# ================================
+def build_search_query(keyword: str) -> str:
+    """
+    상세검색 IPC 입력(sd01_g05_text_01) → KIPRIS 검색식
+    예: G06Q50/16*G06F17/30 → IPC=[G06Q50/16*G06F17/30]
+    """
+    return KIPRIS_QUERY_TEMPLATE.replace("{keyword}", keyword)
+
+
+def _render_form(template: dict, keyword: str) -> dict:
+    query = build_search_query(keyword)
+    return {
+        field: str(value).replace("{query}", query)
+        for field, value in template.items()
+    }
+
+
+def build_search_form(keyword: str) -> dict:
+    return _render_form(KIPRIS_SEARCH_FORM, keyword)
+
+
+def build_statistics_form(keyword: str) -> dict:
+    return _render_form(KIPRIS_STATISTICS_FORM, keyword)
+
+
+# ================================
+# HTTP 클라이언트
+# ================================
+class KiprisHttpClient:
+    """
+    브라우저 없이 KIPRIS 상세검색 → 결과 분류통계 엑셀을 받아온다.
+    하나의 httpx.Client 세션(쿠키 공유)으로 Selenium 클릭 순서를 재현한다.
+
+    transport를 주면(httpx.MockTransport 등) 네트워크 없이 테스트할 수 있다.
+    """
+
+    def __init__(
+        self,
+        base_url: str = KIPRIS_BASE_URL,
+        timeout: float = KIPRIS_HTTP_TIMEOUT,
+        transport: Optional[httpx.BaseTransport] = None,
+    ):
+        self.client = httpx.Client(
+            base_url=base_url,
+            timeout=timeout,
+            headers=KIPRIS_HEADERS,
+            follow_redirects=True,
+            transport=transport,
+        )
+
+    def __enter__(self) -> "KiprisHttpClient":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+    def close(self) -> None:
+        self.client.close()
+
+    def _check(self, response: httpx.Response, step: str) -> None:
+        if response.status_code >= 400:
+            raise KiprisHttpError(
+                f"KIPRIS {step} 요청 실패 (HTTP {response.status_code})"
+            )
+
+    def open_session(self) -> None:
+        response = self.client.get(KIPRIS_PATHS["main"])
+        self._check(response, "main")
+
+    def search(self, keyword: str) -> None:
+        response = self.client.post(
+            KIPRIS_PATHS["search"],
+            data=build_search_form(keyword),
+        )
+        self._check(response, "search")
+
+    def stream_statistics_xlsx(self, keyword: str, sink: IO[bytes]) -> int:
+        """
+        결과 분류통계 엑셀을 sink로 스트리밍한다. 받은 바이트 수를 반환한다.
+        """
+        size = 0
+        head = b""
+
+        with self.client.stream(
+            "POST",
+            KIPRIS_PATHS["statistics"],
+            data=build_statistics_form(keyword),
+        ) as response:
+            self._check(response, "statistics")
+
+            for chunk in response.iter_bytes():
+                if len(head) < len(XLSX_MAGIC):
+                    head += chunk[: len(XLSX_MAGIC) - len(head)]
+                sink.write(chunk)
+                size += len(chunk)
+
+        # 세션 만료 등으로 HTML 오류 페이지가 오는 경우
+        if not head.startswith(XLSX_MAGIC):
+            raise KiprisHttpError("KIPRIS 통계 응답이 XLSX가 아닙니다")
+
+        return size
+
+    def fetch_year_aggregates(self, keyword: str) -> KiprisYearAggregates:
+        """
+        open_session → search → statistics 엑셀을 받아 바로 연도별 집계로 변환한다.
+        (엑셀은 디스크 다운로드 폴더를 거치지 않음)
+        """
+        self.open_session()
+        self.search(keyword)
+
+        with tempfile.SpooledTemporaryFile(max_size=SPOOL_MAX_BYTES) as buffer:
+            size = self.stream_statistics_xlsx(keyword, buffer)
+            buffer.seek(0)
+
+            try:
+                aggregates = build_kipris_year_aggregates(buffer)
+            except (zipfile.BadZipFile, KeyError) as e:
+                raise KiprisHttpError(f"KIPRIS 통계 엑셀 파싱 실패: {e}") from e
+
+        print(f"KIPRIS HTTP 통계 수신: {size:,} bytes")
+        return aggregates
+
+
+def fetch_kipris_year_aggregates(
+    keyword: str,
+    base_url: str = KIPRIS_BASE_URL,
+) -> KiprisYearAggregates:
+    with KiprisHttpClient(base_url=base_url) as client:
+        return client.fetch_year_aggregates(keyword)
+
+
+if __name__ == "__main__":
+    # 예: KIPRIS_BASE_URL=http://127.0.0.1:8765 python -m rag.final.collectors.kipris_http
+    agg = fetch_kipris_year_aggregates("G06Q50/16*G06F17/30*G06Q30/02")
+    print(agg.model_dump())
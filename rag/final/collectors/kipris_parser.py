@@ -1,10 +1,12 @@
 import zipfile
 import re
 import shutil
+import tempfile
+from contextlib import contextmanager
 from pathlib import Path
 from lxml import etree
 from collections import defaultdict
-from typing import Optional, Tuple
+from typing import IO, Iterator, Optional, Tuple, Union
 import pandas as pd
 
 from rag.final.schemas.ipc_schemas import (
@@ -15,6 +17,7 @@ from rag.final.schemas.ipc_schemas import (
 # ================================
 # 설정
 # ================================
+# 작업별 임시 폴더(kipris_workspace)들이 만들어지는 상위 폴더
 KIPRIS_DIR = Path(r"/rag/ipc_statistics")
 
 YEAR_COUNT_PATTERN = re.compile(r"(19\d{2}|20\d{2})\((\d+)\)")
@@ -34,19 +37,29 @@ def _parse_year_count(cell: object) -> Tuple[Optional[int], Optional[int]]:
     return int(m.group(1)), int(m.group(2))
 
 
-def cleanup_directory(dir_path: Path) -> None:
+@contextmanager
+def kipris_workspace(root: Path = KIPRIS_DIR, prefix: str = "job-") -> Iterator[Path]:
     """
-    폴더 내 파일 전부 삭제 후 폴더 재생성
-    (엑셀만 존재한다는 전제)
+    작업(회사/IP 항목) 하나 전용 다운로드 폴더를 만들고, 블록이 끝나면 폴더째 삭제한다.
+    → 여러 IP 분석을 동시에 돌려도 서로의 엑셀을 읽거나 지우지 않음
     """
-    shutil.rmtree(dir_path)
-    dir_path.mkdir(parents=True, exist_ok=True)
+    root = Path(root)
+    root.mkdir(parents=True, exist_ok=True)
+
+    workspace = Path(tempfile.mkdtemp(prefix=prefix, dir=root))
+    try:
+        yield workspace
+    finally:
+        shutil.rmtree(workspace, ignore_errors=True)
 
 
 # ================================
 # XLSX 파싱 (KIPRIS 전용)
 # ================================
-def read_kipris_excel_values(xlsx_path: Path) -> pd.DataFrame:
+def read_kipris_excel_values(xlsx_path: Union[Path, IO[bytes]]) -> pd.DataFrame:
+    """
+    xlsx_path: 파일 경로 또는 seek 가능한 바이너리 스트림 (HTTP 수신 버퍼)
+    """
     with zipfile.ZipFile(xlsx_path, "r") as z:
         shared_strings = []
 
@@ -99,7 +112,7 @@ def build_year_series_from_column(df: pd.DataFrame, col_name: str) -> YearSeries
     return YearSeries(years=years, values_int=values)
 
 
-def build_kipris_year_aggregates(xlsx_path: Path) -> KiprisYearAggregates:
+def build_kipris_year_aggregates(xlsx_path: Union[Path, IO[bytes]]) -> KiprisYearAggregates:
     df = read_kipris_excel_values(xlsx_path)
 
     return KiprisYearAggregates(
@@ -112,31 +125,45 @@ def build_kipris_year_aggregates(xlsx_path: Path) -> KiprisYearAggregates:
 # ================================
 # 메인 실행 로직
 # ================================
-def run_kipris_pipeline() -> KiprisYearAggregates:
-    excel_files = list(KIPRIS_DIR.glob("*.xlsx"))
-
-    if not excel_files:
-        raise FileNotFoundError("KIPRIS 엑셀 파일이 존재하지 않습니다.")
+def run_kipris_pipeline(
+    workspace: Path,
+    excel_path: Optional[Path] = None,
+) -> KiprisYearAggregates:
+    """
+    workspace(작업 전용 폴더)의 KIPRIS 엑셀을 연도별 집계로 변환한다.
+    폴더 정리는 kipris_workspace가 담당한다.
+    """
+    if excel_path is None:
+        excel_files = sorted(
+            Path(workspace).glob("*.xlsx"),
+            key=lambda p: p.stat().st_mtime,
+        )
+        if not excel_files:
+            raise FileNotFoundError(f"KIPRIS 엑셀 파일이 존재하지 않습니다: {workspace}")
 
-    # ✅ 하나만 존재한다고 보장
-    excel_path = excel_files[0]
-    print(f"처리 대상 파일: {excel_path.name}")
+        # 작업 전용 폴더이므로 가장 최근 파일이 이번 다운로드
+        excel_path = excel_files[-1]
 
-    try:
-        aggregates = build_kipris_year_aggregates(excel_path)
-        return aggregates
-
-    finally:
-        # ✅ 성공/실패 관계없이 폴더 정리
-        cleanup_directory(KIPRIS_DIR)
-        print("KIPRIS 디렉토리 정리 완료")
+    print(f"처리 대상 파일: {Path(excel_path).name}")
+    return build_kipris_year_aggregates(excel_path)
 
 
 # ================================
 # 엔트리포인트
 # ================================
 if __name__ == "__main__":
-    agg = run_kipris_pipeline()
+    # 예: python -m rag.final.collectors.kipris_parser rag/final/collectors/fixtures/kipris/statistics.xlsx
+    #     python -m rag.final.collectors.kipris_parser <다운로드 폴더>   (가장 최근 .xlsx)
+    import argparse
+
+    parser = argparse.ArgumentParser(description="KIPRIS 통계 엑셀 → 연도별 집계")
+    parser.add_argument("path", type=Path, help="KIPRIS 통계 .xlsx 파일 또는 엑셀이 있는 폴더")
+    args = parser.parse_args()
+
+    if args.path.is_dir():
+        agg = run_kipris_pipeline(args.path)
+    else:
+        agg = run_kipris_pipeline(args.path.parent, excel_path=args.path)
 
     print("=== Application ===")
     print(agg.application.model_dump())
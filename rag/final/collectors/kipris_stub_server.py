@@ -0,0 +1,177 @@
+"""
+KIPRIS 대역(stub) 서버 - 녹화된 응답으로 kipris_http를 로컬에서 검증한다.
+
+fixtures 디렉토리 구성:
+    main.html         # KIPRIS_PATHS["main"] 응답
+    search.html       # KIPRIS_PATHS["search"] 응답
+    statistics.xlsx   # KIPRIS_PATHS["statistics"] 응답 (실제 다운로드한 엑셀)
+
+기본 fixtures: rag/final/collectors/fixtures/kipris (합성 엑셀, 연도별 기대값은 EXPECTED_AGGREGATES)
+
+실행:
+    python -m rag.final.collectors.kipris_stub_server --port 8765
+    KIPRIS_BASE_URL=http://127.0.0.1:8765 python -m rag.final.collectors.kipris_http
+
+자체 검증 (KiprisHttpClient.fetch_year_aggregates → 대역 서버):
+    python -m rag.final.collectors.kipris_stub_server --check
+"""
+import argparse
+import threading
+from contextlib import contextmanager
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from typing import Iterator, List
+from urllib.parse import parse_qs
+
+from rag.config import KIPRIS_PATHS
+from rag.final.collectors.kipris_http import (
+    KiprisHttpClient,
+    build_search_form,
+    build_statistics_form,
+)
+
+DEFAULT_FIXTURES_DIR = Path(__file__).resolve().parent / "fixtures" / "kipris"
+
+FIXTURE_FILES = {
+    "main": ("main.html", "text/html; charset=utf-8"),
+    "search": ("search.html", "text/html; charset=utf-8"),
+    "statistics": (
+        "statistics.xlsx",
+        "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
+    ),
+}
+
+STUB_SESSION_COOKIE = "JSESSIONID=kipris-stub; Path=/"
+STUB_SESSION_ID = STUB_SESSION_COOKIE.split(";", 1)[0]
+
+# fixtures/kipris/statistics.xlsx 의 연도별 합계
+EXPECTED_AGGREGATES = {
+    "application": {"years": [2019, 2020, 2021], "values_int": [1, 3, 3]},
+    "publication": {"years": [2020, 2021, 2022], "values_int": [1, 3, 2]},
+    "registration": {"years": [2021, 2022, 2023], "values_int": [1, 2, 1]},
+}
+
+
+def _make_handler(fixtures_dir: Path, requests_log: List[dict]):
+    routes = {
+        path: FIXTURE_FILES[name]
+        for name, path in KIPRIS_PATHS.items()
+    }
+
+    class _Handler(BaseHTTPRequestHandler):
+        def _serve(self) -> None:
+            path = self.path.split("?", 1)[0]
+            length = int(self.headers.get("Content-Length") or 0)
+            body = self.rfile.read(length) if length else b""
+
+            requests_log.append({
+                "method": self.command,
+                "path": path,
+                "cookie": self.headers.get("Cookie"),
+                "body": body.decode("utf-8", errors="replace"),
+            })
+
+            if path not in routes:
+                self.send_error(404)
+                return
+
+            # 실제 사이트처럼 main에서 받은 세션 쿠키 없이는 검색/통계 거부
+            if path != KIPRIS_PATHS["main"] and STUB_SESSION_ID not in (self.headers.get("Cookie") or ""):
+                self.send_error(403, "session cookie required")
+                return
+
+            file_name, content_type = routes[path]
+            payload = (fixtures_dir / file_name).read_bytes()
+
+            self.send_response(200)
+            self.send_header("Content-Type", content_type)
+            self.send_header("Content-Length", str(len(payload)))
+            self.send_header("Set-Cookie", STUB_SESSION_COOKIE)
+            self.end_headers()
+            self.wfile.write(payload)
+
+        do_GET = _serve
+        do_POST = _serve
+
+        def log_message(self, format, *args):
+            pass
+
+    return _Handler
+
+
+@contextmanager
+def running_stub_server(
+    fixtures_dir: Path,
+    host: str = "127.0.0.1",
+    port: int = 0,
+) -> Iterator[tuple[str, List[dict]]]:
+    """
+    백그라운드 스레드로 대역 서버를 띄우고 (base_url, 요청 기록)을 돌려준다.
+    port=0 이면 빈 포트를 자동 할당한다.
+    """
+    requests_log: List[dict] = []
+    server = ThreadingHTTPServer(
+        (host, port),
+        _make_handler(Path(fixtures_dir), requests_log),
+    )
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+
+    try:
+        yield f"http://{host}:{server.server_port}", requests_log
+    finally:
+        server.shutdown()
+        server.server_close()
+
+
+def check_fetch_year_aggregates(
+    fixtures_dir: Path = DEFAULT_FIXTURES_DIR,
+    keyword: str = "G06F17/30*G06Q50/16",
+) -> None:
+    """
+    대역 서버를 상대로 KiprisHttpClient.fetch_year_aggregates 전체 흐름을 검증한다.
+    - 파싱된 연도별 집계 == EXPECTED_AGGREGATES
+    - 검색/통계 요청이 main 세션 쿠키와 함께 기대한 폼 본문으로 전송됨
+    """
+    with running_stub_server(fixtures_dir) as (base_url, requests_log):
+        with KiprisHttpClient(base_url=base_url) as client:
+            aggregates = client.fetch_year_aggregates(keyword)
+
+    assert aggregates.model_dump() == EXPECTED_AGGREGATES, aggregates.model_dump()
+
+    paths = [r["path"] for r in requests_log]
+    assert paths == [KIPRIS_PATHS["main"], KIPRIS_PATHS["search"], KIPRIS_PATHS["statistics"]], paths
+
+    main, search, statistics = requests_log
+    assert main["method"] == "GET"
+
+    for record, expected_form in (
+        (search, build_search_form(keyword)),
+        (statistics, build_statistics_form(keyword)),
+    ):
+        assert record["method"] == "POST"
+        assert STUB_SESSION_ID in (record["cookie"] or ""), record
+        form = {k: v[0] for k, v in parse_qs(record["body"]).items()}
+        assert form == expected_form, (form, expected_form)
+
+    print(f"✅ KIPRIS stub check 통과: {aggregates.model_dump()}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="KIPRIS 녹화 응답 대역 서버")
+    parser.add_argument("--fixtures", default=str(DEFAULT_FIXTURES_DIR), help="main.html / search.html / statistics.xlsx 경로")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--check", action="store_true", help="fetch_year_aggregates 자체 검증 후 종료")
+    args = parser.parse_args()
+
+    if args.check:
+        check_fetch_year_aggregates(Path(args.fixtures))
+        raise SystemExit(0)
+
+    server = ThreadingHTTPServer(
+        (args.host, args.port),
+        _make_handler(Path(args.fixtures), []),
+    )
+    print(f"KIPRIS stub server: http://{args.host}:{args.port}")
+    server.serve_forever()
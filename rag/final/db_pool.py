@@ -0,0 +1,165 @@
+import asyncio
+import threading
+from contextlib import asynccontextmanager
+from typing import AsyncIterator, Dict, Optional
+
+from pgvector.psycopg import register_vector, register_vector_async
+from psycopg_pool import ConnectionPool, AsyncConnectionPool
+
+from rag.config import POSTGRES_CONN, POSTGRES_POOL_CONFIG
+
+# -----------------------------
+# 프로세스 공용 커넥션 풀
+# -----------------------------
+_POOL: Optional[ConnectionPool] = None
+_POOL_LOCK = threading.Lock()
+
+# 비동기 풀은 이벤트 루프마다 하나 (AsyncConnectionPool은 생성한 루프에 묶임)
+# key: 실행 중인 이벤트 루프
+_ASYNC_POOLS: Dict[asyncio.AbstractEventLoop, AsyncConnectionPool] = {}
+_ASYNC_POOL_LOCKS: Dict[asyncio.AbstractEventLoop, asyncio.Lock] = {}
+_ASYNC_POOL_USERS: Dict[asyncio.AbstractEventLoop, int] = {}
+_ASYNC_POOLS_GUARD = threading.Lock()
+
+
+def _configure_connection(conn) -> None:
+    # pgvector 타입 어댑터 등록 (numpy 배열 ↔ vector, binary 전송 지원)
+    register_vector(conn)
+    conn.commit()
+
+
+async def _aconfigure_connection(conn) -> None:
+    await register_vector_async(conn)
+    await conn.commit()
+
+
+def get_pool() -> ConnectionPool:
+    """
+    프로세스 전역 Postgres 커넥션 풀을 반환한다. (최초 호출 시 생성)
+    """
+    global _POOL
+
+    if _POOL is None:
+        with _POOL_LOCK:
+            if _POOL is None:
+                _POOL = ConnectionPool(
+                    conninfo=POSTGRES_CONN,
+                    min_size=POSTGRES_POOL_CONFIG["min_size"],
+                    max_size=POSTGRES_POOL_CONFIG["max_size"],
+                    max_idle=POSTGRES_POOL_CONFIG["max_idle"],
+                    timeout=POSTGRES_POOL_CONFIG["timeout"],
+                    max_lifetime=POSTGRES_POOL_CONFIG["max_lifetime"],
+                    check=ConnectionPool.check_connection if POSTGRES_POOL_CONFIG["check"] else None,
+                    configure=_configure_connection,
+                    name="rag-retriever",
+                    open=True,
+                )
+    return _POOL
+
+
+def _async_pool_lock(loop: asyncio.AbstractEventLoop) -> asyncio.Lock:
+    with _ASYNC_POOLS_GUARD:
+        # 이미 닫힌 루프의 풀은 더 이상 사용할 수 없으므로 참조만 정리
+        for closed in [lp for lp in _ASYNC_POOL_LOCKS if lp.is_closed()]:
+            _ASYNC_POOL_LOCKS.pop(closed, None)
+            _ASYNC_POOLS.pop(closed, None)
+        return _ASYNC_POOL_LOCKS.setdefault(loop, asyncio.Lock())
+
+
+async def get_async_pool() -> AsyncConnectionPool:
+    """
+    현재 이벤트 루프 전용 비동기 커넥션 풀을 반환한다.
+    AsyncConnectionPool은 실행 중인 이벤트 루프 안에서 open 해야 하고 그 루프에서만 쓸 수 있으므로
+    asyncio.run()을 여러 번 호출해도 루프마다 별도 풀을 만든다.
+    """
+    loop = asyncio.get_running_loop()
+
+    pool = _ASYNC_POOLS.get(loop)
+    if pool is not None:
+        return pool
+
+    async with _async_pool_lock(loop):
+        pool = _ASYNC_POOLS.get(loop)
+        if pool is None:
+            pool = AsyncConnectionPool(
+                conninfo=POSTGRES_CONN,
+                min_size=POSTGRES_POOL_CONFIG["min_size"],
+                max_size=POSTGRES_POOL_CONFIG["max_size"],
+                max_idle=POSTGRES_POOL_CONFIG["max_idle"],
+                timeout=POSTGRES_POOL_CONFIG["timeout"],
+                max_lifetime=POSTGRES_POOL_CONFIG["max_lifetime"],
+                check=AsyncConnectionPool.check_connection if POSTGRES_POOL_CONFIG["check"] else None,
+                configure=_aconfigure_connection,
+                name="rag-retriever-async",
+                open=False,
+            )
+            await pool.open()
+            _ASYNC_POOLS[loop] = pool
+    return pool
+
+
+def close_pools() -> None:
+    """
+    동기 풀을 닫는다. (비동기 풀은 aclose_pools 사용)
+    """
+    global _POOL
+
+    with _POOL_LOCK:
+        if _POOL is not None:
+            _POOL.close()
+            _POOL = None
+
+
+async def aclose_pools() -> None:
+    """
+    현재 이벤트 루프의 비동기 풀을 닫는다. (asyncio.run 종료 전에 호출)
+    """
+    loop = asyncio.get_running_loop()
+
+    with _ASYNC_POOLS_GUARD:
+        pool = _ASYNC_POOLS.pop(loop, None)
+        _ASYNC_POOL_LOCKS.pop(loop, None)
+
+    if pool is not None:
+        await pool.close()
+
+
+def has_async_pool_session() -> bool:
+    """
+    현재 이벤트 루프에 열린 async_pool_session이 있는지
+    """
+    loop = asyncio.get_running_loop()
+    with _ASYNC_POOLS_GUARD:
+        return _ASYNC_POOL_USERS.get(loop, 0) > 0
+
+
+@asynccontextmanager
+async def async_pool_session() -> AsyncIterator[None]:
+    """
+    비동기 풀의 수명을 호출자가 소유하는 구간.
+    블록 안의 모든 agenerate는 같은 풀(커넥션)을 재사용하고, 블록이 끝날 때 한 번만 닫는다.
+    → 여러 회사를 처리하는 배치 드라이버는 배치 전체를 이 블록으로 감싼다.
+
+        async with async_pool_session():
+            for job in jobs:
+                await agenerate(...)
+
+    중첩 가능: 같은 루프의 가장 바깥 세션이 끝날 때 풀을 닫는다.
+    (asyncio.run()이 끝난 뒤 닫힌 루프에 묶인 풀 / 커넥션이 남지 않음)
+    """
+    loop = asyncio.get_running_loop()
+
+    with _ASYNC_POOLS_GUARD:
+        _ASYNC_POOL_USERS[loop] = _ASYNC_POOL_USERS.get(loop, 0) + 1
+
+    try:
+        yield
+    finally:
+        with _ASYNC_POOLS_GUARD:
+            _ASYNC_POOL_USERS[loop] -= 1
+            last = _ASYNC_POOL_USERS[loop] == 0
+            if last:
+                del _ASYNC_POOL_USERS[loop]
+
+        if last:
+            await aclose_pools()
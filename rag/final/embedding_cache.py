@@ -0,0 +1,197 @@
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import Dict, List
+
+import numpy as np
+from langchain_core.embeddings import Embeddings
+
+# -----------------------------
+# SQLite 임베딩 캐시
+# -----------------------------
+# key: (model_name, normalize, text)
+# value: float32 vector (BLOB)
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS embedding_cache (
+    model       TEXT    NOT NULL,
+    normalize   INTEGER NOT NULL,
+    text        TEXT    NOT NULL,
+    vector      BLOB    NOT NULL,
+    last_access REAL    NOT NULL,
+    PRIMARY KEY (model, normalize, text)
+);
+CREATE INDEX IF NOT EXISTS idx_embedding_cache_last_access
+    ON embedding_cache (last_access);
+"""
+
+
+class EmbeddingCache:
+    """
+    디스크(SQLite) 기반 쿼리 임베딩 캐시.
+    max_entries를 넘으면 가장 오래 사용되지 않은 항목부터 삭제한다(LRU).
+    """
+
+    def __init__(self, db_path: Path, max_entries: int = 100_000):
+        db_path = Path(db_path)
+        db_path.parent.mkdir(parents=True, exist_ok=True)
+
+        self.db_path = db_path
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(
+            str(db_path),
+            timeout=30,
+            check_same_thread=False,
+        )
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.executescript(_SCHEMA)
+        self._conn.commit()
+
+    def get_many(
+        self,
+        model: str,
+        normalize: bool,
+        texts: List[str],
+    ) -> Dict[str, list]:
+        found: Dict[str, list] = {}
+        if not texts:
+            return found
+
+        unique_texts = list(dict.fromkeys(texts))
+
+        with self._lock:
+            for text in unique_texts:
+                row = self._conn.execute(
+                    "SELECT vector FROM embedding_cache "
+                    "WHERE model = ? AND normalize = ? AND text = ?",
+                    (model, int(normalize), text),
+                ).fetchone()
+                if row is not None:
+                    found[text] = np.frombuffer(row[0], dtype=np.float32).tolist()
+
+            if found:
+                now = time.time()
+                self._conn.executemany(
+                    "UPDATE embedding_cache SET last_access = ? "
+                    "WHERE model = ? AND normalize = ? AND text = ?",
+                    [(now, model, int(normalize), t) for t in found],
+                )
+                self._conn.commit()
+
+            self.hits += len(found)
+            self.misses += len(unique_texts) - len(found)
+
+        return found
+
+    def put_many(
+        self,
+        model: str,
+        normalize: bool,
+        items: Dict[str, list],
+    ) -> None:
+        if not items:
+            return
+
+        now = time.time()
+        rows = [
+            (
+                model,
+                int(normalize),
+                text,
+                np.asarray(vec, dtype=np.float32).tobytes(),
+                now,
+            )
+            for text, vec in items.items()
+        ]
+
+        with self._lock:
+            self._conn.executemany(
+                "INSERT OR REPLACE INTO embedding_cache "
+                "(model, normalize, text, vector, last_access) "
+                "VALUES (?, ?, ?, ?, ?)",
+                rows,
+            )
+            self._evict()
+            self._conn.commit()
+
+    def _evict(self) -> None:
+        (count,) = self._conn.execute(
+            "SELECT COUNT(*) FROM embedding_cache"
+        ).fetchone()
+
+        overflow = count - self.max_entries
+        if overflow <= 0:
+            return
+
+        self._conn.execute(
+            "DELETE FROM embedding_cache WHERE rowid IN ("
+            "  SELECT rowid FROM embedding_cache "
+            "  ORDER BY last_access ASC LIMIT ?"
+            ")",
+            (overflow,),
+        )
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            (size,) = self._conn.execute(
+                "SELECT COUNT(*) FROM embedding_cache"
+            ).fetchone()
+
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "size": size,
+        }
+
+
+# -----------------------------
+# 캐시 적용 Embeddings 래퍼
+# -----------------------------
+class CachedEmbeddings(Embeddings):
+    """
+    기존 Embeddings 객체를 감싸 캐시를 먼저 조회하고,
+    캐시에 없는 문장만 실제 모델로 임베딩한다.
+    """
+
+    def __init__(
+        self,
+        embeddings: Embeddings,
+        cache: EmbeddingCache,
+        model_name: str,
+        normalize: bool,
+    ):
+        self.embeddings = embeddings
+        self.cache = cache
+        self.model_name = model_name
+        self.normalize = normalize
+
+    def embed_documents(self, texts: List[str]) -> List[List[float]]:
+        found = self.cache.get_many(self.model_name, self.normalize, texts)
+
+        missing = [t for t in dict.fromkeys(texts) if t not in found]
+        if missing:
+            vectors = self.embeddings.embed_documents(missing)
+            computed = dict(zip(missing, vectors))
+            self.cache.put_many(self.model_name, self.normalize, computed)
+            found.update(computed)
+
+        return [found[t] for t in texts]
+
+    def embed_query(self, text: str) -> List[float]:
+        found = self.cache.get_many(self.model_name, self.normalize, [text])
+        if text in found:
+            return found[text]
+
+        vector = self.embeddings.embed_query(text)
+        self.cache.put_many(self.model_name, self.normalize, {text: vector})
+        return vector
+
+    def __getattr__(self, name):
+        # model_name, client 등 원본 속성 접근은 내부 모델로 위임
+        if name == "embeddings":
+            raise AttributeError(name)
+        return getattr(self.embeddings, name)
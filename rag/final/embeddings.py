@@ -0,0 +1,66 @@
+from typing import Dict, Iterable, List
+
+from rag.config import EMBEDDING_MODEL
+from rag.final.queries import ITEM_DEFINITIONS
+
+# =========================================================
+# 항목별 검색 쿼리 생성
+# =========================================================
+def build_item_queries(company: str, item_ids: Iterable[int]) -> Dict[int, str]:
+    """
+    ITEM_DEFINITIONS의 query 템플릿에 회사명을 채워 item_id → 쿼리 문자열로 반환한다.
+    """
+    return {
+        item_id: ITEM_DEFINITIONS[item_id]["query"].format(company=company)
+        for item_id in item_ids
+    }
+
+# =========================================================
+# 배치 임베딩
+# =========================================================
+def embed_texts(texts: List[str]) -> List[list]:
+    """
+    여러 문장을 한 번의 배치 forward로 임베딩한다.
+    중복 문장은 한 번만 계산한다.
+    """
+    if not texts:
+        return []
+
+    unique_texts = list(dict.fromkeys(texts))
+    vectors = EMBEDDING_MODEL.embed_documents(unique_texts)
+    vec_map = dict(zip(unique_texts, vectors))
+
+    return [vec_map[t] for t in texts]
+
+
+def embed_item_queries(company: str, item_ids: Iterable[int]) -> Dict[int, list]:
+    """
+    한 회사의 항목 쿼리 전체를 한 번에 임베딩한다.
+    """
+    return embed_item_queries_many([company], item_ids)[company]
+
+
+def embed_item_queries_many(
+    companies: List[str],
+    item_ids: Iterable[int],
+) -> Dict[str, Dict[int, list]]:
+    """
+    여러 회사의 항목 쿼리를 모아 단일 배치로 임베딩한다.
+    반환: company → (item_id → query_vec)
+    """
+    item_ids = list(item_ids)
+
+    keys = []
+    texts = []
+    for company in companies:
+        for item_id, query in build_item_queries(company, item_ids).items():
+            keys.append((company, item_id))
+            texts.append(query)
+
+    vectors = embed_texts(texts)
+
+    result: Dict[str, Dict[int, list]] = {company: {} for company in companies}
+    for (company, item_id), vec in zip(keys, vectors):
+        result[company][item_id] = vec
+
+    return result
@@ -1,22 +1,54 @@
+import asyncio
+import contextvars
 import json
+import threading
 import time
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
-from typing import Optional, Callable, TypeVar
+from typing import Optional, Callable, TypeVar, Awaitable, Iterator, AsyncIterator, Any, Tuple
 
-from google.genai.types import Tool, GenerateContentConfig, GoogleSearch
+from google.genai.types import Tool, GenerateContentConfig, GoogleSearch, GroundingMetadata, HttpOptions
+from pydantic import ValidationError
 from langchain_core.output_parsers import JsonOutputParser
 from langchain_core.prompts import PromptTemplate
 from rag.final.prompts.ipc_prompt import IPC_PROMPT
 from rag.final.prompts.strict_instruction import STRICT_JSON_INSTRUCTION
 from rag.final.schemas.ipc_schemas import IPCAnalysisResult
-from rag.config import LLM_A, GEMINI_CLIENT
+from rag.config import (
+    LLM_A,
+    GEMINI_CLIENT,
+    LLM_STRUCTURED_OUTPUT,
+    GEMINI_RATE_SCOPE,
+    LANGCHAIN_RATE_SCOPE,
+    LLM_RESPONSE_CACHE,
+    MARKET_FALLBACK_PARALLELISM,
+)
+from rag.final.cache_manager import (
+    get_or_upload_file,
+    aget_or_upload_file,
+    file_content_hash,
+    vf_cache_content_key,
+)
+from rag.final.response_cache import build_response_cache_key
+from rag.final.stream_json import IncrementalJsonObjectParser
+from rag.final.retry_policy import (
+    DEFAULT_RETRY_POLICY,
+    EmptyResponseError,
+    RetryPolicy,
+    check_deadline,
+    plan_retry,
+    record_success,
+    remaining_time,
+)
+from rag.final.rate_limiter import RATE_LIMITER, estimate_tokens
 from rag.final.utils import clean_json_string, has_valid_market_size, expand_market_keywords, guess_base_market
-from rag.final.schemas.base_schemas import ReportItemResult
+from rag.final.schemas.base_schemas import ReportItemResult, MultiReportItemResult
 from rag.final.schemas.market_schemas import MarketForecastAndCompetitors
 from rag.final.prompts.base_prompt import (
     VECTORDB_BASE_PROMPT,
     FILE_BASE_PROMPT,
     VECTORDB_AND_FILE_BASE_PROMPT,
+    VECTORDB_AND_FILE_MULTI_ITEM_PROMPT,
     GOOGLE_SEARCH_BASE_PROMPT,
 )
 
@@ -25,29 +57,71 @@ from rag.final.prompts.base_prompt import (
 # =========================================================
 T = TypeVar("T")
 
+GEMINI_MODEL = "gemini-2.5-flash"
+
+# 파싱 실패 카운터
+# - structured: 네이티브 스키마(response_schema / with_structured_output) 응답 검증 실패
+# - text: 텍스트 응답 → clean_json_string 정제 경로 실패
+# - stream: 스트리밍 점진 파서 검증 실패
+PARSE_FAILURE_STATS = {"structured": 0, "text": 0, "stream": 0}
+_PARSE_STATS_LOCK = threading.Lock()
+
+def _count_parse_failure(mode: str) -> None:
+    with _PARSE_STATS_LOCK:
+        PARSE_FAILURE_STATS[mode] += 1
+
+def get_parse_failure_stats() -> dict:
+    with _PARSE_STATS_LOCK:
+        return dict(PARSE_FAILURE_STATS)
+
 def retry_llm_call(
     fn: Callable[[int], T],
-    max_retry: int = 3,
-    sleep_sec: float = 1.0,
-    error_prefix: str = "LLM 처리 실패"
+    error_prefix: str = "LLM 처리 실패",
+    policy: RetryPolicy = DEFAULT_RETRY_POLICY,
+) -> T:
+    """
+    오류 종류(rate_limit / transient / parse / permanent)별 백오프로 재시도한다.
+    모든 시도는 retry_policy의 시도 기록에 남는다.
+
+    매 시도 전에 항목 deadline을 확인한다 (지났으면 TimeoutError).
+    개별 요청의 상한은 fn이 요청 timeout(_request_timeout)으로 건다.
+    """
+    started_at = time.monotonic()
+    attempt = 1
+
+    while True:
+        check_deadline(error_prefix, attempt, started_at)
+        try:
+            result = fn(attempt)
+        except Exception as e:
+            time.sleep(plan_retry(e, attempt, error_prefix, started_at, policy))
+            attempt += 1
+        else:
+            record_success(error_prefix, attempt, started_at)
+            return result
+
+async def aretry_llm_call(
+    fn: Callable[[int], Awaitable[T]],
+    error_prefix: str = "LLM 처리 실패",
+    policy: RetryPolicy = DEFAULT_RETRY_POLICY,
 ) -> T:
-    last_error: Exception | None = None
+    """
+    retry_llm_call의 비동기 버전 (대기 중 이벤트 루프를 막지 않음)
+    각 시도는 항목 deadline까지 남은 시간으로 asyncio.wait_for 한다.
+    """
+    started_at = time.monotonic()
+    attempt = 1
 
-    for attempt in range(1, max_retry + 1):
+    while True:
+        remaining = check_deadline(error_prefix, attempt, started_at)
         try:
-            return fn(attempt)
+            result = await asyncio.wait_for(fn(attempt), remaining)
         except Exception as e:
-            last_error = e
-            if attempt < max_retry:
-                print(f"⚠️ {error_prefix} (시도 {attempt}/{max_retry}) → 재시도")
-                time.sleep(sleep_sec)
-            else:
-                print(f"❌ {error_prefix} (최대 재시도 초과)")
-                raise RuntimeError(
-                    f"{error_prefix}: {e}"
-                ) from e
-
-    raise last_error
+            await asyncio.sleep(plan_retry(e, attempt, error_prefix, started_at, policy))
+            attempt += 1
+        else:
+            record_success(error_prefix, attempt, started_at)
+            return result
 
 def _build_context_text(context_blocks: list, with_similarity: bool = False) -> str:
     if not context_blocks:
@@ -68,130 +142,544 @@ def _parse_llm_json(
     raw_text: str,
     model_cls
 ):
-    cleaned = clean_json_string(raw_text)
-    parsed = json.loads(cleaned)
-    return model_cls.model_validate(parsed)
+    try:
+        cleaned = clean_json_string(raw_text)
+        parsed = json.loads(cleaned)
+        return model_cls.model_validate(parsed)
+    except (json.JSONDecodeError, ValidationError):
+        _count_parse_failure("text")
+        raise
 
 
-def _invoke_langchain(
-    prompt: PromptTemplate,
-    llm,
-    inputs: dict,
+def _parse_structured_json(
+    raw_text: str,
     model_cls
 ):
-    def _call(attempt: int):
-        final_inputs = dict(inputs)
-
-        if attempt >= 2:
-            final_inputs["task"] += (
-                "\n\n"
-                + STRICT_JSON_INSTRUCTION
-            )
-
-        response = (prompt | llm).invoke(final_inputs)
-        raw_text = response.content if hasattr(response, "content") else str(response)
-        return _parse_llm_json(raw_text, model_cls)
-
-    return retry_llm_call(
-        fn=_call,
-        max_retry=3,
-        sleep_sec=1.0,
-        error_prefix="LangChain LLM 처리 실패"
-    )
+    """
+    response_schema로 받은 JSON은 정규식 정제 없이 바로 검증한다.
+    """
+    try:
+        return model_cls.model_validate_json(raw_text)
+    except ValidationError:
+        _count_parse_failure("structured")
+        raise
 
 
-def _invoke_gemini(
-    prompt_text: str,
+def _with_strict_inputs(inputs: dict, attempt: int) -> dict:
+    final_inputs = dict(inputs)
+
+    if attempt >= 2:
+        final_inputs["task"] += (
+            "\n\n"
+            + STRICT_JSON_INSTRUCTION
+        )
+    return final_inputs
+
+
+def _with_strict_prompt(prompt_text: str, attempt: int) -> str:
+    if attempt >= 2:
+        return (
+            prompt_text
+            + "\n\n"
+            + STRICT_JSON_INSTRUCTION
+        )
+    return prompt_text
+
+
+def _response_text(response) -> str:
+    return response.content if hasattr(response, "content") else str(response)
+
+
+def _use_structured(structured: bool, use_google_search: bool) -> bool:
+    # Google Search tool과 response_schema는 함께 쓸 수 없음 → 텍스트 경로 유지
+    return structured and not use_google_search
+
+
+def _request_timeout() -> Optional[float]:
+    """
+    항목 deadline까지 남은 시간(초) → 개별 요청 timeout (deadline 없으면 None)
+    """
+    remaining = remaining_time()
+    return None if remaining is None else max(remaining, 0.001)
+
+
+def _gemini_config(
     model_cls,
-    file: Optional[Path] = None,
-    use_google_search: bool = False
+    use_google_search: bool = False,
+    cache_id: Optional[str] = None,
+    structured: bool = False,
+    timeout: Optional[float] = None,
+) -> Optional[GenerateContentConfig]:
+    kwargs = {}
+
+    if use_google_search:
+        kwargs["tools"] = [Tool(google_search=GoogleSearch())]
+    if cache_id:
+        kwargs["cached_content"] = cache_id
+    if _use_structured(structured, use_google_search):
+        kwargs["response_mime_type"] = "application/json"
+        kwargs["response_schema"] = model_cls
+    if timeout is not None:
+        kwargs["http_options"] = HttpOptions(timeout=max(1, int(timeout * 1000)))
+
+    return GenerateContentConfig(**kwargs) if kwargs else None
+
+
+def _parse_gemini_response(
+    response,
+    model_cls,
+    use_google_search: bool = False,
+    structured: bool = False,
 ):
-    def _call(attempt: int):
-        final_prompt = prompt_text
-
-        if attempt >= 2:
-            final_prompt = (
-                prompt_text
-                + "\n\n"
-                + STRICT_JSON_INSTRUCTION
-            )
-
-        contents = [final_prompt]
-        if file:
-            uploaded = GEMINI_CLIENT.files.upload(file=file)
-            contents = [uploaded, final_prompt]
-
-        config = None
-        if use_google_search:
-            config = GenerateContentConfig(
-                tools=[Tool(google_search=GoogleSearch())]
-            )
-
-        response = GEMINI_CLIENT.models.generate_content(
-            model="gemini-2.5-flash",
-            contents=contents,
-            config=config,
+    candidate, text = _gemini_candidate_text(response)
+
+    parsed = _parse_gemini_text(text, model_cls, use_google_search, structured)
+    return parsed, candidate.grounding_metadata if use_google_search else None
+
+
+def _gemini_candidate_text(response):
+    """
+    첫 후보와 본문 텍스트를 꺼낸다.
+    후보 / parts / 텍스트가 없으면(안전 차단, grounding만 온 응답 등) EmptyResponseError
+    """
+    candidates = response.candidates or []
+    candidate = candidates[0] if candidates else None
+    content = getattr(candidate, "content", None)
+    parts = getattr(content, "parts", None) or []
+    text = parts[0].text if parts else None
+
+    if text is None:
+        feedback = getattr(response, "prompt_feedback", None)
+        reason = (
+            getattr(candidate, "finish_reason", None)
+            if candidate is not None
+            else getattr(feedback, "block_reason", None)
         )
+        raise EmptyResponseError(f"empty response (finish_reason={reason})")
 
-        candidate = response.candidates[0]
-        text = candidate.content.parts[0].text
-        parsed = _parse_llm_json(text, model_cls)
+    return candidate, text
 
-        return parsed, candidate.grounding_metadata if use_google_search else None
 
-    return retry_llm_call(
-        fn=_call,
-        max_retry=3,
-        sleep_sec=1.5,
-        error_prefix="Gemini 처리 실패"
-    )
+def _parse_gemini_text(
+    text: str,
+    model_cls,
+    use_google_search: bool = False,
+    structured: bool = False,
+):
+    if _use_structured(structured, use_google_search):
+        return _parse_structured_json(text, model_cls)
+    return _parse_llm_json(text, model_cls)
 
-def _invoke_gemini_with_cache(
-    cache_id: str,
+
+# -----------------------------
+# Rate limit (모든 generate 호출은 RATE_LIMITER를 거침)
+# -----------------------------
+def _langchain_model(llm) -> str:
+    return str(getattr(llm, "model", "langchain")).removeprefix("models/")
+
+
+def _usage_tokens(response) -> Optional[int]:
+    usage = getattr(response, "usage_metadata", None)
+    if usage is None:
+        return None
+    if isinstance(usage, dict):
+        # LangChain AIMessage.usage_metadata
+        return usage.get("total_tokens")
+    return usage.total_token_count
+
+
+# -----------------------------
+# 응답 캐시 (LLM_RESPONSE_CACHE=1 일 때만)
+# -----------------------------
+def _response_cache_key(
+    model: str,
     prompt_text: str,
     model_cls,
-):
-    def _call(attempt: int):
-        final_prompt = prompt_text
-
-        if attempt >= 2:
-            final_prompt = (
-                prompt_text
-                + "\n\n"
-                + STRICT_JSON_INSTRUCTION
-            )
-
-        response = GEMINI_CLIENT.models.generate_content(
-            model="gemini-2.5-flash",
-            contents=final_prompt,
-            config=GenerateContentConfig(
-                cached_content=cache_id,
+    file: Optional[Path] = None,
+    cache_id: Optional[str] = None,
+    **options,
+) -> Optional[str]:
+    """
+    (model, 최종 프롬프트, 파일 해시, VF 캐시 내용, 스키마, 옵션) 해시.
+    cache_id의 내용을 알 수 없으면 None (캐시하지 않음).
+    """
+    if LLM_RESPONSE_CACHE is None:
+        return None
+
+    cache_content = None
+    if cache_id:
+        cache_content = vf_cache_content_key(cache_id)
+        if cache_content is None:
+            return None
+
+    return build_response_cache_key({
+        "model": model,
+        "prompt": prompt_text,
+        "file": file_content_hash(file) if file else None,
+        "cache": cache_content,
+        "schema": model_cls.model_json_schema(),
+        **options,
+    })
+
+
+def _load_cached_response(key: Optional[str], model_cls):
+    """
+    반환: (parsed, grounding) 또는 None
+    """
+    if key is None:
+        return None
+
+    payload = LLM_RESPONSE_CACHE.get(key)
+    if payload is None:
+        return None
+
+    try:
+        parsed = model_cls.model_validate(payload["parsed"])
+        grounding = (
+            GroundingMetadata.model_validate(payload["grounding"])
+            if payload.get("grounding")
+            else None
+        )
+    except ValidationError:
+        # 스키마가 바뀐 예전 응답 → 무시하고 새로 호출
+        return None
+
+    print("💾 LLM 응답 캐시 사용")
+    return parsed, grounding
+
+
+def _store_cached_response(key: Optional[str], label: str, parsed, grounding=None) -> None:
+    if key is None:
+        return
+
+    LLM_RESPONSE_CACHE.put(key, label, {
+        "parsed": parsed.model_dump(mode="json"),
+        "grounding": grounding.to_json_dict() if grounding else None,
+    })
+
+
+def _with_request_timeout(llm):
+    """
+    ChatGoogleGenerativeAI의 timeout(초)을 남은 항목 시간으로 제한한 사본
+    (timeout 필드가 없는 모델은 그대로 사용)
+    """
+    timeout = _request_timeout()
+    if timeout is None or "timeout" not in getattr(type(llm), "model_fields", {}):
+        return llm
+    if llm.timeout is not None:
+        timeout = min(timeout, llm.timeout)
+    return llm.model_copy(update={"timeout": timeout})
+
+
+def _structured_chain(prompt: PromptTemplate, llm, model_cls):
+    return prompt | llm.with_structured_output(model_cls, include_raw=True)
+
+
+def _parse_structured_output(output: dict, model_cls):
+    """
+    with_structured_output(include_raw=True) 결과 검증
+    """
+    if output.get("parsing_error") is not None or output.get("parsed") is None:
+        _count_parse_failure("structured")
+        raise ValueError(f"구조화 출력 파싱 실패: {output.get('parsing_error')}")
+
+    parsed = output["parsed"]
+    if isinstance(parsed, model_cls):
+        return parsed
+    return model_cls.model_validate(parsed)
+
+
+# -----------------------------
+# LLM 호출 명세 (동기 / 비동기 공용)
+# -----------------------------
+# 응답 캐시 키 · 시도별 요청 구성 · rate limit 정산 · 파싱 · 후처리는 명세 객체가 담당하고
+# 동기/비동기 차이는 실제 호출(run / arun)뿐이다.
+#   run / arun(attempt) → (parsed, grounding)
+#   post(parsed, grounding) → 호출자에게 돌려줄 값
+def _parsed_only(parsed, grounding):
+    return parsed
+
+
+class _LangChainCall:
+    label = "langchain"
+    error_prefix = "LangChain LLM 처리 실패"
+
+    def __init__(
+        self,
+        prompt: PromptTemplate,
+        llm,
+        inputs: dict,
+        model_cls,
+        structured: bool = LLM_STRUCTURED_OUTPUT,
+        post: Callable = _parsed_only,
+    ):
+        self.prompt = prompt
+        self.llm = llm
+        self.inputs = inputs
+        self.model_cls = model_cls
+        self.structured = structured
+        self.post = post
+        self.model = _langchain_model(llm)
+
+    def cache_key(self) -> Optional[str]:
+        return _response_cache_key(
+            self.model, self.prompt.format(**self.inputs), self.model_cls,
+            structured=self.structured,
+        )
+
+    def _request(self, attempt: int):
+        final_inputs = _with_strict_inputs(self.inputs, attempt)
+        estimated = estimate_tokens(self.prompt.format(**final_inputs))
+
+        llm = _with_request_timeout(self.llm)
+        if self.structured:
+            chain = _structured_chain(self.prompt, llm, self.model_cls)
+        else:
+            chain = self.prompt | llm
+        return chain, final_inputs, estimated
+
+    def _parse(self, output, estimated: int):
+        raw = output.get("raw") if self.structured else output
+        RATE_LIMITER.settle(self.model, estimated, _usage_tokens(raw), LANGCHAIN_RATE_SCOPE)
+
+        if self.structured:
+            return _parse_structured_output(output, self.model_cls), None
+        return _parse_llm_json(_response_text(output), self.model_cls), None
+
+    def run(self, attempt: int):
+        chain, final_inputs, estimated = self._request(attempt)
+        RATE_LIMITER.acquire(self.model, estimated, LANGCHAIN_RATE_SCOPE)
+        return self._parse(chain.invoke(final_inputs), estimated)
+
+    async def arun(self, attempt: int):
+        chain, final_inputs, estimated = self._request(attempt)
+        await RATE_LIMITER.aacquire(self.model, estimated, LANGCHAIN_RATE_SCOPE)
+        return self._parse(await chain.ainvoke(final_inputs), estimated)
+
+
+class _GeminiCall:
+    """
+    file: 첨부 파일 (동일 파일은 한 번만 업로드 → 재시도 / 항목 / fallback 레벨 간 재사용)
+    cache_id: VF 캐시 (캐시된 사업계획서도 입력 토큰으로 집계)
+    """
+
+    def __init__(
+        self,
+        prompt_text: str,
+        model_cls,
+        file: Optional[Path] = None,
+        use_google_search: bool = False,
+        cache_id: Optional[str] = None,
+        structured: bool = LLM_STRUCTURED_OUTPUT,
+        post: Callable = _parsed_only,
+    ):
+        self.prompt_text = prompt_text
+        self.model_cls = model_cls
+        self.file = file
+        self.use_google_search = use_google_search
+        self.cache_id = cache_id
+        self.structured = structured
+        self.post = post
+
+        self.label = "gemini_cache" if cache_id else "gemini"
+        self.error_prefix = "Gemini(Cache) 처리 실패" if cache_id else "Gemini 처리 실패"
+
+    def cache_key(self) -> Optional[str]:
+        options = {"structured": _use_structured(self.structured, self.use_google_search)}
+        if not self.cache_id:
+            options["google_search"] = self.use_google_search
+
+        return _response_cache_key(
+            GEMINI_MODEL, self.prompt_text, self.model_cls,
+            file=self.file, cache_id=self.cache_id, **options,
+        )
+
+    def request(self, attempt: int, uploaded=None) -> Tuple[dict, int]:
+        """
+        반환: (generate_content 인자, 예상 토큰 수)
+        """
+        final_prompt = _with_strict_prompt(self.prompt_text, attempt)
+        contents = [uploaded, final_prompt] if uploaded is not None else [final_prompt]
+
+        estimated = estimate_tokens(
+            final_prompt,
+            with_file=self.file is not None or self.cache_id is not None,
+        )
+        request = dict(
+            model=GEMINI_MODEL,
+            contents=contents,
+            config=_gemini_config(
+                self.model_cls,
+                use_google_search=self.use_google_search,
+                cache_id=self.cache_id,
+                structured=self.structured,
+                timeout=_request_timeout(),
             ),
         )
+        return request, estimated
+
+    def _parse(self, response, estimated: int):
+        RATE_LIMITER.settle(GEMINI_MODEL, estimated, _usage_tokens(response), GEMINI_RATE_SCOPE)
+        return _parse_gemini_response(
+            response, self.model_cls, self.use_google_search, self.structured
+        )
+
+    def run(self, attempt: int):
+        uploaded = get_or_upload_file(self.file) if self.file else None
+        request, estimated = self.request(attempt, uploaded)
+        RATE_LIMITER.acquire(GEMINI_MODEL, estimated, GEMINI_RATE_SCOPE)
+        return self._parse(GEMINI_CLIENT.models.generate_content(**request), estimated)
+
+    async def arun(self, attempt: int):
+        uploaded = await aget_or_upload_file(self.file) if self.file else None
+        request, estimated = self.request(attempt, uploaded)
+        await RATE_LIMITER.aacquire(GEMINI_MODEL, estimated, GEMINI_RATE_SCOPE)
+        return self._parse(await GEMINI_CLIENT.aio.models.generate_content(**request), estimated)
+
+
+def _invoke(call):
+    """
+    응답 캐시 → (없으면) 재시도 포함 호출 → 캐시 저장 → post 후처리
+    """
+    key = call.cache_key()
+    result = _load_cached_response(key, call.model_cls)
+    if result is None:
+        result = retry_llm_call(fn=call.run, error_prefix=call.error_prefix)
+        _store_cached_response(key, call.label, *result)
+    return call.post(*result)
+
+
+async def _ainvoke(call):
+    """
+    _invoke의 비동기 버전
+    """
+    key = call.cache_key()
+    result = _load_cached_response(key, call.model_cls)
+    if result is None:
+        result = await aretry_llm_call(fn=call.arun, error_prefix=call.error_prefix)
+        _store_cached_response(key, call.label, *result)
+    return call.post(*result)
+
+
+# =========================================================
+# 스트리밍 호출 (generate_content_stream + 점진 JSON 파서)
+# =========================================================
+# 완성된 최상위 필드부터 (field_name, value)로 yield 하고,
+# 마지막에 (STREAM_RESULT_KEY, call.post(parsed, grounding))을 yield 한다.
+# 점진 파서가 검증하지 못한 응답은 일반 호출과 같은 정제 경로로 최종 검증한다.
+# (필드 이벤트는 미리보기 - 최종 값은 항상 STREAM_RESULT_KEY 결과 기준)
+# 필드를 하나라도 내보낸 뒤 실패하면 재시도하지 않고 예외를 올린다.
+# (재시도 간격/횟수는 retry_llm_call과 같은 RetryPolicy를 따름)
+STREAM_RESULT_KEY = "__result__"
+STREAM_ERROR_PREFIX = "Gemini 스트리밍 처리 실패"
+
+
+def _stream_chunk(chunk, parser: IncrementalJsonObjectParser, grounding):
+    candidates = chunk.candidates or []
+    if candidates and candidates[0].grounding_metadata:
+        grounding = candidates[0].grounding_metadata
+
+    return parser.feed(chunk.text or ""), grounding
+
+
+def _stream_result(call: _GeminiCall, parser: IncrementalJsonObjectParser, grounding):
+    try:
+        parsed = parser.finalize()
+    except (json.JSONDecodeError, ValidationError):
+        # 점진 파서가 읽지 못한 응답 → 일반 호출과 같은 정제(clean_json_string) 후 전체 검증
+        parsed = _parse_gemini_text(
+            parser.text, call.model_cls, call.use_google_search, call.structured
+        )
+    return STREAM_RESULT_KEY, call.post(parsed, grounding if call.use_google_search else None)
 
-        candidate = response.candidates[0]
-        text = candidate.content.parts[0].text
-        return _parse_llm_json(text, model_cls)
 
-    return retry_llm_call(
-        fn=_call,
-        max_retry=3,
-        sleep_sec=1.5,
-        error_prefix="Gemini(Cache) 처리 실패"
+def _stream_failed(e: Exception, attempt: int, started_at: float, policy: RetryPolicy, emitted: bool) -> float:
+    if isinstance(e, (json.JSONDecodeError, ValidationError)):
+        _count_parse_failure("stream")
+    return plan_retry(
+        e, attempt, STREAM_ERROR_PREFIX, started_at, policy, allow_retry=not emitted
     )
 
 
+def _stream_gemini(
+    call: _GeminiCall,
+    policy: RetryPolicy = DEFAULT_RETRY_POLICY,
+) -> Iterator[Tuple[str, Any]]:
+    started_at = time.monotonic()
+    attempt = 1
+
+    while True:
+        emitted = False
+        check_deadline(STREAM_ERROR_PREFIX, attempt, started_at)
+        try:
+            uploaded = get_or_upload_file(call.file) if call.file else None
+            request, estimated = call.request(attempt, uploaded)
+            RATE_LIMITER.acquire(GEMINI_MODEL, estimated, GEMINI_RATE_SCOPE)
+
+            parser = IncrementalJsonObjectParser(call.model_cls)
+            grounding = None
+            usage = None
+
+            for chunk in GEMINI_CLIENT.models.generate_content_stream(**request):
+                events, grounding = _stream_chunk(chunk, parser, grounding)
+                usage = _usage_tokens(chunk) or usage
+                for event in events:
+                    emitted = True
+                    yield event
+
+            RATE_LIMITER.settle(GEMINI_MODEL, estimated, usage, GEMINI_RATE_SCOPE)
+            result = _stream_result(call, parser, grounding)
+            record_success(STREAM_ERROR_PREFIX, attempt, started_at)
+            yield result
+            return
+
+        except Exception as e:
+            time.sleep(_stream_failed(e, attempt, started_at, policy, emitted))
+            attempt += 1
+
+
+async def _astream_gemini(
+    call: _GeminiCall,
+    policy: RetryPolicy = DEFAULT_RETRY_POLICY,
+) -> AsyncIterator[Tuple[str, Any]]:
+    started_at = time.monotonic()
+    attempt = 1
+
+    while True:
+        emitted = False
+        check_deadline(STREAM_ERROR_PREFIX, attempt, started_at)
+        try:
+            uploaded = await aget_or_upload_file(call.file) if call.file else None
+            request, estimated = call.request(attempt, uploaded)
+            await RATE_LIMITER.aacquire(GEMINI_MODEL, estimated, GEMINI_RATE_SCOPE)
+
+            parser = IncrementalJsonObjectParser(call.model_cls)
+            grounding = None
+            usage = None
+
+            async for chunk in await GEMINI_CLIENT.aio.models.generate_content_stream(**request):
+                events, grounding = _stream_chunk(chunk, parser, grounding)
+                usage = _usage_tokens(chunk) or usage
+                for event in events:
+                    emitted = True
+                    yield event
+
+            RATE_LIMITER.settle(GEMINI_MODEL, estimated, usage, GEMINI_RATE_SCOPE)
+            result = _stream_result(call, parser, grounding)
+            record_success(STREAM_ERROR_PREFIX, attempt, started_at)
+            yield result
+            return
+
+        except Exception as e:
+            await asyncio.sleep(_stream_failed(e, attempt, started_at, policy, emitted))
+            attempt += 1
+
+
 # =========================================================
 # IPC (사업계획서 기반 IPC 분석)
 # =========================================================
 
-def generate_ipc_from_business_plan(
-    file_path: str,
-) -> IPCAnalysisResult:
-    """
-    사업계획서 파일을 기반으로 IPC를 생성한다.
-    """
-
+def _build_ipc_from_business_plan_prompt() -> str:
     parser = JsonOutputParser(pydantic_object=IPCAnalysisResult)
 
     prompt = PromptTemplate(
@@ -202,25 +690,42 @@ def generate_ipc_from_business_plan(
         },
     )
 
-    prompt_text = prompt.format()
+    return prompt.format()
 
-    parsed, _ = _invoke_gemini(
-        prompt_text=prompt_text,
+
+def _print_parsed(parsed, grounding):
+    print(parsed)
+    return parsed
+
+
+def _ipc_from_business_plan_call(file_path: str) -> _GeminiCall:
+    return _GeminiCall(
+        prompt_text=_build_ipc_from_business_plan_prompt(),
         model_cls=IPCAnalysisResult,
         file=Path(file_path),
+        post=_print_parsed,
     )
-    print(parsed)
 
-    return parsed
+
+def generate_ipc_from_business_plan(
+    file_path: str,
+) -> IPCAnalysisResult:
+    """
+    사업계획서 파일을 기반으로 IPC를 생성한다.
+    """
+    return _invoke(_ipc_from_business_plan_call(file_path))
+
+
+async def agenerate_ipc_from_business_plan(
+    file_path: str,
+) -> IPCAnalysisResult:
+    return await _ainvoke(_ipc_from_business_plan_call(file_path))
 
 
 # =========================================================
 # IPC (벡터 디비 + 사업계획서 기반 IPC 분석)
 # =========================================================
-def generate_ipc_from_file_and_vectordb(
-    file_path: str,
-    context_blocks: list,
-) -> IPCAnalysisResult:
+def _build_ipc_from_file_and_vectordb_prompt(context_blocks: list) -> str:
     parser = JsonOutputParser(pydantic_object=IPCAnalysisResult)
 
     context_text = _build_context_text(context_blocks, with_similarity=True)
@@ -231,25 +736,40 @@ def generate_ipc_from_file_and_vectordb(
         partial_variables={"format_instructions": parser.get_format_instructions()},
     )
 
-    prompt_text = prompt.format(context=context_text)
+    return prompt.format(context=context_text)
 
-    parsed, _ = _invoke_gemini(
-        prompt_text=prompt_text,
+
+def _ipc_from_file_and_vectordb_call(file_path: str, context_blocks: list) -> _GeminiCall:
+    return _GeminiCall(
+        prompt_text=_build_ipc_from_file_and_vectordb_prompt(context_blocks),
         model_cls=IPCAnalysisResult,
         file=Path(file_path),   # 보조 확인용
     )
-    return parsed
+
+
+def generate_ipc_from_file_and_vectordb(
+    file_path: str,
+    context_blocks: list,
+) -> IPCAnalysisResult:
+    return _invoke(_ipc_from_file_and_vectordb_call(file_path, context_blocks))
+
+
+async def agenerate_ipc_from_file_and_vectordb(
+    file_path: str,
+    context_blocks: list,
+) -> IPCAnalysisResult:
+    return await _ainvoke(_ipc_from_file_and_vectordb_call(file_path, context_blocks))
 
 # =========================================================
 # Vector DB
 # =========================================================
 
-def generate_report_item_from_vectordb(
+def _build_vectordb_prompt(
     company: str,
     title: str,
     task: str,
     context_blocks: list
-) -> ReportItemResult:
+) -> tuple[PromptTemplate, dict]:
 
     context_text = _build_context_text(context_blocks, with_similarity=True)
 
@@ -260,30 +780,49 @@ def generate_report_item_from_vectordb(
         partial_variables={"format_instructions": parser.get_format_instructions()},
     )
 
-    return _invoke_langchain(
+    inputs = {
+        "company": company,
+        "title": title,
+        "task": task,
+        "context": context_text,
+    }
+    return prompt, inputs
+
+
+def _vectordb_call(company: str, title: str, task: str, context_blocks: list) -> _LangChainCall:
+    prompt, inputs = _build_vectordb_prompt(company, title, task, context_blocks)
+
+    return _LangChainCall(
         prompt=prompt,
         llm=LLM_A,
-        inputs={
-            "company": company,
-            "title": title,
-            "task": task,
-            "context": context_text,
-        },
+        inputs=inputs,
         model_cls=ReportItemResult,
     )
 
 
-# =========================================================
-# File
-# =========================================================
+def generate_report_item_from_vectordb(
+    company: str,
+    title: str,
+    task: str,
+    context_blocks: list
+) -> ReportItemResult:
+    return _invoke(_vectordb_call(company, title, task, context_blocks))
 
-def generate_report_item_from_file(
+
+async def agenerate_report_item_from_vectordb(
     company: str,
     title: str,
     task: str,
-    file_path: str
+    context_blocks: list
 ) -> ReportItemResult:
+    return await _ainvoke(_vectordb_call(company, title, task, context_blocks))
+
 
+# =========================================================
+# File
+# =========================================================
+
+def _build_file_prompt(company: str, title: str, task: str) -> str:
     parser = JsonOutputParser(pydantic_object=ReportItemResult)
     prompt = PromptTemplate(
         template=FILE_BASE_PROMPT,
@@ -291,28 +830,45 @@ def generate_report_item_from_file(
         partial_variables={"format_instructions": parser.get_format_instructions()},
     )
 
-    prompt_text = prompt.format(company=company, title=title, task=task)
+    return prompt.format(company=company, title=title, task=task)
 
-    parsed, _ = _invoke_gemini(
-        prompt_text=prompt_text,
+
+def _file_call(company: str, title: str, task: str, file_path: str) -> _GeminiCall:
+    return _GeminiCall(
+        prompt_text=_build_file_prompt(company, title, task),
         model_cls=ReportItemResult,
         file=Path(file_path),
     )
-    return parsed
+
+
+def generate_report_item_from_file(
+    company: str,
+    title: str,
+    task: str,
+    file_path: str
+) -> ReportItemResult:
+    return _invoke(_file_call(company, title, task, file_path))
+
+
+async def agenerate_report_item_from_file(
+    company: str,
+    title: str,
+    task: str,
+    file_path: str
+) -> ReportItemResult:
+    return await _ainvoke(_file_call(company, title, task, file_path))
 
 
 # =========================================================
 # File + Vector DB
 # =========================================================
 
-def generate_report_item_from_file_and_vectordb(
+def _build_file_and_vectordb_prompt(
     company: str,
     title: str,
     task: str,
     context_blocks: list,
-    file_path: str
-) -> ReportItemResult:
-
+) -> str:
     context_text = _build_context_text(context_blocks, with_similarity=True)
 
     parser = JsonOutputParser(pydantic_object=ReportItemResult)
@@ -322,32 +878,58 @@ def generate_report_item_from_file_and_vectordb(
         partial_variables={"format_instructions": parser.get_format_instructions()},
     )
 
-    prompt_text = prompt.format(
+    return prompt.format(
         company=company,
         title=title,
         task=task,
         context=context_text,
     )
 
-    parsed, _ = _invoke_gemini(
-        prompt_text=prompt_text,
+
+def _file_and_vectordb_call(
+    company: str,
+    title: str,
+    task: str,
+    context_blocks: list,
+    file_path: str,
+) -> _GeminiCall:
+    return _GeminiCall(
+        prompt_text=_build_file_and_vectordb_prompt(company, title, task, context_blocks),
         model_cls=ReportItemResult,
         file=Path(file_path),
     )
-    return parsed
+
+
+def generate_report_item_from_file_and_vectordb(
+    company: str,
+    title: str,
+    task: str,
+    context_blocks: list,
+    file_path: str
+) -> ReportItemResult:
+    return _invoke(_file_and_vectordb_call(company, title, task, context_blocks, file_path))
+
+
+async def agenerate_report_item_from_file_and_vectordb(
+    company: str,
+    title: str,
+    task: str,
+    context_blocks: list,
+    file_path: str
+) -> ReportItemResult:
+    return await _ainvoke(_file_and_vectordb_call(company, title, task, context_blocks, file_path))
 
 
 # =========================================================
 # Google Search (Market 전용 - 시장 규모 및 경쟁사 분석)
 # =========================================================
 
-def generate_report_item_from_googlesearch(
+def _build_googlesearch_prompt(
     company: str,
     title: str,
     task: str,
     context_blocks: list,
-    file_path: str | None = None,
-):
+) -> str:
     context_text = _build_context_text(context_blocks)
 
     parser = JsonOutputParser(pydantic_object=MarketForecastAndCompetitors)
@@ -361,83 +943,290 @@ def generate_report_item_from_googlesearch(
         partial_variables={"format_instructions": parser.get_format_instructions()},
     )
 
-    prompt_text = prompt.format(
+    return prompt.format(
         company=company,
         title=title,
         task=task,
         context=context_text,
     )
 
+
+def _market_result(parsed, grounding) -> dict:
+    return {
+        "parsed": parsed,
+        "grounding": grounding.to_json_dict() if grounding else None,
+    }
+
+
+def _googlesearch_call(
+    company: str,
+    title: str,
+    task: str,
+    context_blocks: list,
+    file_path: str | None = None,
+) -> _GeminiCall:
+    prompt_text = _build_googlesearch_prompt(company, title, task, context_blocks)
+
     if title == "비즈니스 모델 역량진단":
-        parsed, _ = _invoke_gemini(
+        return _GeminiCall(
             prompt_text=prompt_text,
             model_cls=ReportItemResult,
             use_google_search=True,
             file=Path(file_path),
         )
-        return parsed
 
-    parsed, grounding = _invoke_gemini(
+    return _GeminiCall(
         prompt_text=prompt_text,
         model_cls=MarketForecastAndCompetitors,
         use_google_search=True,
         file=Path(file_path) if file_path else None,
+        post=_market_result,
     )
 
-    return {
-        "parsed": parsed,
-        "grounding": grounding.to_json_dict() if grounding else None,
-    }
 
-def generate_market_with_fallback(
+def generate_report_item_from_googlesearch(
+    company: str,
+    title: str,
+    task: str,
+    context_blocks: list,
+    file_path: str | None = None,
+):
+    return _invoke(_googlesearch_call(company, title, task, context_blocks, file_path))
+
+
+async def agenerate_report_item_from_googlesearch(
     company: str,
     title: str,
     task: str,
     context_blocks: list,
     file_path: str | None = None,
-    max_level: int = 3,
 ):
+    return await _ainvoke(_googlesearch_call(company, title, task, context_blocks, file_path))
+
+
+def stream_report_item_from_googlesearch(
+    company: str,
+    title: str,
+    task: str,
+    context_blocks: list,
+    file_path: str | None = None,
+) -> Iterator[Tuple[str, Any]]:
+    """
+    generate_report_item_from_googlesearch의 스트리밍 버전.
+
+    overseas_market → korea_market → competitors 순으로 완성되는 즉시
+    (field_name, value)를 yield 하고, 마지막에
+    (STREAM_RESULT_KEY, generate_report_item_from_googlesearch와 동일한 결과)를 yield 한다.
+    """
+    yield from _stream_gemini(_googlesearch_call(company, title, task, context_blocks, file_path))
+
+
+async def astream_report_item_from_googlesearch(
+    company: str,
+    title: str,
+    task: str,
+    context_blocks: list,
+    file_path: str | None = None,
+) -> AsyncIterator[Tuple[str, Any]]:
+    async for event in _astream_gemini(_googlesearch_call(company, title, task, context_blocks, file_path)):
+        yield event
+
+
+def _guess_and_log_base_market(context_blocks: list) -> str:
     base_market = guess_base_market(context_blocks)  # 또는 context에서 추출한 시장명
     print("-" * 15)
     print("Base market : ", base_market)
     print("-" * 15)
+    return base_market
+
+
+def _expand_market_task(task: str, base_market: str, level: int) -> str:
+    return (
+        task
+        + f"\n\n[시장 범위]\n{expand_market_keywords(base_market, level)}"
+    )
+
+
+def _accept_market_level(result: dict, level: int) -> bool:
+    """
+    시장 규모가 유효하면 method에 적용 레벨을 기록하고 True를 반환한다.
+    """
+    parsed = result["parsed"]
+
+    if not (
+        has_valid_market_size(parsed.overseas_market)
+        or has_valid_market_size(parsed.korea_market)
+    ):
+        return False
+
+    if parsed.overseas_market:
+        parsed.overseas_market.method = (
+            parsed.overseas_market.method
+            + f" (상위 시장 레벨 {level} 적용)"
+            if parsed.overseas_market.method
+            else None
+        )
+    return True
+
+
+def _speculative_window(level: int, max_level: int, parallelism: int) -> range:
+    # 아직 판정되지 않은 가장 낮은 레벨부터 parallelism개
+    return range(level, min(level + parallelism, max_level + 1))
+
+
+def _log_cancelled_levels(levels: list[int], discarded: list[int] = ()) -> None:
+    if levels:
+        print(f"🛑 시장 레벨 {levels} 호출 취소")
+    if discarded:
+        # 이미 실행 중인 동기 호출은 멈출 수 없음 → 끝까지 과금되고 결과만 버려짐
+        print(f"⚠️ 시장 레벨 {list(discarded)} 이미 실행 중 → 결과 폐기 (호출 비용 발생)")
+
+
+def generate_market_with_fallback(
+    company: str,
+    title: str,
+    task: str,
+    context_blocks: list,
+    file_path: str | None = None,
+    max_level: int = 3,
+    parallelism: int = MARKET_FALLBACK_PARALLELISM,
+):
+    """
+    시장 범위를 레벨 0 → max_level 로 넓혀가며 유효한 시장 규모를 찾는다.
+
+    parallelism > 1 이면 판정 전인 하위 레벨 parallelism개를 미리 동시에 호출하고
+    (낮은 레벨이 실패할 때마다 다음 레벨을 추가 투입),
+    유효한 가장 낮은 레벨이 나오면 나머지 호출은 취소한다.
+    - 1: 순차 호출 (최소 비용)
+    - max_level + 1: 전 레벨 동시 호출 (최소 지연)
 
+    ※ 동기 버전에서 이미 시작된 HTTP 호출은 중단할 수 없어 결과만 버린다.
+      (최악의 경우 채택 레벨 외에 parallelism - 1 건의 호출 비용이 추가로 발생)
+    """
+    base_market = _guess_and_log_base_market(context_blocks)
 
-    for level in range(max_level + 1):
-        expanded_task = (
-            task
-            + f"\n\n[시장 범위]\n{expand_market_keywords(base_market, level)}"
+    def _call(level: int) -> dict:
+        return generate_report_item_from_googlesearch(
+            company=company,
+            title=title,
+            task=_expand_market_task(task, base_market, level),
+            context_blocks=context_blocks,
+            file_path=file_path,
         )
 
-        result = generate_report_item_from_googlesearch(
+    if parallelism <= 1:
+        for level in range(max_level + 1):
+            result = _call(level)
+
+            if _accept_market_level(result, level):
+                return result
+
+        # 전부 실패 시 → null 유지 (프롬프트 규칙 준수)
+        return result
+
+    executor = ThreadPoolExecutor(
+        max_workers=parallelism,
+        thread_name_prefix="market-level",
+    )
+    futures = {}
+    try:
+        for level in range(max_level + 1):
+            for pending in _speculative_window(level, max_level, parallelism):
+                if pending not in futures:
+                    # 항목 deadline 등 contextvars를 작업 스레드로 전달
+                    ctx = contextvars.copy_context()
+                    futures[pending] = executor.submit(ctx.run, _call, pending)
+
+            result = futures[level].result()
+
+            if _accept_market_level(result, level):
+                return result
+
+        return result
+
+    finally:
+        # cancel()은 아직 시작 전인 future만 성공 → 실제로 취소된 레벨만 취소로 기록
+        pending = [lv for lv, f in futures.items() if not f.done()]
+        cancelled = [lv for lv in pending if futures[lv].cancel()]
+        _log_cancelled_levels(
+            cancelled,
+            discarded=[lv for lv in pending if lv not in cancelled],
+        )
+        executor.shutdown(wait=False, cancel_futures=True)
+
+
+async def agenerate_market_with_fallback(
+    company: str,
+    title: str,
+    task: str,
+    context_blocks: list,
+    file_path: str | None = None,
+    max_level: int = 3,
+    parallelism: int = MARKET_FALLBACK_PARALLELISM,
+):
+    """
+    generate_market_with_fallback의 비동기 버전 (취소 시 진행 중인 호출도 중단됨)
+    """
+    base_market = _guess_and_log_base_market(context_blocks)
+
+    async def _call(level: int) -> dict:
+        return await agenerate_report_item_from_googlesearch(
             company=company,
             title=title,
-            task=expanded_task,
+            task=_expand_market_task(task, base_market, level),
             context_blocks=context_blocks,
             file_path=file_path,
         )
 
-        parsed = result["parsed"]
-
-        if (
-            has_valid_market_size(parsed.overseas_market)
-            or has_valid_market_size(parsed.korea_market)
-        ):
-            parsed.overseas_market.method = (
-                parsed.overseas_market.method
-                + f" (상위 시장 레벨 {level} 적용)"
-                if parsed.overseas_market and parsed.overseas_market.method
-                else None
-            )
-            return result
+    if parallelism <= 1:
+        for level in range(max_level + 1):
+            result = await _call(level)
+
+            if _accept_market_level(result, level):
+                return result
+
+        # 전부 실패 시 → null 유지 (프롬프트 규칙 준수)
+        return result
+
+    tasks: dict[int, asyncio.Task] = {}
+    try:
+        for level in range(max_level + 1):
+            for pending in _speculative_window(level, max_level, parallelism):
+                if pending not in tasks:
+                    tasks[pending] = asyncio.create_task(_call(pending))
 
-    # 전부 실패 시 → null 유지 (프롬프트 규칙 준수)
-    return result
+            result = await tasks[level]
+
+            if _accept_market_level(result, level):
+                return result
+
+        return result
+
+    finally:
+        running = [lv for lv, t in tasks.items() if not t.done()]
+        for lv in running:
+            tasks[lv].cancel()
+        _log_cancelled_levels(running)
+        await asyncio.gather(*tasks.values(), return_exceptions=True)
 
 
 # =========================================================
 # Cache + File + Vector DB
 # =========================================================
+def _vf_cache_call(
+        company: str,
+        title: str,
+        task: str,
+        context_blocks: list,
+        cache_vf_id: str,
+) -> _GeminiCall:
+    return _GeminiCall(
+        cache_id=cache_vf_id,
+        prompt_text=_build_file_and_vectordb_prompt(company, title, task, context_blocks),
+        model_cls=ReportItemResult,
+    )
+
+
 def generate_report_item_from_vf_cache(
         company: str,
         title: str,
@@ -445,26 +1234,93 @@ def generate_report_item_from_vf_cache(
         context_blocks: list,
         cache_vf_id: str,
 ) -> ReportItemResult:
+    return _invoke(_vf_cache_call(company, title, task, context_blocks, cache_vf_id))
 
-    context_text = _build_context_text(context_blocks, with_similarity=True)
 
-    parser = JsonOutputParser(pydantic_object=ReportItemResult)
+async def agenerate_report_item_from_vf_cache(
+        company: str,
+        title: str,
+        task: str,
+        context_blocks: list,
+        cache_vf_id: str,
+) -> ReportItemResult:
+    return await _ainvoke(_vf_cache_call(company, title, task, context_blocks, cache_vf_id))
+
+
+# =========================================================
+# Cache + File + Vector DB (다중 항목 1회 호출)
+# =========================================================
+def _build_multi_item_prompt(company: str, items: list[dict]) -> str:
+    """
+    items: [{"item_id", "title", "task", "context_blocks"}, ...]
+    """
+    item_texts = []
+    for item in items:
+        context_text = _build_context_text(item["context_blocks"], with_similarity=True)
+        item_texts.append(
+            f"### item_id: {item['item_id']}\n"
+            f"보고서 항목 : {item['title']}\n\n"
+            f"TASK:\n{item['task']}\n\n"
+            f"CONTEXT:\n{context_text}"
+        )
+
+    parser = JsonOutputParser(pydantic_object=MultiReportItemResult)
 
     prompt = PromptTemplate(
-        template=VECTORDB_AND_FILE_BASE_PROMPT,
-        input_variables=["company", "title", "task", "context"],
+        template=VECTORDB_AND_FILE_MULTI_ITEM_PROMPT,
+        input_variables=["company", "items"],
         partial_variables={"format_instructions": parser.get_format_instructions()},
     )
 
-    prompt_text = prompt.format(
+    return prompt.format(
         company=company,
-        title=title,
-        task=task,
-        context=context_text,
+        items="\n\n────────────────────────\n\n".join(item_texts),
     )
 
-    return _invoke_gemini_with_cache(
+
+def _split_multi_item_result(
+    result: MultiReportItemResult,
+    items: list[dict],
+) -> dict[int, ReportItemResult]:
+    """
+    요청한 item_id만 남긴다. 누락된 항목은 호출자가 개별 생성으로 보완한다.
+    """
+    requested = {item["item_id"] for item in items}
+    return {
+        item_id: r
+        for item_id, r in result.to_item_results().items()
+        if item_id in requested
+    }
+
+
+def _vf_cache_multi_call(
+        company: str,
+        items: list[dict],
+        cache_vf_id: str,
+) -> _GeminiCall:
+    return _GeminiCall(
         cache_id=cache_vf_id,
-        prompt_text=prompt_text,
-        model_cls=ReportItemResult,
-    )
\ No newline at end of file
+        prompt_text=_build_multi_item_prompt(company, items),
+        model_cls=MultiReportItemResult,
+        post=lambda parsed, _: _split_multi_item_result(parsed, items),
+    )
+
+
+def generate_report_items_from_vf_cache(
+        company: str,
+        items: list[dict],
+        cache_vf_id: str,
+) -> dict[int, ReportItemResult]:
+    """
+    같은 VF 캐시를 쓰는 여러 항목을 한 번의 호출로 생성한다.
+    반환: item_id → ReportItemResult
+    """
+    return _invoke(_vf_cache_multi_call(company, items, cache_vf_id))
+
+
+async def agenerate_report_items_from_vf_cache(
+        company: str,
+        items: list[dict],
+        cache_vf_id: str,
+) -> dict[int, ReportItemResult]:
+    return await _ainvoke(_vf_cache_multi_call(company, items, cache_vf_id))
@@ -0,0 +1,307 @@
+"""
+business_plan_embeddings 인덱스 점검 / 권장 인덱스 생성 / EXPLAIN 리포트
+
+실행:
+    python -m rag.final.index_advisor                       # 점검 + 권장 DDL 출력
+    python -m rag.final.index_advisor --biz-no 1234567890   # 해당 회사 기준 EXPLAIN
+    python -m rag.final.index_advisor --apply               # 권장 인덱스 생성 후 재점검
+"""
+import argparse
+import math
+from typing import List, Dict, Optional
+
+import psycopg
+from pgvector.psycopg import register_vector
+
+from rag.config import POSTGRES_CONN
+from rag.final.retriever import (
+    SQL_TEMPLATE,
+    SQL_TEMPLATE_MANY,
+    _build_many_params,
+    build_search_settings,
+)
+
+TABLE_NAME = "business_plan_embeddings"
+
+# =========================================================
+# 권장 인덱스 정의
+# =========================================================
+# 1) JSONB 필터 (doc_type 부분 인덱스 + biz_no/section 표현식 인덱스)
+FILTER_INDEX_NAME = "idx_bpe_bp_biz_no_section"
+FILTER_INDEX_DDL = f"""
+CREATE INDEX CONCURRENTLY IF NOT EXISTS {FILTER_INDEX_NAME}
+ON {TABLE_NAME} ((metadata->>'biz_no'), section)
+WHERE (metadata->>'doc_type') = 'business_plan';
+"""
+
+# 2) 벡터 인덱스 (cosine, SQL_TEMPLATE의 <=> 와 일치)
+HNSW_INDEX_NAME = "idx_bpe_embedding_hnsw"
+HNSW_INDEX_DDL = f"""
+CREATE INDEX CONCURRENTLY IF NOT EXISTS {HNSW_INDEX_NAME}
+ON {TABLE_NAME} USING hnsw (embedding vector_cosine_ops)
+WITH (m = 16, ef_construction = 64);
+"""
+
+IVFFLAT_INDEX_NAME = "idx_bpe_embedding_ivfflat"
+IVFFLAT_INDEX_DDL = """
+CREATE INDEX CONCURRENTLY IF NOT EXISTS {name}
+ON {table} USING ivfflat (embedding vector_cosine_ops)
+WITH (lists = {lists});
+"""
+
+
+# =========================================================
+# 점검
+# =========================================================
+def fetch_table_info(conn) -> Dict:
+    with conn.cursor() as cur:
+        cur.execute(
+            "SELECT extversion FROM pg_extension WHERE extname = 'vector'"
+        )
+        row = cur.fetchone()
+        pgvector_version = row[0] if row else None
+
+        cur.execute(
+            """
+            SELECT format_type(a.atttypid, a.atttypmod)
+            FROM pg_attribute a
+            WHERE a.attrelid = %s::regclass
+              AND a.attname = 'embedding'
+            """,
+            (TABLE_NAME,),
+        )
+        row = cur.fetchone()
+        embedding_type = row[0] if row else None
+
+        cur.execute(
+            "SELECT reltuples::bigint FROM pg_class WHERE oid = %s::regclass",
+            (TABLE_NAME,),
+        )
+        estimated_rows = max(cur.fetchone()[0], 0)
+
+        cur.execute(
+            "SELECT indexname, indexdef FROM pg_indexes WHERE tablename = %s",
+            (TABLE_NAME,),
+        )
+        indexes = [{"name": r[0], "definition": r[1]} for r in cur.fetchall()]
+
+    return {
+        "pgvector_version": pgvector_version,
+        "embedding_type": embedding_type,
+        "estimated_rows": estimated_rows,
+        "indexes": indexes,
+    }
+
+
+def _has_index(indexes: List[Dict], *keywords: str) -> bool:
+    for idx in indexes:
+        definition = idx["definition"].lower()
+        if all(k.lower() in definition for k in keywords):
+            return True
+    return False
+
+
+def _is_untyped_vector(info: Dict) -> bool:
+    # 차원 없는 vector 컬럼에는 hnsw / ivfflat 인덱스를 만들 수 없음
+    return info["embedding_type"] == "vector"
+
+
+def recommend_indexes(info: Dict, vector_index: str = "hnsw") -> List[Dict]:
+    """
+    현재 인덱스 상태를 기준으로 필요한 DDL 목록을 반환한다.
+    embedding 컬럼에 차원이 없으면 벡터 인덱스는 권장하지 않는다. (--apply 실패 방지)
+    """
+    indexes = info["indexes"]
+    recommendations = []
+
+    if not _has_index(indexes, "metadata ->> 'biz_no'"):
+        recommendations.append({
+            "name": FILTER_INDEX_NAME,
+            "reason": "doc_type/biz_no/section 필터용 부분 표현식 인덱스 없음",
+            "ddl": FILTER_INDEX_DDL.strip(),
+        })
+
+    has_vector_index = (
+        _has_index(indexes, "using hnsw", "embedding")
+        or _has_index(indexes, "using ivfflat", "embedding")
+    )
+    if not has_vector_index and not _is_untyped_vector(info):
+        if vector_index == "ivfflat":
+            rows = info["estimated_rows"]
+            lists = max(1, rows // 1000) if rows <= 1_000_000 else int(math.sqrt(rows))
+            recommendations.append({
+                "name": IVFFLAT_INDEX_NAME,
+                "reason": f"벡터 인덱스 없음 (ivfflat, lists={lists})",
+                "ddl": IVFFLAT_INDEX_DDL.format(
+                    name=IVFFLAT_INDEX_NAME, table=TABLE_NAME, lists=lists
+                ).strip(),
+            })
+        else:
+            recommendations.append({
+                "name": HNSW_INDEX_NAME,
+                "reason": "벡터 인덱스 없음 (hnsw, cosine)",
+                "ddl": HNSW_INDEX_DDL.strip(),
+            })
+
+    return recommendations
+
+
+def apply_indexes(conn, recommendations: List[Dict]) -> None:
+    with conn.cursor() as cur:
+        for rec in recommendations:
+            print(f"▶ 생성 중: {rec['name']}")
+            cur.execute(rec["ddl"])
+        cur.execute(f"ANALYZE {TABLE_NAME}")
+
+
+# =========================================================
+# EXPLAIN
+# =========================================================
+def _pick_sample(conn, biz_no: Optional[str]):
+    with conn.cursor() as cur:
+        if biz_no:
+            cur.execute(
+                f"""
+                SELECT metadata->>'biz_no', embedding
+                FROM {TABLE_NAME}
+                WHERE (metadata->>'doc_type') = 'business_plan'
+                  AND (metadata->>'biz_no') = %s
+                LIMIT 1
+                """,
+                (biz_no,),
+            )
+        else:
+            cur.execute(
+                f"""
+                SELECT metadata->>'biz_no', embedding
+                FROM {TABLE_NAME}
+                WHERE (metadata->>'doc_type') = 'business_plan'
+                LIMIT 1
+                """
+            )
+        return cur.fetchone()
+
+
+def explain_retrieval(
+    conn,
+    biz_no: Optional[str] = None,
+    sections: Optional[List[str]] = None,
+    k: int = 10,
+    ef_search: Optional[int] = None,
+    iterative_scan: Optional[str] = None,
+) -> str:
+    """
+    SQL_TEMPLATE / SQL_TEMPLATE_MANY 실행 계획 (EXPLAIN ANALYZE, BUFFERS)을 반환한다.
+    쿼리 벡터는 해당 회사의 저장된 chunk 임베딩을 사용한다.
+    """
+    sample = _pick_sample(conn, biz_no)
+    if sample is None:
+        return "(EXPLAIN 대상 데이터 없음)"
+
+    sample_biz_no, query_vec = sample
+
+    if sections is None:
+        with conn.cursor() as cur:
+            cur.execute(
+                f"""
+                SELECT DISTINCT section FROM {TABLE_NAME}
+                WHERE (metadata->>'biz_no') = %s
+                """,
+                (sample_biz_no,),
+            )
+            sections = [r[0] for r in cur.fetchall()]
+
+    settings = build_search_settings(ef_search, iterative_scan)
+
+    single_plan = _explain(
+        conn, SQL_TEMPLATE, (query_vec, sample_biz_no, sections, k), settings,
+    )
+    # 파이프라인 경로(retrieve_context_many)와 같은 형태: 항목 1개 = 전체 section
+    many_plan = _explain(
+        conn, SQL_TEMPLATE_MANY,
+        _build_many_params({0: query_vec}, sample_biz_no, {0: sections}, k),
+        settings,
+    )
+
+    return (
+        f"biz_no={sample_biz_no}\n"
+        f"-- SQL_TEMPLATE (retrieve_context)\n{single_plan}\n\n"
+        f"-- SQL_TEMPLATE_MANY (retrieve_context_many)\n{many_plan}"
+    )
+
+
+def _explain(conn, sql: str, params: tuple, settings: List[tuple]) -> str:
+    with conn.transaction():
+        with conn.cursor() as cur:
+            for setting_sql, setting_params in settings:
+                cur.execute(setting_sql, setting_params)
+            cur.execute("EXPLAIN (ANALYZE, BUFFERS) " + sql, params)
+            return "\n".join(r[0] for r in cur.fetchall())
+
+
+# =========================================================
+# 엔트리포인트
+# =========================================================
+def main(argv: Optional[List[str]] = None) -> None:
+    parser = argparse.ArgumentParser(
+        description=f"{TABLE_NAME} 인덱스 점검 및 권장 인덱스 생성"
+    )
+    parser.add_argument("--biz-no", help="EXPLAIN 기준 사업자번호 (미지정 시 임의 1건)")
+    parser.add_argument("--apply", action="store_true", help="권장 인덱스를 실제로 생성")
+    parser.add_argument(
+        "--vector-index", choices=["hnsw", "ivfflat"], default="hnsw",
+        help="벡터 인덱스가 없을 때 권장할 인덱스 종류",
+    )
+    parser.add_argument("--ef-search", type=int, help="EXPLAIN 시 hnsw.ef_search")
+    parser.add_argument(
+        "--iterative-scan", choices=["off", "strict_order", "relaxed_order"],
+        help="EXPLAIN 시 hnsw.iterative_scan",
+    )
+    args = parser.parse_args(argv)
+
+    # CREATE INDEX CONCURRENTLY는 트랜잭션 밖에서 실행해야 함
+    with psycopg.connect(POSTGRES_CONN, autocommit=True) as conn:
+        register_vector(conn)
+
+        info = fetch_table_info(conn)
+        print("=" * 60)
+        print(f"pgvector      : {info['pgvector_version']}")
+        print(f"embedding 타입: {info['embedding_type']}")
+        print(f"추정 row 수   : {info['estimated_rows']:,}")
+        print("기존 인덱스   :")
+        for idx in info["indexes"]:
+            print(f"  - {idx['name']}: {idx['definition']}")
+
+        if _is_untyped_vector(info):
+            print("⚠️ embedding 컬럼에 차원이 지정되지 않아 벡터 인덱스를 만들 수 없습니다. (권장 목록에서 제외)")
+            print(f"   예: ALTER TABLE {TABLE_NAME} ALTER COLUMN embedding TYPE vector(1024);")
+
+        recommendations = recommend_indexes(info, args.vector_index)
+
+        print("=" * 60)
+        if not recommendations:
+            print("✅ 권장 인덱스가 모두 존재합니다.")
+        for rec in recommendations:
+            print(f"-- {rec['reason']}")
+            print(rec["ddl"])
+            print()
+
+        print("=" * 60)
+        print("[EXPLAIN - 현재]")
+        print(explain_retrieval(
+            conn, args.biz_no,
+            ef_search=args.ef_search, iterative_scan=args.iterative_scan,
+        ))
+
+        if args.apply and recommendations:
+            apply_indexes(conn, recommendations)
+            print("=" * 60)
+            print("[EXPLAIN - 인덱스 적용 후]")
+            print(explain_retrieval(
+                conn, args.biz_no,
+                ef_search=args.ef_search, iterative_scan=args.iterative_scan,
+            ))
+
+
+if __name__ == "__main__":
+    main()
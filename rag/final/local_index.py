@@ -0,0 +1,153 @@
+from typing import List, Dict, Optional
+
+import numpy as np
+
+from rag.final.db_pool import get_pool
+
+SQL_LOAD_CHUNKS = """
+SELECT
+  section,
+  content,
+  embedding
+FROM business_plan_embeddings
+WHERE (metadata->>'doc_type') = 'business_plan'
+  AND (metadata->>'biz_no')  = %s
+  AND section = ANY(%s);
+"""
+
+SQL_LOAD_ALL_CHUNKS = """
+SELECT
+  section,
+  content,
+  embedding
+FROM business_plan_embeddings
+WHERE (metadata->>'doc_type') = 'business_plan'
+  AND (metadata->>'biz_no')  = %s;
+"""
+
+
+def _normalize_rows(matrix: np.ndarray) -> np.ndarray:
+    norms = np.linalg.norm(matrix, axis=-1, keepdims=True)
+    norms[norms == 0] = 1.0
+    return matrix / norms
+
+
+class CompanyChunkIndex:
+    """
+    한 회사의 사업계획서 chunk 임베딩을 메모리(NumPy 행렬)에 올려두고
+    항목별 쿼리를 로컬에서 검색한다.
+
+    - 유사도: cosine (pgvector `1 - (embedding <=> qv)` 와 동일)
+    - section 필터: boolean mask
+    - top-k: argpartition
+    """
+
+    def __init__(
+        self,
+        sections: List[str],
+        contents: List[str],
+        embeddings: np.ndarray,
+    ):
+        self.sections = np.asarray(sections, dtype=object)
+        self.contents = contents
+        self.matrix = (
+            _normalize_rows(np.asarray(embeddings, dtype=np.float32))
+            if len(contents)
+            else np.empty((0, 0), dtype=np.float32)
+        )
+
+    def __len__(self) -> int:
+        return len(self.contents)
+
+    @classmethod
+    def load(
+        cls,
+        biz_no: str,
+        sections: Optional[List[str]] = None,
+    ) -> "CompanyChunkIndex":
+        """
+        회사 chunk를 한 번의 쿼리로 불러온다.
+        sections를 주면 해당 section만 불러온다.
+        """
+        with get_pool().connection() as conn:
+            with conn.cursor() as cur:
+                if sections is None:
+                    cur.execute(SQL_LOAD_ALL_CHUNKS, (biz_no,))
+                else:
+                    cur.execute(SQL_LOAD_CHUNKS, (biz_no, list(sections)))
+                rows = cur.fetchall()
+
+        if not rows:
+            return cls([], [], np.empty((0, 0), dtype=np.float32))
+
+        return cls(
+            sections=[r[0] for r in rows],
+            contents=[r[1] for r in rows],
+            embeddings=np.stack([np.asarray(r[2], dtype=np.float32) for r in rows]),
+        )
+
+    def search(
+        self,
+        query_vec: list,
+        sections: List[str],
+        k: int = 10,
+    ) -> List[Dict]:
+        """
+        retrieve_context와 동일한 형태의 context_blocks를 반환한다.
+        """
+        if not len(self):
+            return []
+
+        candidates = np.flatnonzero(np.isin(self.sections, sections))
+        if candidates.size == 0:
+            return []
+
+        q = _normalize_rows(np.asarray(query_vec, dtype=np.float32))
+        scores = self.matrix[candidates] @ q
+
+        if candidates.size > k:
+            top = np.argpartition(-scores, k)[:k]
+        else:
+            top = np.arange(candidates.size)
+        top = top[np.argsort(-scores[top], kind="stable")]
+
+        return [
+            {
+                "section": self.sections[candidates[i]],
+                "content": self.contents[candidates[i]],
+                "similarity": round(float(scores[i]), 4),
+            }
+            for i in top
+        ]
+
+    def search_many(
+        self,
+        query_vecs: Dict[int, list],
+        sections_map: Dict[int, List[str]],
+        k: int = 10,
+    ) -> Dict[int, List[Dict]]:
+        return {
+            item_id: self.search(query_vec, sections_map[item_id], k)
+            for item_id, query_vec in query_vecs.items()
+        }
+
+
+def retrieve_context_local(
+    query_vecs: Dict[int, list],
+    biz_no: str,
+    sections_map: Dict[int, List[str]],
+    k: int = 10,
+) -> Dict[int, List[Dict]]:
+    """
+    retrieve_context_many와 같은 인터페이스로,
+    회사 chunk를 한 번 불러온 뒤 모든 항목을 로컬에서 검색한다.
+    """
+    if not query_vecs:
+        return {}
+
+    all_sections = sorted({
+        s for item_id in query_vecs for s in sections_map[item_id]
+    })
+    index = CompanyChunkIndex.load(biz_no, all_sections)
+
+    return index.search_many(query_vecs, sections_map, k)
@@ -1,27 +1,47 @@
-from typing import Dict, Any, Optional
-from rag.config import EMBEDDING_MODEL
-from rag.final.cache_manager import get_or_create_cache_vf
+import asyncio
+from contextlib import contextmanager, nullcontext
+from typing import Dict, Any, Callable, Iterator, NamedTuple, Optional, Tuple
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from functools import partial
+from rag.config import (
+    ITEM_MAX_CONCURRENCY,
+    RETRIEVAL_MODE,
+    VF_COMBINE_ITEMS,
+    KIPRIS_HTTP_ENABLED,
+    KIPRIS_STATS_CACHE,
+)
+from rag.final.cache_manager import get_or_create_cache_vf, aget_or_create_cache_vf
+from rag.final.embeddings import embed_item_queries, embed_item_queries_many
 from rag.final.prompts.marketing_prompt import MARKETING_PROMPT
 from rag.final.queries import ITEM_DEFINITIONS
-from rag.final.retriever import retrieve_context
+from rag.final.retriever import retrieve_context_many, aretrieve_context_many
+from rag.final.db_pool import async_pool_session, has_async_pool_session
+from rag.final.local_index import retrieve_context_local
+from rag.final.retry_policy import item_deadline
 
 from rag.final.generator import (
     generate_report_item_from_vectordb,
     generate_report_item_from_file,
     generate_report_item_from_googlesearch,
     generate_ipc_from_file_and_vectordb, generate_report_item_from_vf_cache,
-    generate_market_with_fallback
+    generate_market_with_fallback,
+    generate_report_items_from_vf_cache,
+    agenerate_report_items_from_vf_cache,
+    agenerate_report_item_from_vectordb,
+    agenerate_report_item_from_file,
+    agenerate_report_item_from_googlesearch,
+    agenerate_report_item_from_vf_cache,
+    agenerate_market_with_fallback,
 )
 
 from rag.final.collectors.kipris_client import download_statistics_data_from_kipris
-from rag.final.collectors.kipris_parser import run_kipris_pipeline, KIPRIS_DIR
+from rag.final.collectors.kipris_http import fetch_kipris_year_aggregates
+from rag.final.collectors.kipris_parser import run_kipris_pipeline, kipris_workspace
 from rag.final.prompts.future_prompt import FUTURE_PROMPT
 from rag.final.prompts.ip_prompt import IP_PROMPT
 from rag.final.prompts.market_prompt import MARKET_PROMPT
 from rag.final.prompts.bm_prompt import BM_PROMPT
 
-import time
-
 def _resolve_source(
     item_id: int,
     item_source_map: dict[int, str] | None,
@@ -34,131 +54,71 @@ def _resolve_source(
     return default_source
 
 # =========================================================
-# item_id 기준 generator 선택
+# 키워드 생성 유틸
 # =========================================================
+def canonicalize_ipc_code(ipc_code: str) -> str:
+    """
+    공백 제거 + 대문자 (g06q 50/16 → G06Q50/16)
+    """
+    return "".join(ipc_code.split()).upper()
 
-def _generate_by_item(
-    item_id: int,
-    company: str,
-    title: str,
-    task: str,
-    context_blocks: list,
-    source: str,
-    business_plan_pdf: Optional[str],
-):
-    # IP 대응역량 + IPC/KIPRIS 파이프라인
-    if item_id == 2 and source == "ipc+kipris":
-        if not business_plan_pdf:
-            raise ValueError("ipc+kipris source requires business_plan_pdf")
-
-        ipc_result = run_ipc_kipris_pipeline(
-            business_plan_pdf=business_plan_pdf,
-            context_blocks=context_blocks
-        )
-
-        return {
-            "title": title,
-            "content": ipc_result,
-        }
-
-    if source == 'googlesearch' and title != '비즈니스 모델 역량진단':
-        result = generate_market_with_fallback(
-            company=company,
-            title=title,
-            task=task,
-            context_blocks=context_blocks,
-            file_path=business_plan_pdf,
-        )
-
-        return {
-            "title": title,
-            "content": result["parsed"].model_dump(),
-            "grounding": result["grounding"],
-        }
-
-    # 시장 규모 / 경쟁사 → Google Search 전용
-    if source == "googlesearch":
-        result = generate_report_item_from_googlesearch(
-            company=company,
-            title=title,
-            task=task,
-            context_blocks=context_blocks,
-            file_path=business_plan_pdf,
-        )
-
-        if title == "비즈니스 모델 역량진단":
-            return {
-                "title": title,
-                "content": result.evaluation,
-            }
-
-        return {
-            "title": title,
-            "content": result["parsed"].model_dump(),
-            "grounding": result["grounding"],
-        }
-
-    # 구조 분석 계열
-    if source == "vectordb":
-        r = generate_report_item_from_vectordb(
-            company=company,
-            title=title,
-            task=task,
-            context_blocks=context_blocks,
-        )
-        return {"title": title, "content": r.evaluation}
-
-    if source == "file":
-        if not business_plan_pdf:
-            raise ValueError("file source requires business_plan_pdf")
-        r = generate_report_item_from_file(
-            company=company,
-            title=title,
-            task=task,
-            file_path=business_plan_pdf,
-        )
-        return {"title": title, "content": r.evaluation}
-
-    if source == "file+vectordb":
-        if not business_plan_pdf:
-            raise ValueError("file+vectordb source requires business_plan_pdf")
 
-        cache_vf_id = get_or_create_cache_vf(
-            company=company,
-            business_plan_pdf=business_plan_pdf,
-        )
+def build_kipris_ipc_keyword(ipc_items) -> str:
+    """
+    IPCAnalysisItem 리스트 → KIPRIS용 IPC 검색 문자열 생성
+    예: G06Q10/06*G06Q50/16*G06T19/00
 
-        r = generate_report_item_from_vf_cache(
-            company=company,
-            title=title,
-            task=task,
-            context_blocks=context_blocks,
-            cache_vf_id=cache_vf_id,
-        )
-        return {"title": title, "content": r.evaluation}
+    OR 검색이므로 순서는 결과에 영향이 없음 → 정규화 / 중복 제거 / 정렬해
+    같은 IPC 조합이면 항상 같은 키워드(= 통계 캐시 키)가 되도록 한다.
+    """
+    ipc_codes = {
+        canonicalize_ipc_code(item.ipc_code)
+        for item in ipc_items
+    }
+    ipc_codes.discard("")
 
-    raise ValueError(f"Unsupported source: {source}")
+    return "*".join(sorted(ipc_codes))
 
 # =========================================================
-# 키워드 생성 유틸
+# 특허 통계데이터
 # =========================================================
-def build_kipris_ipc_keyword(ipc_items) -> str:
+def collect_kipris_statistics(ipc_keyword: str):
     """
-    IPCAnalysisItem 리스트 → KIPRIS용 IPC 검색 문자열 생성
-    예: G06Q50/16*G06T19/00*G06Q10/06
+    KIPRIS 연도별 통계 수집
+    0) 같은 IPC 조합의 캐시가 유효하면 그대로 사용
+    1) HTTP 클라이언트 (브라우저 없음, 엑셀을 메모리에서 바로 파싱)
+    2) 실패 시 Selenium 다운로드 → 엑셀 파싱 (기존 경로)
     """
-    ipc_codes = []
+    if KIPRIS_STATS_CACHE is not None:
+        cached = KIPRIS_STATS_CACHE.get(ipc_keyword)
+        if cached is not None:
+            print(f"💾 KIPRIS 통계 캐시 사용: {ipc_keyword}")
+            return cached
 
-    for item in ipc_items:
-        # 공백 제거 (G06Q 50/16 → G06Q50/16)
-        normalized = item.ipc_code.replace(" ", "")
-        ipc_codes.append(normalized)
+    aggregates = _fetch_kipris_statistics(ipc_keyword)
+
+    if KIPRIS_STATS_CACHE is not None:
+        KIPRIS_STATS_CACHE.put(ipc_keyword, aggregates)
+    return aggregates
+
+
+def _fetch_kipris_statistics(ipc_keyword: str):
+    if KIPRIS_HTTP_ENABLED:
+        try:
+            return fetch_kipris_year_aggregates(ipc_keyword)
+        except Exception as e:
+            print(f"⚠️ KIPRIS HTTP 수집 실패: {e} → Selenium fallback")
+
+    # 작업 전용 폴더에 받고, 파싱 후 폴더째 정리
+    with kipris_workspace() as workspace:
+        # 다운로드 완료(download_watcher)까지 기다린 뒤 반환됨 → 바로 파싱
+        excel_path = download_statistics_data_from_kipris(
+            download_dir=str(workspace),
+            keyword=ipc_keyword,
+        )
+        return run_kipris_pipeline(workspace, excel_path)
 
-    return "*".join(ipc_codes)
 
-# =========================================================
-# 특허 통계데이터
-# =========================================================
 def run_ipc_kipris_pipeline(
     business_plan_pdf: str,
     context_blocks: list
@@ -181,20 +141,210 @@ def run_ipc_kipris_pipeline(
     # 예: G06Q50/16*G06T19/00*G06Q10/06
     print(f"KIPRIS IPC 검색 키워드: {ipc_keyword}")
 
-    # 3. KIPRIS 통계 엑셀 다운로드 (딱 한 번)
-    download_statistics_data_from_kipris(
-        download_dir=str(KIPRIS_DIR),
-        keyword=ipc_keyword,
-    )
-    time.sleep(3)
-    # 4. 엑셀 정규화
-    aggregates = run_kipris_pipeline()
+    # 3. KIPRIS 통계 수집 + 엑셀 정규화 (딱 한 번)
+    aggregates = collect_kipris_statistics(ipc_keyword)
 
     return {
         "ipc_analysis": [item.model_dump() for item in ipc_result.ipc_analysis],
         "statistics": aggregates.model_dump(),
     }
 
+# =========================================================
+# item_id 기준 generator 선택
+# =========================================================
+# route → 동기 / 비동기 generator, 호출 인자, 결과 → 항목 출력 변환
+# 동기(_generate_by_item) / 비동기(_agenerate_by_item)는 실제 호출만 다르다.
+BM_TITLE = "비즈니스 모델 역량진단"
+
+
+def _raw_output(title: str, content) -> Dict[str, Any]:
+    return {"title": title, "content": content}
+
+
+def _evaluation_output(title: str, result) -> Dict[str, Any]:
+    return {"title": title, "content": result.evaluation}
+
+
+def _market_output(title: str, result: dict) -> Dict[str, Any]:
+    return {
+        "title": title,
+        "content": result["parsed"].model_dump(),
+        "grounding": result["grounding"],
+    }
+
+
+def _generate_vf_cache_item(company, title, task, context_blocks, business_plan_pdf):
+    cache_vf_id = get_or_create_cache_vf(
+        company=company,
+        business_plan_pdf=business_plan_pdf,
+    )
+    return generate_report_item_from_vf_cache(
+        company=company,
+        title=title,
+        task=task,
+        context_blocks=context_blocks,
+        cache_vf_id=cache_vf_id,
+    )
+
+
+async def _agenerate_vf_cache_item(company, title, task, context_blocks, business_plan_pdf):
+    cache_vf_id = await aget_or_create_cache_vf(
+        company=company,
+        business_plan_pdf=business_plan_pdf,
+    )
+    return await agenerate_report_item_from_vf_cache(
+        company=company,
+        title=title,
+        task=task,
+        context_blocks=context_blocks,
+        cache_vf_id=cache_vf_id,
+    )
+
+
+def _generate_vf_cache_items(company, items, business_plan_pdf):
+    cache_vf_id = get_or_create_cache_vf(
+        company=company,
+        business_plan_pdf=business_plan_pdf,
+    )
+    return generate_report_items_from_vf_cache(
+        company=company,
+        items=items,
+        cache_vf_id=cache_vf_id,
+    )
+
+
+async def _agenerate_vf_cache_items(company, items, business_plan_pdf):
+    cache_vf_id = await aget_or_create_cache_vf(
+        company=company,
+        business_plan_pdf=business_plan_pdf,
+    )
+    return await agenerate_report_items_from_vf_cache(
+        company=company,
+        items=items,
+        cache_vf_id=cache_vf_id,
+    )
+
+
+async def _arun_ipc_kipris_pipeline(business_plan_pdf: str, context_blocks: list):
+    # IPC/KIPRIS(Selenium)는 동기 함수 → 스레드로 넘김
+    return await asyncio.to_thread(
+        run_ipc_kipris_pipeline,
+        business_plan_pdf=business_plan_pdf,
+        context_blocks=context_blocks,
+    )
+
+
+class _ItemRoute(NamedTuple):
+    call: Callable
+    acall: Callable
+    args: Tuple[str, ...]
+    to_output: Callable[[str, Any], Dict[str, Any]]
+    requires_pdf: bool = False
+
+
+_GENERATOR_ARGS = ("company", "title", "task", "context_blocks")
+
+ITEM_ROUTES: Dict[str, _ItemRoute] = {
+    # IP 대응역량 + IPC/KIPRIS 파이프라인
+    "ipc+kipris": _ItemRoute(
+        run_ipc_kipris_pipeline, _arun_ipc_kipris_pipeline,
+        ("business_plan_pdf", "context_blocks"), _raw_output, requires_pdf=True,
+    ),
+    # 시장 규모 / 경쟁사 → Google Search + 시장 범위 fallback
+    "market": _ItemRoute(
+        generate_market_with_fallback, agenerate_market_with_fallback,
+        _GENERATOR_ARGS + ("file_path",), _market_output,
+    ),
+    # BM → Google Search 단일 호출
+    "googlesearch": _ItemRoute(
+        generate_report_item_from_googlesearch, agenerate_report_item_from_googlesearch,
+        _GENERATOR_ARGS + ("file_path",), _evaluation_output,
+    ),
+    # 구조 분석 계열
+    "vectordb": _ItemRoute(
+        generate_report_item_from_vectordb, agenerate_report_item_from_vectordb,
+        _GENERATOR_ARGS, _evaluation_output,
+    ),
+    "file": _ItemRoute(
+        generate_report_item_from_file, agenerate_report_item_from_file,
+        ("company", "title", "task", "file_path"), _evaluation_output, requires_pdf=True,
+    ),
+    "file+vectordb": _ItemRoute(
+        _generate_vf_cache_item, _agenerate_vf_cache_item,
+        _GENERATOR_ARGS + ("business_plan_pdf",), _evaluation_output, requires_pdf=True,
+    ),
+}
+
+
+def _route_name(item_id: int, source: str, title: str) -> str:
+    if item_id == 2 and source == "ipc+kipris":
+        return "ipc+kipris"
+    if source == "googlesearch":
+        return "googlesearch" if title == BM_TITLE else "market"
+    if source in ("vectordb", "file", "file+vectordb"):
+        return source
+    raise ValueError(f"Unsupported source: {source}")
+
+
+def _plan_item_call(
+    item_id: int,
+    company: str,
+    title: str,
+    task: str,
+    context_blocks: list,
+    source: str,
+    business_plan_pdf: Optional[str],
+) -> Tuple[_ItemRoute, Dict[str, Any]]:
+    """
+    항목 → (route, generator 호출 인자)
+    """
+    route = ITEM_ROUTES[_route_name(item_id, source, title)]
+
+    if route.requires_pdf and not business_plan_pdf:
+        raise ValueError(f"{source} source requires business_plan_pdf")
+
+    values = {
+        "company": company,
+        "title": title,
+        "task": task,
+        "context_blocks": context_blocks,
+        "file_path": business_plan_pdf,
+        "business_plan_pdf": business_plan_pdf,
+    }
+    return route, {name: values[name] for name in route.args}
+
+
+def _generate_by_item(
+    item_id: int,
+    company: str,
+    title: str,
+    task: str,
+    context_blocks: list,
+    source: str,
+    business_plan_pdf: Optional[str],
+):
+    route, kwargs = _plan_item_call(
+        item_id, company, title, task, context_blocks, source, business_plan_pdf
+    )
+    return route.to_output(title, route.call(**kwargs))
+
+async def _agenerate_by_item(
+    item_id: int,
+    company: str,
+    title: str,
+    task: str,
+    context_blocks: list,
+    source: str,
+    business_plan_pdf: Optional[str],
+):
+    """
+    _generate_by_item의 비동기 버전 (route 선택 / 출력 변환 공유)
+    """
+    route, kwargs = _plan_item_call(
+        item_id, company, title, task, context_blocks, source, business_plan_pdf
+    )
+    return route.to_output(title, await route.acall(**kwargs))
+
 # =========================================================
 # 항목별 프롬포트 매칭 MAP
 # =========================================================
@@ -206,6 +356,226 @@ PROMPT_MAP = {
     "마케팅 역량진단" : MARKETING_PROMPT
 }
 
+# =========================================================
+# 검색 모드
+# =========================================================
+# sql   : 항목 전체를 SQL 1회로 검색 (retrieve_context_many)
+# local : 회사 chunk를 메모리에 올려 로컬 검색 (retrieve_context_local)
+RETRIEVERS = {
+    "sql": retrieve_context_many,
+    "local": retrieve_context_local,
+}
+
+# =========================================================
+# 단일 항목 처리
+# =========================================================
+
+def _item_error(item_id: int, e: Exception) -> Dict[str, Any]:
+    print(f"❌ Item {item_id} failed: {e}")
+    return {
+        "title": ITEM_DEFINITIONS[item_id]["title"],
+        "error": True,
+        "message": str(e),
+        "content": None,
+    }
+
+
+def _run_unit(unit_ids: list[int], fn: Callable[[], Dict[int, Any]]) -> Dict[int, Any]:
+    """
+    작업 단위(항목 1개 또는 VF 묶음) 실행.
+    순차 / 스레드 풀 어느 모드든 단위 밖으로 새어 나온 예외는 항목별 error 결과로 기록한다.
+    """
+    try:
+        return fn()
+    except Exception as e:
+        return {item_id: _item_error(item_id, e) for item_id in unit_ids}
+
+
+async def _arun_unit(unit_ids: list[int], coro) -> Dict[int, Any]:
+    try:
+        return await coro
+    except Exception as e:
+        return {item_id: _item_error(item_id, e) for item_id in unit_ids}
+
+
+def _process_item(
+    item_id: int,
+    company: str,
+    context_blocks: list,
+    item_source_map: dict[int, str] | None,
+    business_plan_pdf: Optional[str],
+) -> Dict[str, Any]:
+    """
+    항목 하나에 대해 생성을 수행한다.
+    (query embedding / 검색은 generate에서 항목 전체를 한 번에 처리한다)
+    실패 시 예외를 올리지 않고 error 결과를 반환한다.
+    """
+    item = ITEM_DEFINITIONS[item_id]
+
+    print(f"\n{'=' * 60}")
+    print(f"Processing Item {item_id}: {item['title']}")
+    print(f"{'=' * 60}")
+
+    try:
+        resolved_source = _resolve_source(
+            item_id=item_id,
+            item_source_map=item_source_map,
+        )
+
+        task_prompt = PROMPT_MAP.get(item["title"])
+
+        # 항목 단위 제한 시간 (fallback 레벨 / 재시도 전체 포함)
+        with item_deadline():
+            output = _generate_by_item(
+                item_id=item_id,
+                source=resolved_source,
+                company=company,
+                title=item["title"],
+                task=task_prompt,
+                context_blocks=context_blocks,
+                business_plan_pdf=business_plan_pdf,
+            )
+        print(f"✅ Item {item_id} completed")
+        return output
+
+    except Exception as e:
+        return _item_error(item_id, e)
+
+# =========================================================
+# VF 캐시 다중 항목 묶음 처리
+# =========================================================
+
+def _combinable_vf_item_ids(
+    item_ids: list[int],
+    item_source_map: dict[int, str] | None,
+    business_plan_pdf: Optional[str],
+) -> list[int]:
+    """
+    같은 VF 캐시(file+vectordb)를 쓰는 항목들 → 한 번의 호출로 묶을 수 있음
+    """
+    if not business_plan_pdf:
+        return []
+
+    vf_ids = [
+        item_id for item_id in item_ids
+        if _resolve_source(item_id, item_source_map) == "file+vectordb"
+    ]
+    return vf_ids if len(vf_ids) >= 2 else []
+
+
+def _combined_items_payload(item_ids: list[int], contexts: Dict[int, list]) -> list[dict]:
+    return [
+        {
+            "item_id": item_id,
+            "title": ITEM_DEFINITIONS[item_id]["title"],
+            "task": PROMPT_MAP.get(ITEM_DEFINITIONS[item_id]["title"]),
+            "context_blocks": contexts[item_id],
+        }
+        for item_id in item_ids
+    ]
+
+
+def _split_combined_outputs(
+    item_ids: list[int],
+    generated: dict,
+) -> tuple[Dict[int, Any], list[int]]:
+    outputs: Dict[int, Any] = {}
+    missing = []
+
+    for item_id in item_ids:
+        r = generated.get(item_id)
+        if r is None:
+            missing.append(item_id)
+            continue
+        outputs[item_id] = {
+            "title": ITEM_DEFINITIONS[item_id]["title"],
+            "content": r.evaluation,
+        }
+        print(f"✅ Item {item_id} completed (combined)")
+
+    return outputs, missing
+
+
+class _CombinedVfCall:
+    """
+    묶음 호출 한 번의 입력 / 결과 (동기·비동기 공통)
+    generated가 비어 있으면(호출 실패) 전 항목이 fallback 대상이 된다.
+    """
+
+    def __init__(self, item_ids: list[int], contexts: Dict[int, list]):
+        self.item_ids = item_ids
+        self.items = _combined_items_payload(item_ids, contexts)
+        self.generated: dict = {}
+
+    def split(self) -> tuple[Dict[int, Any], list[int]]:
+        return _split_combined_outputs(self.item_ids, self.generated)
+
+
+@contextmanager
+def _combined_vf_call(
+    item_ids: list[int],
+    contexts: Dict[int, list],
+) -> Iterator[_CombinedVfCall]:
+    """
+    묶음 호출 구간: 항목 단위 제한 시간을 적용하고,
+    실패는 삼켜서 generated를 비워 둔다 (→ 호출부에서 개별 생성)
+    """
+    print(f"\n{'=' * 60}")
+    print(f"Processing Items {item_ids} (combined VF cache call)")
+    print(f"{'=' * 60}")
+
+    call = _CombinedVfCall(item_ids, contexts)
+    try:
+        with item_deadline():
+            yield call
+    except Exception as e:
+        print(f"⚠️ Items {item_ids} combined call failed: {e} → 개별 생성")
+        call.generated = {}
+
+
+def _process_vf_items_combined(
+    item_ids: list[int],
+    company: str,
+    contexts: Dict[int, list],
+    business_plan_pdf: str,
+    fallback,
+) -> Dict[int, Any]:
+    """
+    VF 캐시 항목들을 한 번의 Gemini 호출로 생성한다.
+    묶음 호출이 실패하거나 누락된 항목은 fallback(item_id)으로 개별 생성한다.
+    """
+    with _combined_vf_call(item_ids, contexts) as call:
+        call.generated = _generate_vf_cache_items(company, call.items, business_plan_pdf)
+
+    outputs, missing = call.split()
+    for item_id in missing:
+        outputs.update(fallback(item_id))
+
+    return outputs
+
+
+async def _aprocess_vf_items_combined(
+    item_ids: list[int],
+    company: str,
+    contexts: Dict[int, list],
+    business_plan_pdf: str,
+    fallback,
+    semaphore: asyncio.Semaphore,
+) -> Dict[int, Any]:
+    """
+    semaphore는 묶음 호출 동안만 점유한다.
+    (fallback 개별 생성도 같은 semaphore를 쓰므로 점유한 채 호출하면 교착됨)
+    """
+    async with semaphore:
+        with _combined_vf_call(item_ids, contexts) as call:
+            call.generated = await _agenerate_vf_cache_items(company, call.items, business_plan_pdf)
+
+    outputs, missing = call.split()
+    for item_id in missing:
+        outputs.update(await fallback(item_id))
+
+    return outputs
+
 # =========================================================
 # 단일 엔트리포인트
 # =========================================================
@@ -216,60 +586,295 @@ def generate(
     item_source_map: dict[int, str] | None = None,
     business_plan_pdf: Optional[str] = None,
     item_range: Optional[tuple[int, int]] = None,
+    max_concurrency: int = ITEM_MAX_CONCURRENCY,
+    query_vecs: Optional[Dict[int, list]] = None,
+    retrieval_mode: str = RETRIEVAL_MODE,
+    combine_vf_items: bool = VF_COMBINE_ITEMS,
 ) -> Dict[int, Any]:
+    """
+    max_concurrency > 1 이면 항목들을 스레드 풀에서 동시에 처리한다.
+    (항목 간 의존성이 없으므로 LLM 대기 시간이 겹쳐진다)
+    Gemini 쿼터를 넘지 않도록 동시 실행 수는 max_concurrency로 제한한다.
+
+    query_vecs를 넘기면 해당 임베딩을 그대로 사용하고,
+    없으면 대상 항목의 쿼리 전체를 한 번의 배치로 임베딩한다.
+
+    retrieval_mode: "sql" | "local" (RETRIEVERS 참고)
+
+    combine_vf_items=True 이면 file+vectordb 항목들을 한 번의 캐시 호출로 생성한 뒤
+    항목별 결과로 나눈다. (실패/누락 항목은 개별 호출로 보완)
+
+    실패 처리 (max_concurrency / agenerate와 무관하게 동일):
+    - embedding / 검색 실패 → 모든 항목에 필요하므로 예외를 그대로 올린다 (회사 단위 실패)
+    - 생성 단계 실패 → 해당 항목만 error 결과로 기록하고 나머지는 계속 진행
+    """
+    if retrieval_mode not in RETRIEVERS:
+        raise ValueError(f"Unsupported retrieval_mode: {retrieval_mode}")
+
+    start, end = item_range or (1, len(ITEM_DEFINITIONS))
+    item_ids = list(range(start, end + 1))
+
+    # 1. query → embedding (항목 전체 1회 배치)
+    if query_vecs is None:
+        query_vecs = embed_item_queries(company, item_ids)
+
+    # 2. retrieve context (항목 전체 1회 round trip)
+    contexts = RETRIEVERS[retrieval_mode](
+        query_vecs={item_id: query_vecs[item_id] for item_id in item_ids},
+        biz_no=biz_no,
+        sections_map={
+            item_id: ITEM_DEFINITIONS[item_id]["sections"]
+            for item_id in item_ids
+        },
+    )
+
+    # 3. generate
+    #    - VF 캐시 항목은 (combine_vf_items 시) 한 작업 단위로 묶는다
+    def _run(item_id: int) -> Dict[int, Any]:
+        return {
+            item_id: _process_item(
+                item_id=item_id,
+                company=company,
+                context_blocks=contexts[item_id],
+                item_source_map=item_source_map,
+                business_plan_pdf=business_plan_pdf,
+            )
+        }
+
+    combined_ids = (
+        _combinable_vf_item_ids(item_ids, item_source_map, business_plan_pdf)
+        if combine_vf_items
+        else []
+    )
+
+    units = []
+    if combined_ids:
+        units.append((
+            combined_ids,
+            partial(
+                _process_vf_items_combined,
+                combined_ids, company, contexts, business_plan_pdf, _run,
+            ),
+        ))
+    units += [
+        ([item_id], partial(_run, item_id))
+        for item_id in item_ids
+        if item_id not in combined_ids
+    ]
 
     results: Dict[int, Any] = {}
 
+    if max_concurrency <= 1 or len(units) <= 1:
+        for unit_ids, fn in units:
+            results.update(_run_unit(unit_ids, fn))
+        return {item_id: results[item_id] for item_id in item_ids}
+
+    with ThreadPoolExecutor(
+        max_workers=min(max_concurrency, len(units)),
+        thread_name_prefix="report-item",
+    ) as executor:
+        futures = [
+            executor.submit(_run_unit, unit_ids, fn)
+            for unit_ids, fn in units
+        ]
+
+        for future in as_completed(futures):
+            results.update(future.result())
+
+    # item_id 순서 유지
+    return {item_id: results[item_id] for item_id in item_ids}
+
+
+# =========================================================
+# 다중 회사 엔트리포인트
+# =========================================================
+
+def generate_many(
+    jobs: list[dict],
+    item_source_map: dict[int, str] | None = None,
+    item_range: Optional[tuple[int, int]] = None,
+    max_concurrency: int = ITEM_MAX_CONCURRENCY,
+    retrieval_mode: str = RETRIEVAL_MODE,
+    combine_vf_items: bool = VF_COMBINE_ITEMS,
+) -> Dict[str, Dict[int, Any]]:
+    """
+    여러 회사의 보고서를 생성한다.
+    jobs: [{"company": ..., "biz_no": ..., "business_plan_pdf": ...}, ...]
+
+    모든 회사의 항목 쿼리를 한 번의 배치로 임베딩한 뒤 회사별로 generate를 호출한다.
+    반환: biz_no → generate 결과
+    """
     start, end = item_range or (1, len(ITEM_DEFINITIONS))
+    item_ids = list(range(start, end + 1))
+
+    companies = list(dict.fromkeys(job["company"] for job in jobs))
+    vecs_by_company = embed_item_queries_many(companies, item_ids)
+
+    reports: Dict[str, Dict[int, Any]] = {}
+
+    for job in jobs:
+        reports[job["biz_no"]] = generate(
+            company=job["company"],
+            biz_no=job["biz_no"],
+            item_source_map=item_source_map,
+            business_plan_pdf=job.get("business_plan_pdf"),
+            item_range=(start, end),
+            max_concurrency=max_concurrency,
+            query_vecs=vecs_by_company[job["company"]],
+            retrieval_mode=retrieval_mode,
+            combine_vf_items=combine_vf_items,
+        )
+
+    return reports
 
-    for item_id in range(start, end + 1):
-        item = ITEM_DEFINITIONS[item_id]
 
-        print(f"\n{'=' * 60}")
-        print(f"Processing Item {item_id}: {item['title']}")
-        print(f"{'=' * 60}")
+# =========================================================
+# 비동기 엔트리포인트
+# =========================================================
+
+async def agenerate(
+    company: str,
+    biz_no: str,
+    item_source_map: dict[int, str] | None = None,
+    business_plan_pdf: Optional[str] = None,
+    item_range: Optional[tuple[int, int]] = None,
+    max_concurrency: int = ITEM_MAX_CONCURRENCY,
+    query_vecs: Optional[Dict[int, list]] = None,
+    retrieval_mode: str = RETRIEVAL_MODE,
+    semaphore: Optional[asyncio.Semaphore] = None,
+    combine_vf_items: bool = VF_COMBINE_ITEMS,
+) -> Dict[int, Any]:
+    """
+    generate의 비동기 버전.
+    하나의 이벤트 루프에서 여러 회사의 항목을 동시에 처리할 수 있다.
+    semaphore를 넘기면 여러 agenerate 호출이 동시 실행 한도를 공유한다.
+
+    비동기 DB 풀 수명:
+    - 호출자가 async_pool_session()을 열어 두었으면 그 풀을 재사용하고 닫지 않는다.
+      (여러 회사를 처리할 때는 배치 전체를 감싸거나 agenerate_many 사용)
+    - 세션 없이 단독 호출하면 이 호출이 끝날 때 풀을 닫는다.
+      → 회사마다 따로 await 하면 매번 풀(min_size 커넥션)을 새로 열게 됨
+    """
+    pool_scope = nullcontext() if has_async_pool_session() else async_pool_session()
+    async with pool_scope:
+        if retrieval_mode not in RETRIEVERS:
+            raise ValueError(f"Unsupported retrieval_mode: {retrieval_mode}")
+
+        start, end = item_range or (1, len(ITEM_DEFINITIONS))
+        item_ids = list(range(start, end + 1))
 
         # 1. query → embedding
-        query = item["query"].format(company=company)
-        query_vec = EMBEDDING_MODEL.embed_query(query)
+        if query_vecs is None:
+            query_vecs = await asyncio.to_thread(embed_item_queries, company, item_ids)
 
         # 2. retrieve context
-        context_blocks = retrieve_context(
-            query_vec=query_vec,
+        retrieve_kwargs = dict(
+            query_vecs={item_id: query_vecs[item_id] for item_id in item_ids},
             biz_no=biz_no,
-            sections=item["sections"],
+            sections_map={
+                item_id: ITEM_DEFINITIONS[item_id]["sections"]
+                for item_id in item_ids
+            },
         )
+        if retrieval_mode == "sql":
+            contexts = await aretrieve_context_many(**retrieve_kwargs)
+        else:
+            contexts = await asyncio.to_thread(RETRIEVERS[retrieval_mode], **retrieve_kwargs)
 
         # 3. generate
-        try:
-            resolved_source = _resolve_source(
-                item_id=item_id,
-                item_source_map=item_source_map,
-            )
+        semaphore = semaphore or asyncio.Semaphore(max(1, max_concurrency))
+
+        async def _run(item_id: int) -> Dict[str, Any]:
+            item = ITEM_DEFINITIONS[item_id]
+
+            async with semaphore:
+                print(f"\n{'=' * 60}")
+                print(f"Processing Item {item_id}: {item['title']}")
+                print(f"{'=' * 60}")
+
+                try:
+                    with item_deadline():
+                        output = await _agenerate_by_item(
+                            item_id=item_id,
+                            source=_resolve_source(
+                                item_id=item_id,
+                                item_source_map=item_source_map,
+                            ),
+                            company=company,
+                            title=item["title"],
+                            task=PROMPT_MAP.get(item["title"]),
+                            context_blocks=contexts[item_id],
+                            business_plan_pdf=business_plan_pdf,
+                        )
+                    print(f"✅ Item {item_id} completed")
+                    return output
+
+                except Exception as e:
+                    return _item_error(item_id, e)
+
+        combined_ids = (
+            _combinable_vf_item_ids(item_ids, item_source_map, business_plan_pdf)
+            if combine_vf_items
+            else []
+        )
 
-            task_prompt = PROMPT_MAP.get(item["title"])
+        async def _run_single(item_id: int) -> Dict[int, Any]:
+            return {item_id: await _run(item_id)}
 
-            output = _generate_by_item(
-                item_id=item_id,
-                source=resolved_source,
-                company=company,
-                title=item["title"],
-                task=task_prompt,
-                context_blocks=context_blocks,
-                business_plan_pdf=business_plan_pdf,
-            )
-            results[item_id] = output
-            print(f"✅ Item {item_id} completed")
+        coros = [
+            _arun_unit([item_id], _run_single(item_id))
+            for item_id in item_ids
+            if item_id not in combined_ids
+        ]
+        if combined_ids:
+            coros.append(_arun_unit(combined_ids, _aprocess_vf_items_combined(
+                combined_ids, company, contexts, business_plan_pdf, _run_single, semaphore,
+            )))
+
+        results: Dict[int, Any] = {}
+        for unit_result in await asyncio.gather(*coros):
+            results.update(unit_result)
+
+        return {item_id: results[item_id] for item_id in item_ids}
 
-        except Exception as e:
-            results[item_id] = {
-                "title": item["title"],
-                "error": True,
-                "message": str(e),
-                "content": None,
-            }
-            print(f"❌ Item {item_id} failed: {e}")
 
-    return results
+async def agenerate_many(
+    jobs: list[dict],
+    item_source_map: dict[int, str] | None = None,
+    item_range: Optional[tuple[int, int]] = None,
+    max_concurrency: int = ITEM_MAX_CONCURRENCY,
+    retrieval_mode: str = RETRIEVAL_MODE,
+    combine_vf_items: bool = VF_COMBINE_ITEMS,
+) -> Dict[str, Dict[int, Any]]:
+    """
+    generate_many의 비동기 버전.
+    모든 회사가 하나의 비동기 DB 풀과 동시 실행 한도(semaphore)를 공유하며,
+    풀은 배치 전체가 끝날 때 한 번만 닫는다.
+    반환: biz_no → agenerate 결과
+    """
+    start, end = item_range or (1, len(ITEM_DEFINITIONS))
+    item_ids = list(range(start, end + 1))
 
+    companies = list(dict.fromkeys(job["company"] for job in jobs))
+    vecs_by_company = await asyncio.to_thread(embed_item_queries_many, companies, item_ids)
+
+    semaphore = asyncio.Semaphore(max(1, max_concurrency))
+
+    async with async_pool_session():
+        reports = await asyncio.gather(*(
+            agenerate(
+                company=job["company"],
+                biz_no=job["biz_no"],
+                item_source_map=item_source_map,
+                business_plan_pdf=job.get("business_plan_pdf"),
+                item_range=(start, end),
+                max_concurrency=max_concurrency,
+                query_vecs=vecs_by_company[job["company"]],
+                retrieval_mode=retrieval_mode,
+                semaphore=semaphore,
+                combine_vf_items=combine_vf_items,
+            )
+            for job in jobs
+        ))
 
+    return {job["biz_no"]: report for job, report in zip(jobs, reports)}
@@ -0,0 +1,281 @@
+import asyncio
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+from rag.config import (
+    CACHE_DIR,
+    RATE_LIMIT_BACKEND,
+    RATE_LIMITS,
+    RATE_LIMIT_DEFAULT,
+    RATE_LIMIT_OUTPUT_TOKENS,
+    RATE_LIMIT_FILE_TOKENS,
+)
+from rag.final.retry_policy import remaining_time
+
+# =========================================================
+# 토큰 버킷 (모델별 RPM / TPM)
+# =========================================================
+# bucket key: "{scope}:{model}:{rpm|tpm}"
+#   scope = API 키 해시 → 같은 키를 쓰는 모든 프로세스가 같은 예산을 공유
+#
+# 요청 1건 = rpm 버킷 1 + tpm 버킷 (예상 토큰 수)
+# 응답 후 실제 사용량(usage_metadata)과의 차이를 settle()로 정산한다.
+
+# (key, capacity, refill_per_sec, amount)
+BucketRequest = Tuple[str, float, float, float]
+
+
+def _refill(level: float, updated_at: float, capacity: float, rate: float, now: float) -> float:
+    return min(capacity, level + max(0.0, now - updated_at) * rate)
+
+
+def _plan_take(
+    states: Dict[str, Tuple[float, float]],
+    requests: List[BucketRequest],
+    now: float,
+) -> Tuple[float, Dict[str, float]]:
+    """
+    모든 버킷에서 한꺼번에 차감할 수 있으면 (0, 차감 후 level),
+    아니면 (필요 대기 시간, 보충만 반영한 level)을 반환한다.
+    """
+    levels = {}
+    wait = 0.0
+
+    for key, capacity, rate, amount in requests:
+        level, updated_at = states.get(key, (capacity, now))
+        level = _refill(level, updated_at, capacity, rate, now)
+        levels[key] = level
+
+        # 용량보다 큰 요청은 버킷이 가득 찼을 때 통과시킴 (영원히 대기 방지)
+        need = min(amount, capacity)
+        if level < need:
+            wait = max(wait, (need - level) / rate)
+
+    if wait > 0:
+        return wait, levels
+
+    return 0.0, {
+        key: levels[key] - amount
+        for key, _, _, amount in requests
+    }
+
+
+class MemoryBucketBackend:
+    """
+    프로세스 내 버킷 (스레드 / asyncio 공용)
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._states: Dict[str, Tuple[float, float]] = {}
+
+    def take(self, requests: List[BucketRequest]) -> float:
+        with self._lock:
+            now = time.time()
+            wait, levels = _plan_take(self._states, requests, now)
+            for key, level in levels.items():
+                self._states[key] = (level, now)
+            return wait
+
+    def adjust(self, key: str, capacity: float, rate: float, delta: float) -> None:
+        with self._lock:
+            now = time.time()
+            level, updated_at = self._states.get(key, (capacity, now))
+            level = _refill(level, updated_at, capacity, rate, now) - delta
+            self._states[key] = (max(-capacity, min(capacity, level)), now)
+
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS rate_buckets (
+    key        TEXT PRIMARY KEY,
+    level      REAL NOT NULL,
+    updated_at REAL NOT NULL
+);
+"""
+
+
+class SQLiteBucketBackend:
+    """
+    로컬 파일(SQLite) 버킷.
+    BEGIN IMMEDIATE로 프로세스 간 차감을 직렬화한다.
+    """
+
+    def __init__(self, db_path: Path):
+        db_path = Path(db_path)
+        db_path.parent.mkdir(parents=True, exist_ok=True)
+
+        self.db_path = db_path
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(
+            str(db_path),
+            timeout=30,
+            check_same_thread=False,
+            isolation_level=None,
+        )
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.executescript(_SCHEMA)
+
+    def _load(self, keys: List[str]) -> Dict[str, Tuple[float, float]]:
+        states = {}
+        for key in keys:
+            row = self._conn.execute(
+                "SELECT level, updated_at FROM rate_buckets WHERE key = ?",
+                (key,),
+            ).fetchone()
+            if row is not None:
+                states[key] = (row[0], row[1])
+        return states
+
+    def _save(self, levels: Dict[str, float], now: float) -> None:
+        self._conn.executemany(
+            "INSERT OR REPLACE INTO rate_buckets (key, level, updated_at) "
+            "VALUES (?, ?, ?)",
+            [(key, level, now) for key, level in levels.items()],
+        )
+
+    def take(self, requests: List[BucketRequest]) -> float:
+        with self._lock:
+            self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                now = time.time()
+                states = self._load([r[0] for r in requests])
+                wait, levels = _plan_take(states, requests, now)
+                self._save(levels, now)
+                self._conn.execute("COMMIT")
+            except Exception:
+                self._conn.execute("ROLLBACK")
+                raise
+            return wait
+
+    def adjust(self, key: str, capacity: float, rate: float, delta: float) -> None:
+        with self._lock:
+            self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                now = time.time()
+                level, updated_at = self._load([key]).get(key, (capacity, now))
+                level = _refill(level, updated_at, capacity, rate, now) - delta
+                self._save({key: max(-capacity, min(capacity, level))}, now)
+                self._conn.execute("COMMIT")
+            except Exception:
+                self._conn.execute("ROLLBACK")
+                raise
+
+
+# =========================================================
+# Rate Limiter
+# =========================================================
+class RateLimiter:
+    """
+    모델별 requests/min, tokens/min 제한.
+    acquire()는 스레드를 블록하고, aacquire()는 이벤트 루프를 막지 않는다.
+    """
+
+    def __init__(
+        self,
+        backend,
+        limits: Dict[str, Dict[str, int]],
+        default: Dict[str, int],
+    ):
+        self.backend = backend
+        self.limits = limits
+        self.default = default
+
+    def _limits_for(self, model: str) -> Dict[str, int]:
+        return self.limits.get(model.removeprefix("models/"), self.default)
+
+    def _requests(self, model: str, tokens: int, scope: str) -> List[BucketRequest]:
+        limits = self._limits_for(model)
+        requests = []
+        if limits.get("rpm"):
+            rpm = float(limits["rpm"])
+            requests.append((f"{scope}:{model}:rpm", rpm, rpm / 60.0, 1.0))
+        if limits.get("tpm"):
+            tpm = float(limits["tpm"])
+            requests.append((f"{scope}:{model}:tpm", tpm, tpm / 60.0, float(tokens)))
+        return requests
+
+    def _check_deadline(self, wait: float, model: str) -> None:
+        remaining = remaining_time()
+        if remaining is not None and wait >= remaining:
+            raise TimeoutError(
+                f"rate limit 대기({wait:.1f}s)가 항목 제한 시간을 초과합니다: {model}"
+            )
+
+    def acquire(self, model: str, tokens: int, scope: str = "default") -> float:
+        """
+        예산이 생길 때까지 대기한 뒤 차감한다. 총 대기 시간(초)을 반환한다.
+        """
+        requests = self._requests(model, tokens, scope)
+        if not requests:
+            return 0.0
+
+        waited = 0.0
+        while True:
+            wait = self.backend.take(requests)
+            if wait <= 0:
+                return waited
+            self._check_deadline(wait, model)
+            time.sleep(wait)
+            waited += wait
+
+    async def aacquire(self, model: str, tokens: int, scope: str = "default") -> float:
+        requests = self._requests(model, tokens, scope)
+        if not requests:
+            return 0.0
+
+        waited = 0.0
+        while True:
+            wait = await asyncio.to_thread(self.backend.take, requests)
+            if wait <= 0:
+                return waited
+            self._check_deadline(wait, model)
+            await asyncio.sleep(wait)
+            waited += wait
+
+    def settle(
+        self,
+        model: str,
+        estimated_tokens: int,
+        actual_tokens: Optional[int],
+        scope: str = "default",
+    ) -> None:
+        """
+        예상 토큰과 실제 사용량의 차이를 tpm 버킷에 반영한다.
+        (초과분은 다음 호출의 대기로 이어지고, 남은 분량은 돌려받는다)
+        """
+        if actual_tokens is None:
+            return
+
+        tpm = self._limits_for(model).get("tpm")
+        if not tpm:
+            return
+
+        delta = actual_tokens - estimated_tokens
+        if delta:
+            self.backend.adjust(f"{scope}:{model}:tpm", float(tpm), tpm / 60.0, float(delta))
+
+
+def estimate_tokens(prompt_text: str, with_file: bool = False) -> int:
+    """
+    호출 전 예상 토큰 수 (한글 기준 약 2자/토큰 + 예상 출력 + 첨부 파일)
+    """
+    tokens = len(prompt_text) // 2 + RATE_LIMIT_OUTPUT_TOKENS
+    if with_file:
+        tokens += RATE_LIMIT_FILE_TOKENS
+    return max(1, tokens)
+
+
+def _build_backend():
+    if RATE_LIMIT_BACKEND == "sqlite":
+        return SQLiteBucketBackend(CACHE_DIR / "rate_limit.sqlite3")
+    return MemoryBucketBackend()
+
+
+RATE_LIMITER = RateLimiter(
+    backend=_build_backend(),
+    limits=RATE_LIMITS,
+    default=RATE_LIMIT_DEFAULT,
+)
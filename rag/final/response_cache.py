@@ -0,0 +1,137 @@
+import hashlib
+import json
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import Dict, Optional
+
+# -----------------------------
+# SQLite LLM 응답 캐시
+# -----------------------------
+# key: sha256(model, 최종 프롬프트, 첨부 파일 해시, VF 캐시 내용 키, 응답 스키마, 호출 옵션)
+# value: 검증된 응답 JSON (parsed + grounding)
+#
+# temperature=0 호출만 사용하므로 같은 입력이면 같은 결과로 간주한다.
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS llm_response_cache (
+    key         TEXT    PRIMARY KEY,
+    label       TEXT    NOT NULL,
+    payload     TEXT    NOT NULL,
+    size        INTEGER NOT NULL,
+    created_at  REAL    NOT NULL,
+    last_access REAL    NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_llm_response_cache_last_access
+    ON llm_response_cache (last_access);
+"""
+
+
+def build_response_cache_key(parts: dict) -> str:
+    raw = json.dumps(parts, ensure_ascii=False, sort_keys=True, default=str)
+    return hashlib.sha256(raw.encode("utf-8")).hexdigest()
+
+
+class ResponseCache:
+    """
+    디스크(SQLite) 기반 LLM 응답 캐시.
+    payload 총 크기가 max_bytes를 넘으면 가장 오래 사용되지 않은 항목부터 삭제한다(LRU).
+    """
+
+    def __init__(self, db_path: Path, max_bytes: int = 256 * 1024 * 1024):
+        db_path = Path(db_path)
+        db_path.parent.mkdir(parents=True, exist_ok=True)
+
+        self.db_path = db_path
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(
+            str(db_path),
+            timeout=30,
+            check_same_thread=False,
+        )
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.executescript(_SCHEMA)
+        self._conn.commit()
+
+    def get(self, key: str) -> Optional[dict]:
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT payload FROM llm_response_cache WHERE key = ?",
+                (key,),
+            ).fetchone()
+
+            if row is None:
+                self.misses += 1
+                return None
+
+            self._conn.execute(
+                "UPDATE llm_response_cache SET last_access = ? WHERE key = ?",
+                (time.time(), key),
+            )
+            self._conn.commit()
+            self.hits += 1
+
+        return json.loads(row[0])
+
+    def put(self, key: str, label: str, payload: dict) -> None:
+        data = json.dumps(payload, ensure_ascii=False)
+        size = len(data.encode("utf-8"))
+        if size > self.max_bytes:
+            return
+
+        now = time.time()
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO llm_response_cache "
+                "(key, label, payload, size, created_at, last_access) "
+                "VALUES (?, ?, ?, ?, ?, ?)",
+                (key, label, data, size, now, now),
+            )
+            self._evict()
+            self._conn.commit()
+
+    def _evict(self) -> None:
+        (total,) = self._conn.execute(
+            "SELECT COALESCE(SUM(size), 0) FROM llm_response_cache"
+        ).fetchone()
+
+        overflow = total - self.max_bytes
+        if overflow <= 0:
+            return
+
+        freed = 0
+        victims = []
+        for key, size in self._conn.execute(
+            "SELECT key, size FROM llm_response_cache ORDER BY last_access ASC"
+        ):
+            victims.append((key,))
+            freed += size
+            if freed >= overflow:
+                break
+
+        self._conn.executemany(
+            "DELETE FROM llm_response_cache WHERE key = ?",
+            victims,
+        )
+
+    def clear(self) -> None:
+        with self._lock:
+            self._conn.execute("DELETE FROM llm_response_cache")
+            self._conn.commit()
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            entries, total = self._conn.execute(
+                "SELECT COUNT(*), COALESCE(SUM(size), 0) FROM llm_response_cache"
+            ).fetchone()
+
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "entries": entries,
+            "bytes": total,
+        }
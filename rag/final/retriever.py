@@ -1,6 +1,9 @@
-import psycopg
-from typing import List, Dict
-from rag.config import POSTGRES_CONN
+import json
+from typing import List, Dict, Optional
+
+import numpy as np
+from rag.config import HNSW_EF_SEARCH, HNSW_ITERATIVE_SCAN
+from rag.final.db_pool import get_pool, get_async_pool
 
 SQL_TEMPLATE = """
 WITH q AS (SELECT %s::vector AS qv)
@@ -16,26 +19,226 @@ ORDER BY embedding <=> q.qv
 LIMIT %s;
 """
 
+# binary 모드: pgvector 어댑터로 vector를 binary 파라미터(%b)로 전송
+SQL_TEMPLATE_BINARY = SQL_TEMPLATE.replace("%s::vector", "%b::vector", 1)
+
+# 한 회사의 여러 항목 쿼리를 한 번의 round trip으로 처리
+# - q: item_id[] / vector[](binary)를 unnest, 항목별 section 목록은 순서(ord)로 매칭
+# - LATERAL: 항목별로 원본 테이블을 직접 검색 (section 필터 + top-k)
+#   → 항목마다 HNSW 인덱스 사용 가능, ef_search / iterative_scan 설정이 그대로 적용됨
+#
+# 트레이드오프: "회사 행을 한 번만 스캔"(biz_no 행을 MATERIALIZED CTE로 한 번 읽고 항목별로 정렬)하지 않고
+#   항목 수만큼 인덱스 탐색을 반복한다.
+#   - CTE로 물질화한 행에는 HNSW 인덱스를 쓸 수 없어 항목마다 회사 전체 행과 거리 계산 + 정렬이 필요함
+#   - 회사 행이 매우 적으면 한 번 스캔이 더 쌀 수 있음 → index_advisor.explain_retrieval로 계획 확인
+SQL_TEMPLATE_MANY = """
+WITH q AS (
+  SELECT
+    t.item_id,
+    t.qv,
+    ARRAY(SELECT jsonb_array_elements_text(s.sections -> (t.ord - 1)::int)) AS sections
+  FROM unnest(%s::int[], %b::vector[]) WITH ORDINALITY AS t(item_id, qv, ord),
+       (SELECT %s::jsonb AS sections) s
+)
+SELECT
+  q.item_id,
+  r.section,
+  r.content,
+  r.similarity
+FROM q
+CROSS JOIN LATERAL (
+  SELECT
+    e.section,
+    e.content,
+    (1 - (e.embedding <=> q.qv)) AS similarity
+  FROM business_plan_embeddings e
+  WHERE (e.metadata->>'doc_type') = 'business_plan'
+    AND (e.metadata->>'biz_no')  = %s
+    AND e.section = ANY(q.sections)
+  ORDER BY e.embedding <=> q.qv
+  LIMIT %s
+) r
+ORDER BY q.item_id, r.similarity DESC;
+"""
+
+def _to_context_blocks(rows) -> List[Dict]:
+    return [
+        {
+            "section": r[0],
+            "content": r[1],
+            "similarity": round(r[2], 4)
+        }
+        for r in rows
+    ]
+
+# HNSW 검색 파라미터 (트랜잭션 범위에서만 적용)
+SQL_SET_EF_SEARCH = "SELECT set_config('hnsw.ef_search', %s, true)"
+SQL_SET_ITERATIVE_SCAN = "SELECT set_config('hnsw.iterative_scan', %s, true)"
+
+def build_search_settings(
+    ef_search: Optional[int],
+    iterative_scan: Optional[str],
+) -> List[tuple]:
+    """
+    ef_search: HNSW 후보 리스트 크기 (필터 후 결과 부족 시 상향)
+    iterative_scan: off | strict_order | relaxed_order (pgvector 0.8+)
+    """
+    settings = []
+    if ef_search:
+        settings.append((SQL_SET_EF_SEARCH, (str(ef_search),)))
+    if iterative_scan:
+        settings.append((SQL_SET_ITERATIVE_SCAN, (iterative_scan,)))
+    return settings
+
+def _build_params(query_vec, biz_no, sections, k, binary: bool) -> tuple:
+    if binary:
+        query_vec = np.asarray(query_vec, dtype=np.float32)
+    return query_vec, biz_no, sections, k
+
 def retrieve_context(
     query_vec: list,
     biz_no: str,
     sections: List[str],
-    k: int = 10
+    k: int = 10,
+    binary: bool = False,
+    ef_search: Optional[int] = HNSW_EF_SEARCH,
+    iterative_scan: Optional[str] = HNSW_ITERATIVE_SCAN,
 ) -> List[Dict]:
+    """
+    binary=True 이면 query_vec을 pgvector binary 포맷으로 전송하고
+    서버 측 prepared statement를 사용한다. (풀 커넥션 단위로 재사용)
+
+    ef_search / iterative_scan을 주면 해당 쿼리 트랜잭션에만 HNSW 설정을 적용한다.
+    (biz_no / section 필터로 HNSW 결과가 k개보다 적어지는 문제 방지)
+    """
+    sql = SQL_TEMPLATE_BINARY if binary else SQL_TEMPLATE
 
-    with psycopg.connect(POSTGRES_CONN) as conn:
+    with get_pool().connection() as conn:
         with conn.cursor() as cur:
+            for setting_sql, setting_params in build_search_settings(ef_search, iterative_scan):
+                cur.execute(setting_sql, setting_params)
             cur.execute(
-                SQL_TEMPLATE,
-                (query_vec, company, sections, k)
+                sql,
+                _build_params(query_vec, biz_no, sections, k, binary),
+                prepare=True if binary else None,
             )
             rows = cur.fetchall()
 
-    return [
-        {
-            "section": r[0],
-            "content": r[1],
-            "similarity": round(r[2], 4)
-        }
-        for r in rows
+    return _to_context_blocks(rows)
+
+async def aretrieve_context(
+    query_vec: list,
+    biz_no: str,
+    sections: List[str],
+    k: int = 10,
+    binary: bool = False,
+    ef_search: Optional[int] = HNSW_EF_SEARCH,
+    iterative_scan: Optional[str] = HNSW_ITERATIVE_SCAN,
+) -> List[Dict]:
+    """
+    retrieve_context의 비동기 버전 (동시 실행 파이프라인용)
+    """
+    sql = SQL_TEMPLATE_BINARY if binary else SQL_TEMPLATE
+    pool = await get_async_pool()
+
+    async with pool.connection() as conn:
+        async with conn.cursor() as cur:
+            for setting_sql, setting_params in build_search_settings(ef_search, iterative_scan):
+                await cur.execute(setting_sql, setting_params)
+            await cur.execute(
+                sql,
+                _build_params(query_vec, biz_no, sections, k, binary),
+                prepare=True if binary else None,
+            )
+            rows = await cur.fetchall()
+
+    return _to_context_blocks(rows)
+
+
+def _build_many_params(
+    query_vecs: Dict[int, list],
+    biz_no: str,
+    sections_map: Dict[int, List[str]],
+    k: int,
+) -> tuple:
+    """
+    (item_id[], vector[] (binary, float32), 항목별 section 목록 JSON, biz_no, k)
+    """
+    item_ids = list(query_vecs.keys())
+    vectors = [
+        np.asarray(query_vecs[item_id], dtype=np.float32)
+        for item_id in item_ids
     ]
+    sections = [sections_map[item_id] for item_id in item_ids]
+    return item_ids, vectors, json.dumps(sections), biz_no, k
+
+def _group_many_rows(rows, item_ids) -> Dict[int, List[Dict]]:
+    grouped: Dict[int, list] = {item_id: [] for item_id in item_ids}
+    for r in rows:
+        grouped[r[0]].append(r[1:])
+    return {
+        item_id: _to_context_blocks(item_rows)
+        for item_id, item_rows in grouped.items()
+    }
+
+def retrieve_context_many(
+    query_vecs: Dict[int, list],
+    biz_no: str,
+    sections_map: Dict[int, List[str]],
+    k: int = 10,
+    ef_search: Optional[int] = HNSW_EF_SEARCH,
+    iterative_scan: Optional[str] = HNSW_ITERATIVE_SCAN,
+) -> Dict[int, List[Dict]]:
+    """
+    한 회사의 항목별 query_vec 전체를 한 번의 SQL로 검색한다.
+    반환: item_id → retrieve_context와 동일한 형태의 context_blocks
+
+    query_vec들은 binary vector[] 파라미터로 전송하고 prepared statement를 사용한다.
+
+    ef_search / iterative_scan은 retrieve_context와 같이 이 트랜잭션에만 적용된다.
+    (회사 행 1회 스캔 대신 항목별 HNSW 인덱스 탐색 - SQL_TEMPLATE_MANY 주석 참고)
+    """
+    if not query_vecs:
+        return {}
+
+    with get_pool().connection() as conn:
+        with conn.cursor() as cur:
+            for setting_sql, setting_params in build_search_settings(ef_search, iterative_scan):
+                cur.execute(setting_sql, setting_params)
+            cur.execute(
+                SQL_TEMPLATE_MANY,
+                _build_many_params(query_vecs, biz_no, sections_map, k),
+                prepare=True,
+            )
+            rows = cur.fetchall()
+
+    return _group_many_rows(rows, query_vecs.keys())
+
+async def aretrieve_context_many(
+    query_vecs: Dict[int, list],
+    biz_no: str,
+    sections_map: Dict[int, List[str]],
+    k: int = 10,
+    ef_search: Optional[int] = HNSW_EF_SEARCH,
+    iterative_scan: Optional[str] = HNSW_ITERATIVE_SCAN,
+) -> Dict[int, List[Dict]]:
+    """
+    retrieve_context_many의 비동기 버전
+    """
+    if not query_vecs:
+        return {}
+
+    pool = await get_async_pool()
+
+    async with pool.connection() as conn:
+        async with conn.cursor() as cur:
+            for setting_sql, setting_params in build_search_settings(ef_search, iterative_scan):
+                await cur.execute(setting_sql, setting_params)
+            await cur.execute(
+                SQL_TEMPLATE_MANY,
+                _build_many_params(query_vecs, biz_no, sections_map, k),
+                prepare=True,
+            )
+            rows = await cur.fetchall()
+
+    return _group_many_rows(rows, query_vecs.keys())
@@ -0,0 +1,154 @@
+"""
+text vs binary vector 파라미터 전송 마이크로 벤치마크 (KURE: 1024차원)
+- 단일 벡터: retrieve_context (SQL_TEMPLATE vs SQL_TEMPLATE_BINARY)
+- 항목 묶음: retrieve_context_many (JSON 텍스트 vs binary vector[])
+
+실행:
+    python -m rag.final.retriever_bench
+"""
+import json
+import time
+from typing import Callable, List
+
+import numpy as np
+from psycopg.adapt import PyFormat, Transformer
+
+from rag.final.db_pool import get_pool
+
+KURE_DIM = 1024
+ITERATIONS = 500
+MANY_ITEMS = 8  # 회사 1곳의 file+vectordb 항목 수 수준
+
+# 이전 retrieve_context_many 방식: jsonb 텍스트로 받아 서버에서 vector로 파싱
+SQL_MANY_JSON = """
+SELECT sum(vector_dims((x->>'qv')::vector))
+FROM jsonb_array_elements(%s::jsonb) AS x
+"""
+
+# 현재 방식 (SQL_TEMPLATE_MANY의 q CTE와 동일한 unnest)
+SQL_MANY_BINARY = """
+SELECT sum(vector_dims(t.qv))
+FROM unnest(%s::int[], %b::vector[]) WITH ORDINALITY AS t(item_id, qv, ord)
+"""
+
+
+def _timeit(fn: Callable[[], None], iterations: int) -> float:
+    start = time.perf_counter()
+    for _ in range(iterations):
+        fn()
+    return (time.perf_counter() - start) / iterations * 1000  # ms
+
+
+def bench_encode(conn, query_vec: list, iterations: int = ITERATIONS) -> None:
+    """
+    네트워크 없이 파라미터 직렬화 비용과 전송 바이트 수만 비교한다.
+    """
+    vec_np = np.asarray(query_vec, dtype=np.float32)
+
+    tx = Transformer(conn)
+
+    text_payload = tx.dump_sequence([query_vec], [PyFormat.TEXT])[0]
+    binary_payload = tx.dump_sequence([vec_np], [PyFormat.BINARY])[0]
+
+    text_ms = _timeit(
+        lambda: tx.dump_sequence([query_vec], [PyFormat.TEXT]), iterations
+    )
+    binary_ms = _timeit(
+        lambda: tx.dump_sequence([vec_np], [PyFormat.BINARY]), iterations
+    )
+
+    print("[encode]")
+    print(f"  text   : {text_ms:.4f} ms/op, {len(text_payload):,} bytes")
+    print(f"  binary : {binary_ms:.4f} ms/op, {len(binary_payload):,} bytes")
+
+
+def bench_roundtrip(conn, query_vec: list, iterations: int = ITERATIONS) -> None:
+    """
+    서버 왕복 포함 비교 (vector 캐스팅 + 1행 반환)
+    """
+    vec_np = np.asarray(query_vec, dtype=np.float32)
+
+    def _text():
+        with conn.cursor() as cur:
+            cur.execute("SELECT vector_dims(%s::vector)", (query_vec,))
+            cur.fetchone()
+
+    def _binary():
+        with conn.cursor() as cur:
+            cur.execute("SELECT vector_dims(%b::vector)", (vec_np,), prepare=True)
+            cur.fetchone()
+
+    # warm-up (prepared statement 생성 포함)
+    _text()
+    _binary()
+
+    text_ms = _timeit(_text, iterations)
+    binary_ms = _timeit(_binary, iterations)
+
+    print("[roundtrip]")
+    print(f"  text             : {text_ms:.4f} ms/op")
+    print(f"  binary + prepare : {binary_ms:.4f} ms/op")
+
+
+def _json_many_payload(query_vecs: List[list]) -> str:
+    return json.dumps([
+        {"item_id": i, "qv": [float(v) for v in qv]}
+        for i, qv in enumerate(query_vecs)
+    ])
+
+
+def bench_many(conn, query_vecs: List[list], iterations: int = ITERATIONS) -> None:
+    """
+    retrieve_context_many 파라미터 경로 비교 (직렬화 + 서버 왕복)
+    """
+    item_ids = list(range(len(query_vecs)))
+
+    def _json_params():
+        return (_json_many_payload(query_vecs),)
+
+    def _binary_params():
+        # retriever._build_many_params와 같은 변환 (float32 ndarray 목록)
+        return item_ids, [np.asarray(qv, dtype=np.float32) for qv in query_vecs]
+
+    tx = Transformer(conn)
+    json_payload = tx.dump_sequence(_json_params(), [PyFormat.TEXT])[0]
+    binary_payload = tx.dump_sequence(
+        _binary_params(), [PyFormat.TEXT, PyFormat.BINARY]
+    )[1]
+
+    def _json():
+        with conn.cursor() as cur:
+            cur.execute(SQL_MANY_JSON, _json_params())
+            cur.fetchone()
+
+    def _binary():
+        with conn.cursor() as cur:
+            cur.execute(SQL_MANY_BINARY, _binary_params(), prepare=True)
+            cur.fetchone()
+
+    _json()
+    _binary()
+
+    json_ms = _timeit(_json, iterations)
+    binary_ms = _timeit(_binary, iterations)
+
+    print(f"[many: {len(query_vecs)} items]")
+    print(f"  json text          : {json_ms:.4f} ms/op, {len(json_payload):,} bytes")
+    print(f"  binary vector[]    : {binary_ms:.4f} ms/op, {len(binary_payload):,} bytes")
+
+
+def _random_unit_vector(rng) -> list:
+    vec = rng.standard_normal(KURE_DIM).astype(np.float32)
+    vec /= np.linalg.norm(vec)
+    return vec.tolist()
+
+
+if __name__ == "__main__":
+    rng = np.random.default_rng(0)
+    query_vec = _random_unit_vector(rng)
+    query_vecs = [_random_unit_vector(rng) for _ in range(MANY_ITEMS)]
+
+    with get_pool().connection() as conn:
+        bench_encode(conn, query_vec)
+        bench_roundtrip(conn, query_vec)
+        bench_many(conn, query_vecs)
@@ -0,0 +1,382 @@
+import json
+import random
+import re
+import threading
+import time
+from collections import Counter, deque
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass, asdict
+from email.utils import parsedate_to_datetime
+from typing import Dict, Iterator, List, Optional
+
+from pydantic import ValidationError
+
+from rag.config import LLM_ITEM_DEADLINE_SECONDS, LLM_RETRY_LOG_SIZE
+
+# =========================================================
+# 오류 분류
+# =========================================================
+RATE_LIMIT = "rate_limit"   # 429 / RESOURCE_EXHAUSTED → 긴 백오프 + retry-after 준수
+TRANSIENT = "transient"     # 5xx / 408 / 네트워크 타임아웃 → 지수 백오프
+PARSE = "parse"             # JSON / 스키마 검증 실패 → STRICT 프롬프트로 짧게 재시도
+PERMANENT = "permanent"     # 그 외 4xx (잘못된 요청, 인증 등) → 재시도하지 않음
+
+_RATE_LIMIT_MARKERS = ("resource_exhausted", "rate limit", "quota", "429")
+_TRANSIENT_MARKERS = ("unavailable", "deadline_exceeded", "internal", "timeout", "timed out")
+
+# 상태 코드 없이 올라오는 API / 네트워크 계층 예외 (연결 끊김, 프로토콜 오류 등)
+_API_ERROR_MODULES = (
+    "httpx", "httpcore", "requests", "urllib3", "aiohttp", "grpc",
+    "google.genai", "google.api_core", "google.auth", "langchain_google_genai",
+)
+
+
+class EmptyResponseError(ValueError):
+    """
+    후보 / 본문 텍스트가 없는 LLM 응답 (안전 필터 차단, grounding만 온 응답 등)
+    → PARSE로 분류해 STRICT 프롬프트로 다시 요청한다.
+    """
+
+
+def _status_code(e: BaseException) -> Optional[int]:
+    for value in (
+        getattr(e, "code", None),
+        getattr(e, "status_code", None),
+        getattr(getattr(e, "response", None), "status_code", None),
+    ):
+        if isinstance(value, int):
+            return value
+    return None
+
+
+def _error_chain(e: BaseException) -> Iterator[BaseException]:
+    seen = set()
+    while e is not None and id(e) not in seen:
+        seen.add(id(e))
+        yield e
+        e = e.__cause__ or e.__context__
+
+
+def _is_api_or_network_error(err: BaseException) -> bool:
+    if isinstance(err, OSError):
+        return True
+    module = type(err).__module__ or ""
+    return module.startswith(_API_ERROR_MODULES)
+
+
+def classify_error(e: BaseException) -> str:
+    """
+    예외(및 __cause__ 체인)를 rate_limit / transient / parse / permanent 로 분류한다.
+    google-genai APIError(code), httpx 응답(status_code), LangChain 래핑 메시지를 모두 처리한다.
+    """
+    for err in _error_chain(e):
+        if isinstance(err, (json.JSONDecodeError, ValidationError, EmptyResponseError)):
+            return PARSE
+
+        code = _status_code(err)
+        if code == 429:
+            return RATE_LIMIT
+        if code is not None and (code >= 500 or code == 408):
+            return TRANSIENT
+        if code is not None and 400 <= code < 500:
+            return PERMANENT
+
+        if isinstance(err, (TimeoutError, ConnectionError)):
+            return TRANSIENT
+
+    message = str(e).lower()
+    if any(m in message for m in _RATE_LIMIT_MARKERS):
+        return RATE_LIMIT
+    if any(m in message for m in _TRANSIENT_MARKERS):
+        return TRANSIENT
+    if isinstance(e, ValueError):
+        # 구조화 출력 파싱 실패 등
+        return PARSE
+
+    if any(_is_api_or_network_error(err) for err in _error_chain(e)):
+        return TRANSIENT
+
+    # 그 외 (TypeError / KeyError / AttributeError 등 코드 오류)는 재시도해도 같은 결과
+    return PERMANENT
+
+
+_RETRY_DELAY_PATTERN = re.compile(r"retry(?:_| )?(?:delay|after|in)\W+(\d+(?:\.\d+)?)s?", re.I)
+
+
+def _parse_retry_after_header(value: str) -> Optional[float]:
+    try:
+        return max(float(value), 0.0)
+    except ValueError:
+        pass
+    try:
+        return max(parsedate_to_datetime(value).timestamp() - time.time(), 0.0)
+    except (TypeError, ValueError):
+        return None
+
+
+def retry_after_hint(e: BaseException) -> Optional[float]:
+    """
+    서버가 알려준 재시도 대기 시간(초)을 찾는다.
+    - HTTP retry-after 헤더
+    - google.rpc.RetryInfo 의 retryDelay ("27s")
+    - 메시지에 포함된 "retry after 10s" / "retryDelay: 10s" / "Please retry in 41.2s"
+    """
+    for err in _error_chain(e):
+        headers = getattr(getattr(err, "response", None), "headers", None)
+        if headers is not None:
+            value = headers.get("retry-after")
+            if value:
+                hint = _parse_retry_after_header(value)
+                if hint is not None:
+                    return hint
+
+        details = getattr(err, "details", None)
+        if isinstance(details, dict):
+            for detail in details.get("error", {}).get("details", []) or []:
+                delay = detail.get("retryDelay") if isinstance(detail, dict) else None
+                if isinstance(delay, str) and delay.endswith("s"):
+                    try:
+                        return float(delay[:-1])
+                    except ValueError:
+                        pass
+
+        match = _RETRY_DELAY_PATTERN.search(str(err))
+        if match:
+            return float(match.group(1))
+
+    return None
+
+
+# =========================================================
+# 백오프 정책
+# =========================================================
+@dataclass(frozen=True)
+class Backoff:
+    max_attempts: int
+    base_sec: float = 0.0
+    cap_sec: float = 0.0
+    multiplier: float = 2.0
+
+    def delay(self, attempt: int) -> float:
+        # equal jitter: [ceiling/2, ceiling]
+        ceiling = min(self.cap_sec, self.base_sec * self.multiplier ** (attempt - 1))
+        return random.uniform(ceiling / 2, ceiling)
+
+
+@dataclass(frozen=True)
+class RetryPolicy:
+    backoffs: Dict[str, Backoff]
+
+    def next_delay(
+        self,
+        error_class: str,
+        attempt: int,
+        hint: Optional[float] = None,
+    ) -> Optional[float]:
+        """
+        attempt번째 시도가 error_class로 실패했을 때 대기 시간(초).
+        더 이상 재시도하지 않으면 None.
+        """
+        backoff = self.backoffs.get(error_class, self.backoffs[PERMANENT])
+        if attempt >= backoff.max_attempts:
+            return None
+
+        delay = backoff.delay(attempt)
+        if hint is not None:
+            delay = max(delay, hint)
+        return delay
+
+
+DEFAULT_RETRY_POLICY = RetryPolicy({
+    RATE_LIMIT: Backoff(max_attempts=6, base_sec=2.0, cap_sec=60.0),
+    TRANSIENT: Backoff(max_attempts=4, base_sec=1.0, cap_sec=20.0),
+    PARSE: Backoff(max_attempts=3, base_sec=0.5, cap_sec=2.0),
+    PERMANENT: Backoff(max_attempts=1),
+})
+
+
+# =========================================================
+# 항목 단위 deadline (contextvars → asyncio task / to_thread 로 전파)
+# =========================================================
+_ITEM_DEADLINE: ContextVar[Optional[float]] = ContextVar("llm_item_deadline", default=None)
+
+
+@contextmanager
+def item_deadline(seconds: Optional[float] = LLM_ITEM_DEADLINE_SECONDS):
+    """
+    블록 안의 모든 LLM 재시도가 seconds 안에 끝나도록 제한한다.
+    중첩되면 더 이른 deadline을 따른다. seconds가 0/None이면 제한 없음.
+    """
+    current = _ITEM_DEADLINE.get()
+    deadline = current
+    if seconds:
+        candidate = time.monotonic() + seconds
+        deadline = candidate if current is None else min(current, candidate)
+
+    token = _ITEM_DEADLINE.set(deadline)
+    try:
+        yield
+    finally:
+        _ITEM_DEADLINE.reset(token)
+
+
+def remaining_time() -> Optional[float]:
+    deadline = _ITEM_DEADLINE.get()
+    if deadline is None:
+        return None
+    return deadline - time.monotonic()
+
+
+# =========================================================
+# 시도 기록
+# =========================================================
+@dataclass
+class AttemptRecord:
+    label: str
+    attempt: int
+    outcome: str                # success / retry / give_up / deadline
+    error_class: Optional[str]
+    elapsed_sec: float
+    delay_sec: Optional[float]
+    retry_after: Optional[float]
+    error: Optional[str]
+    timestamp: float
+
+
+_ATTEMPT_LOG: deque = deque(maxlen=LLM_RETRY_LOG_SIZE)
+_ATTEMPT_LOG_LOCK = threading.Lock()
+
+
+def record_attempt(record: AttemptRecord) -> None:
+    with _ATTEMPT_LOG_LOCK:
+        _ATTEMPT_LOG.append(record)
+
+
+def get_attempt_log() -> List[dict]:
+    with _ATTEMPT_LOG_LOCK:
+        return [asdict(r) for r in _ATTEMPT_LOG]
+
+
+def get_retry_stats() -> Dict[str, int]:
+    """
+    "error_class:outcome" 별 집계 (성공은 "ok:success")
+    """
+    with _ATTEMPT_LOG_LOCK:
+        return dict(Counter(
+            f"{r.error_class or 'ok'}:{r.outcome}" for r in _ATTEMPT_LOG
+        ))
+
+
+# =========================================================
+# 재시도 판단
+# =========================================================
+def record_success(label: str, attempt: int, started_at: float) -> None:
+    record_attempt(AttemptRecord(
+        label=label,
+        attempt=attempt,
+        outcome="success",
+        error_class=None,
+        elapsed_sec=round(time.monotonic() - started_at, 3),
+        delay_sec=None,
+        retry_after=None,
+        error=None,
+        timestamp=time.time(),
+    ))
+
+
+def check_deadline(label: str, attempt: int, started_at: float) -> Optional[float]:
+    """
+    새 시도를 시작하기 전에 항목 deadline을 확인한다.
+    이미 지났으면 기록 후 TimeoutError, 아니면 남은 시간(초, 제한 없으면 None)을 반환한다.
+    (반환값은 요청 timeout / asyncio.wait_for 한도로 사용)
+    """
+    remaining = remaining_time()
+    if remaining is None or remaining > 0:
+        return remaining
+
+    error = TimeoutError(f"{label}: 항목 제한 시간 초과 (시도 {attempt} 시작 전)")
+    record_attempt(AttemptRecord(
+        label=label,
+        attempt=attempt,
+        outcome="deadline",
+        error_class=TRANSIENT,
+        elapsed_sec=round(time.monotonic() - started_at, 3),
+        delay_sec=None,
+        retry_after=None,
+        error=str(error)[:500],
+        timestamp=time.time(),
+    ))
+    print(f"❌ {label} (항목 제한 시간 초과)")
+    raise error
+
+
+def plan_retry(
+    e: Exception,
+    attempt: int,
+    label: str,
+    started_at: float,
+    policy: RetryPolicy = DEFAULT_RETRY_POLICY,
+    allow_retry: bool = True,
+) -> float:
+    """
+    실패한 시도를 기록하고 다음 대기 시간(초)을 반환한다.
+    재시도하지 않는 경우 RuntimeError(f"{label}: {e}")를 올린다.
+    """
+    error_class = classify_error(e)
+    hint = retry_after_hint(e) if error_class == RATE_LIMIT else None
+    delay = policy.next_delay(error_class, attempt, hint) if allow_retry else None
+
+    outcome = "retry" if delay is not None else "give_up"
+    remaining = remaining_time()
+    if delay is not None and remaining is not None and delay >= remaining:
+        outcome = "deadline"
+        delay = None
+
+    record_attempt(AttemptRecord(
+        label=label,
+        attempt=attempt,
+        outcome=outcome,
+        error_class=error_class,
+        elapsed_sec=round(time.monotonic() - started_at, 3),
+        delay_sec=round(delay, 3) if delay is not None else None,
+        retry_after=hint,
+        error=f"{type(e).__name__}: {e}"[:500],
+        timestamp=time.time(),
+    ))
+
+    if delay is None:
+        reason = {
+            "give_up": "재시도 불가" if error_class == PERMANENT else "최대 재시도 초과",
+            "deadline": "항목 제한 시간 초과",
+        }[outcome]
+        print(f"❌ {label} [{error_class}] ({reason})")
+        raise RuntimeError(f"{label}: {e}") from e
+
+    print(f"⚠️ {label} [{error_class}] (시도 {attempt}) → {delay:.1f}s 후 재시도")
+    return delay
+
+
+if __name__ == "__main__":
+    # 분류 자체 검증: python -m rag.final.retry_policy
+    class _FakeApiError(Exception):
+        def __init__(self, code: int, message: str = ""):
+            super().__init__(message)
+            self.code = code
+
+    cases = [
+        (EmptyResponseError("empty response (finish_reason=SAFETY)"), PARSE),
+        (EmptyResponseError("empty response (finish_reason=None)"), PARSE),
+        (json.JSONDecodeError("x", "{", 0), PARSE),
+        (_FakeApiError(429, "RESOURCE_EXHAUSTED"), RATE_LIMIT),
+        (_FakeApiError(503, "UNAVAILABLE"), TRANSIENT),
+        (_FakeApiError(400, "INVALID_ARGUMENT"), PERMANENT),
+        (TimeoutError(), TRANSIENT),
+        (TypeError("'NoneType' object is not subscriptable"), PERMANENT),
+    ]
+    for error, expected in cases:
+        actual = classify_error(error)
+        assert actual == expected, (error, actual, expected)
+
+    assert retry_after_hint(RuntimeError("Please retry in 41.2s")) == 41.2
+    print(f"✅ classify_error 자체 검증 통과 ({len(cases)}건)")
@@ -4,3 +4,23 @@ from typing import List
 class ReportItemResult(BaseModel):
     evaluation: str
 
+
+class ReportItemSection(BaseModel):
+    item_id: int = Field(
+        description="[ITEMS]에 표기된 평가 항목 번호"
+    )
+    evaluation: str = Field(
+        description="해당 평가 항목의 보고서 본문"
+    )
+
+
+class MultiReportItemResult(BaseModel):
+    items: List[ReportItemSection] = Field(
+        description="요청된 평가 항목별 보고서 본문 목록 (항목당 1개)"
+    )
+
+    def to_item_results(self) -> dict[int, ReportItemResult]:
+        return {
+            section.item_id: ReportItemResult(evaluation=section.evaluation)
+            for section in self.items
+        }
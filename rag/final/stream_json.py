@@ -0,0 +1,223 @@
+import json
+from typing import Any, Dict, List, Optional, Tuple
+
+from pydantic import BaseModel, TypeAdapter, ValidationError
+
+# =========================================================
+# 스트리밍 JSON 점진 파서
+# =========================================================
+# 최상위 JSON 객체를 문자 단위로 스캔하면서
+# 값이 완성된 최상위 필드부터 바로 검증해 돌려준다.
+#
+#   {"overseas_market": {...}, "korea_market": {...}, "competitors": [...]}
+#    └─ 완성 즉시 emit ──┘     └─ 완성 즉시 emit ─┘   └─ 완성 즉시 emit ─┘
+#
+# - 앞뒤의 ```json 코드블록 / 설명 문장은 무시 (첫 '{' 부터 마지막 '}' 까지만 해석)
+# - 필드 값은 model_cls의 필드 타입(TypeAdapter)으로 즉시 검증
+# - 스키마에 없는 필드는 검증 없이 원본 값 그대로 보관
+# - 깨진 JSON(이스케이프 안 된 따옴표 등)을 만나면 그 뒤로는 emit하지 않고
+#   원문(text)만 모은다 → 호출부에서 clean_json_string 정제 후 전체 검증
+
+_WHITESPACE = " \t\r\n"
+
+
+class IncrementalJsonObjectParser:
+    """
+    Gemini 스트리밍 청크(text)를 feed()로 넣으면
+    완성된 최상위 필드를 (field_name, validated_value) 목록으로 반환한다.
+    """
+
+    def __init__(self, model_cls: type[BaseModel]):
+        self.model_cls = model_cls
+        self.fields: Dict[str, Any] = {}
+        self.error: Optional[Exception] = None
+        self._chunks: List[str] = []
+
+        self._adapters = {
+            name: TypeAdapter(field.annotation)
+            for name, field in model_cls.model_fields.items()
+        }
+
+        self._state = "start"
+        self._key_chars: List[str] = []
+        self._key: Optional[str] = None
+        self._value_chars: List[str] = []
+        self._depth = 0
+        self._in_string = False
+        self._escape = False
+
+    @property
+    def done(self) -> bool:
+        return self._state == "done"
+
+    @property
+    def text(self) -> str:
+        """
+        지금까지 받은 응답 원문
+        """
+        return "".join(self._chunks)
+
+    def feed(self, text: str) -> List[Tuple[str, Any]]:
+        self._chunks.append(text)
+
+        events = []
+        if self.error is not None:
+            return events
+
+        for ch in text:
+            try:
+                event = self._step(ch)
+            except (json.JSONDecodeError, ValidationError) as e:
+                self.error = e
+                break
+            if event is not None:
+                events.append(event)
+        return events
+
+    def finalize(self) -> BaseModel:
+        """
+        스트림 종료 후 전체 객체를 검증한다.
+        (깨진 JSON / 닫는 '}'가 오지 않았거나 필수 필드가 빠졌으면 예외)
+        """
+        if self.error is not None:
+            raise self.error
+
+        if self._state == "value" and self._depth == 0 and not self._in_string:
+            # 최상위 마지막 값이 숫자/리터럴로 끝나고 '}'가 잘린 경우 → 값을 확정하고 객체를 닫음
+            self._finish_value()
+            self._state = "done"
+
+        if not self.done:
+            raise json.JSONDecodeError(
+                "스트리밍 JSON이 완결되지 않았습니다",
+                "".join(self._value_chars),
+                0,
+            )
+
+        return self.model_cls.model_validate(self.fields)
+
+    # -----------------------------
+    # 상태 전이
+    # -----------------------------
+    def _step(self, ch: str) -> Optional[Tuple[str, Any]]:
+        state = self._state
+
+        if state == "start":
+            if ch == "{":
+                self._state = "expect_key"
+            return None
+
+        if state == "expect_key":
+            if ch == '"':
+                self._key_chars = []
+                self._escape = False
+                self._state = "key"
+            elif ch == "}":
+                self._state = "done"
+            return None
+
+        if state == "key":
+            if self._escape:
+                self._escape = False
+                self._key_chars.append(ch)
+            elif ch == "\\":
+                self._escape = True
+                self._key_chars.append(ch)
+            elif ch == '"':
+                self._key = json.loads('"' + "".join(self._key_chars) + '"')
+                self._state = "colon"
+            else:
+                self._key_chars.append(ch)
+            return None
+
+        if state == "colon":
+            if ch == ":":
+                self._state = "value_start"
+            return None
+
+        if state == "value_start":
+            if ch in _WHITESPACE:
+                return None
+            self._value_chars = []
+            self._depth = 0
+            self._in_string = False
+            self._escape = False
+            self._state = "value"
+            return self._step_value(ch)
+
+        if state == "value":
+            return self._step_value(ch)
+
+        # done: 닫힌 이후 텍스트(코드블록 종료 등)는 무시
+        return None
+
+    def _step_value(self, ch: str) -> Optional[Tuple[str, Any]]:
+        # 숫자 / true / false / null 은 구분자로 끝남 (구분자는 값에 포함하지 않음)
+        if self._depth == 0 and not self._in_string and self._value_chars:
+            first = self._value_chars[0]
+            if first not in '{["' and (ch in ",}" or ch in _WHITESPACE):
+                event = self._finish_value()
+                if ch == "}":
+                    self._state = "done"
+                return event
+
+        self._value_chars.append(ch)
+
+        if self._in_string:
+            if self._escape:
+                self._escape = False
+            elif ch == "\\":
+                self._escape = True
+            elif ch == '"':
+                self._in_string = False
+                if self._depth == 0:
+                    return self._finish_value()
+            return None
+
+        if ch == '"':
+            self._in_string = True
+        elif ch in "{[":
+            self._depth += 1
+        elif ch in "}]":
+            self._depth -= 1
+            if self._depth == 0:
+                return self._finish_value()
+
+        return None
+
+    def _finish_value(self) -> Tuple[str, Any]:
+        key = self._key
+        raw = json.loads("".join(self._value_chars))
+
+        adapter = self._adapters.get(key)
+        value = adapter.validate_python(raw) if adapter is not None else raw
+
+        self.fields[key] = value
+        self._value_chars = []
+        self._state = "expect_key"
+        return key, value
+
+
+if __name__ == "__main__":
+    # 자체 검증: python -m rag.final.stream_json
+    class _Sample(BaseModel):
+        name: str
+        count: int
+
+    whole = IncrementalJsonObjectParser(_Sample)
+    events = whole.feed('```json\n{"name": "a", "count": 3}\n```')
+    assert events == [("name", "a"), ("count", 3)], events
+    assert whole.finalize() == _Sample(name="a", count=3)
+
+    # 마지막 숫자 값 뒤 '}'가 잘린 스트림
+    truncated = IncrementalJsonObjectParser(_Sample)
+    assert truncated.feed('{"name": "a", "count": 42') == [("name", "a")]
+    assert truncated.finalize() == _Sample(name="a", count=42)
+    assert truncated.fields == {"name": "a", "count": 42} and truncated.done
+
+    # 검증 실패 → 이후 emit 중단, 원문은 보존 (호출부 clean_json_string 경로용)
+    broken = IncrementalJsonObjectParser(_Sample)
+    assert broken.feed('{"count": "many", "name": "a"}') == []
+    assert broken.error is not None and broken.text.endswith('"name": "a"}')
+
+    print("✅ IncrementalJsonObjectParser 자체 검증 통과")
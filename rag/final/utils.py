@@ -1,5 +1,15 @@
+import json
 import re
 
+# evaluation 문자열 값: 닫는 따옴표 뒤에 객체 끝(}) 또는 다음 키(, "key":)가 오는 지점까지
+# (종결자는 소비하지 않음 → 다중 항목 payload의 }, ] 구조 유지)
+_EVALUATION_VALUE_PATTERN = re.compile(
+    r'"evaluation"\s*:\s*"(.*?)"(?=\s*(?:\}|,\s*"[^"\n]+"\s*:))',
+    re.DOTALL,
+)
+_UNESCAPED_QUOTE_PATTERN = re.compile(r'(?<!\\)"')
+
+
 def clean_json_string(text: str) -> str:
     # 코드블록 제거
     text = re.sub(r'```json\s*', '', text)
@@ -25,19 +35,21 @@ def clean_json_string(text: str) -> str:
     if start != -1 and end != -1:
         text = text[start:end + 1]
 
-    # evaluation 내부만 안전하게 처리
+    # 이미 유효한 JSON이면 그대로 사용
+    try:
+        json.loads(text)
+        return text
+    except ValueError:
+        pass
+
+    # evaluation 내부만 안전하게 처리 (단일 항목 / 다중 항목 items[] 모두)
     def sanitize_evaluation(match):
         content = match.group(1)
-        content = content.replace('"', '\\"')
+        content = _UNESCAPED_QUOTE_PATTERN.sub('\\\\"', content)
         content = content.replace("\r\n", "\\n").replace("\n", "\\n")
         return f'"evaluation": "{content}"'
 
-    text = re.sub(
-        r'"evaluation"\s*:\s*"(.+?)"\s*}',
-        sanitize_evaluation,
-        text,
-        flags=re.DOTALL
-    )
+    text = _EVALUATION_VALUE_PATTERN.sub(sanitize_evaluation, text)
 
     if text.strip().startswith("{") and not text.strip().endswith("}"):
         text = text.rstrip() + "\n}"